@@ -5,6 +5,7 @@ Command-line interface for the Dating App AI Assistant.
 
 import os
 import sys
+import time
 import argparse
 import json
 from datetime import datetime
@@ -14,6 +15,23 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from src.app import DatingAppAIAssistant
 
+def ask_approval(message, kind):
+    """
+    Ask whether to send a generated message, cycling through its alternatives on 'a'.
+    
+    The chosen alternative becomes the message's content.
+    """
+    options = "y/n/e for edit" + (", a for another" if message.get('alternatives') else "")
+    while True:
+        approval = input(f"Do you want to send this {kind}? ({options}): ").lower()
+        if approval != 'a' or not message.get('alternatives'):
+            return approval
+        
+        # Show the next candidate and queue the current one behind the others
+        message['alternatives'].append(message['content'])
+        message['content'] = message['alternatives'].pop(0)
+        print(f"Generated {kind}: {message['content']}")
+
 def auth_command(args):
     """Handle authentication commands."""
     app = DatingAppAIAssistant()
@@ -85,13 +103,66 @@ def matches_command(args):
         print(f"Error: {str(e)}")
         return 1
 
+def sync_command(args):
+    """Handle sync commands."""
+    app = DatingAppAIAssistant()
+    
+    try:
+        summary = app.sync_delta(args.platform, limit=args.limit)
+        
+        print(f"Synced changes from {args.platform}:")
+        print(f"- Matches: {summary.get('matches', 0)}")
+        print(f"- Conversations: {summary.get('conversations', 0)}")
+        print(f"- Messages: {summary.get('messages', 0)}")
+        
+        return 0
+    
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
+
+def watch_command(args):
+    """Handle watch commands."""
+    app = DatingAppAIAssistant()
+    
+    try:
+        if not app.start_realtime(args.platform, poll_interval=args.poll_interval):
+            print(f"Failed to start watching {args.platform}. Are you authenticated?")
+            return 1
+        
+        print(f"Watching {args.platform} for new messages. Press Ctrl+C to stop.")
+        while True:
+            time.sleep(1)
+    
+    except KeyboardInterrupt:
+        app.stop_realtime(args.platform)
+        print(f"Stopped watching {args.platform}.")
+        return 0
+    
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
+
+def renormalize_command(args):
+    """Handle renormalize commands."""
+    app = DatingAppAIAssistant()
+    
+    try:
+        count = app.renormalize(args.platform)
+        print(f"Renormalized {count} profiles{' from ' + args.platform if args.platform else ''}.")
+        return 0
+    
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
+
 def message_command(args):
     """Handle message commands."""
     app = DatingAppAIAssistant()
     
     try:
         # Generate initial message
-        message = app.generate_initial_message(args.match_id)
+        message = app.generate_initial_message(args.match_id, use_cache=not args.fresh)
         
         if not message:
             print(f"Failed to generate message for match {args.match_id}.")
@@ -101,7 +172,7 @@ def message_command(args):
         
         # Ask for approval
         if not args.auto_approve:
-            approval = input("Do you want to send this message? (y/n/e for edit): ").lower()
+            approval = ask_approval(message, 'message')
             
             if approval == 'n':
                 print("Message not sent.")
@@ -129,6 +200,32 @@ def message_command(args):
         print(f"Error: {str(e)}")
         return 1
 
+def drafts_command(args):
+    """Handle drafts commands."""
+    app = DatingAppAIAssistant()
+    
+    try:
+        count = 0
+        # Drafts are printed as soon as each one is ready
+        for message in app.draft_openers(args.platform, limit=args.limit,
+                                         max_concurrency=args.concurrency, use_cache=not args.fresh):
+            count += 1
+            if message.get('error'):
+                print(f"{count}. Match {message['match_id']}: failed ({message['error']})")
+            else:
+                print(f"{count}. Match {message['match_id']}:")
+                print(f"   {message['content']}")
+        
+        if not count:
+            print(f"No new matches without messages{' on ' + args.platform if args.platform else ''}.")
+        else:
+            print(f"\nDrafted {count} openers. Send one with: message <platform> <match_id>")
+        return 0
+    
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
+
 def conversation_command(args):
     """Handle conversation commands."""
     app = DatingAppAIAssistant()
@@ -188,7 +285,7 @@ def conversation_command(args):
                 print("Error: Conversation ID is required for 'respond' action.")
                 return 1
             
-            response = app.generate_response(args.conversation_id)
+            response = app.generate_response(args.conversation_id, use_cache=not args.fresh)
             
             if not response:
                 print(f"Failed to generate response for conversation {args.conversation_id}.")
@@ -198,7 +295,7 @@ def conversation_command(args):
             
             # Ask for approval
             if not args.auto_approve:
-                approval = input("Do you want to send this response? (y/n/e for edit): ").lower()
+                approval = ask_approval(response, 'response')
                 
                 if approval == 'n':
                     print("Response not sent.")
@@ -394,11 +491,34 @@ def main():
     matches_parser.add_argument('platform', choices=['tinder', 'hinge'], help='Platform to get matches from')
     matches_parser.add_argument('--limit', type=int, default=10, help='Maximum number of matches to retrieve')
     
+    # Sync command
+    sync_parser = subparsers.add_parser('sync', help='Sync changes from a platform since the last sync')
+    sync_parser.add_argument('platform', choices=['tinder', 'hinge'], help='Platform to sync')
+    sync_parser.add_argument('--limit', type=int, default=100, help='Maximum number of items to retrieve per list')
+    
+    # Watch command
+    watch_parser = subparsers.add_parser('watch', help='Ingest new messages from a platform in real time')
+    watch_parser.add_argument('platform', choices=['tinder', 'hinge'], help='Platform to watch')
+    watch_parser.add_argument('--poll-interval', type=float, default=5.0,
+                              help='Seconds between updates-feed polls for platforms without push')
+    
+    # Renormalize command
+    renormalize_parser = subparsers.add_parser('renormalize', help='Rebuild stored profiles from archived raw payloads')
+    renormalize_parser.add_argument('--platform', choices=['tinder', 'hinge'], help='Platform to restrict to')
+    
     # Message command
     message_parser = subparsers.add_parser('message', help='Generate and send a message to a match')
     message_parser.add_argument('platform', choices=['tinder', 'hinge'], help='Platform to send message on')
     message_parser.add_argument('match_id', help='ID of the match to message')
     message_parser.add_argument('--auto-approve', action='store_true', help='Automatically approve and send the message')
+    message_parser.add_argument('--fresh', action='store_true', help='Generate a new message instead of reusing a cached one')
+    
+    # Drafts command
+    drafts_parser = subparsers.add_parser('drafts', help='Draft openers for all new matches')
+    drafts_parser.add_argument('--platform', choices=['tinder', 'hinge'], help='Platform to restrict to')
+    drafts_parser.add_argument('--limit', type=int, default=50, help='Maximum number of matches to draft for')
+    drafts_parser.add_argument('--concurrency', type=int, default=4, help='Maximum number of drafts generated at once')
+    drafts_parser.add_argument('--fresh', action='store_true', help='Generate new drafts instead of reusing cached ones')
     
     # Conversation command
     conversation_parser = subparsers.add_parser('conversation', help='Manage conversations')
@@ -408,6 +528,7 @@ def main():
     conversation_parser.add_argument('--conversation-id', help='ID of the conversation (for view, respond, monitor, stop, insights)')
     conversation_parser.add_argument('--limit', type=int, default=20, help='Maximum number of items to retrieve')
     conversation_parser.add_argument('--auto-approve', action='store_true', help='Automatically approve and send responses')
+    conversation_parser.add_argument('--fresh', action='store_true', help='Generate a new response instead of reusing a cached one (for respond)')
     
     # Stats command
     stats_parser = subparsers.add_parser('stats', help='Get statistics')
@@ -425,8 +546,16 @@ def main():
         return auth_command(args)
     elif args.command == 'matches':
         return matches_command(args)
+    elif args.command == 'sync':
+        return sync_command(args)
+    elif args.command == 'watch':
+        return watch_command(args)
+    elif args.command == 'renormalize':
+        return renormalize_command(args)
     elif args.command == 'message':
         return message_command(args)
+    elif args.command == 'drafts':
+        return drafts_command(args)
     elif args.command == 'conversation':
         return conversation_command(args)
     elif args.command == 'stats':
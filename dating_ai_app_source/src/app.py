@@ -5,12 +5,13 @@ Integrates all components and provides a unified interface.
 
 import os
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional
 
 from src.assistant import DatingAssistant
 from src.conversation_manager import ConversationManager
 from src.notification_system import NotificationSystem
 from src.analytics import ConversationAnalytics
+from src.llm_scheduler import SPECULATIVE
 
 # Configure logging
 logging.basicConfig(
@@ -23,21 +24,27 @@ logger = logging.getLogger('app')
 class DatingAppAIAssistant:
     """Main application class for the dating app AI assistant."""
     
-    def __init__(self, storage_path: str = None):
+    def __init__(self, storage_path: str = None, prefetch_profiles: bool = False):
         """
         Initialize the dating app AI assistant.
         
         Args:
             storage_path: Path to the storage database
+            prefetch_profiles: Whether to fetch full profiles of newly seen matches in the background
         """
-        self.assistant = DatingAssistant(storage_path)
+        self.assistant = DatingAssistant(storage_path, prefetch_profiles)
         self.conversation_manager = ConversationManager(
             self.assistant.storage, 
-            self.assistant.message_generator
+            self.assistant.message_generator,
+            self.assistant.dating_app
         )
         self.notification_system = NotificationSystem()
         self.analytics = ConversationAnalytics(self.assistant.storage.conn)
         
+        # Only notify for matches and messages that are actually new to storage
+        self.assistant.storage.add_match_listener(self._on_match_changed)
+        self.assistant.storage.add_message_listener(self._on_message_changed)
+        
         logger.info("Dating App AI Assistant initialized")
     
     def authenticate(self, platform: str, **auth_params) -> bool:
@@ -76,15 +83,87 @@ class DatingAppAIAssistant:
         Returns:
             List[Dict]: List of matches
         """
-        matches = self.assistant.get_matches(platform, limit)
+        return self.assistant.get_matches(platform, limit)
+    
+    def _on_match_changed(self, event: str, match_id: str, match_data: Dict[str, Any]) -> None:
+        """
+        Handle a match change committed to storage.
+        
+        Args:
+            event: 'inserted' or 'updated'
+            match_id: Stored match ID
+            match_data: Normalized match data
+        """
+        if event == 'inserted':
+            self.notification_system.notify_new_match(dict(match_data, id=match_id))
+    
+    def _on_message_changed(self, event: str, message_id: str, message_data: Dict[str, Any]) -> None:
+        """
+        Handle a message change committed to storage.
+        
+        Args:
+            event: 'inserted' or 'updated'
+            message_id: Stored message ID
+            message_data: Message data
+        """
+        # Fetched or first-synced history is not news
+        if event != 'inserted' or message_data.get('sender_type') != 'match' or message_data.get('backfill'):
+            return
+        
+        # Synced messages carry the platform conversation ID; drafts are kept per local conversation
+        conversation_id = self.assistant.storage.resolve_conversation_id(message_data.get('conversation_id', ''))
+        self.notification_system.notify_new_message(
+            conversation_id or message_data.get('conversation_id', ''), message_data
+        )
+        if conversation_id:
+            self.conversation_manager.draft_reply(conversation_id, message_id)
+    
+    def sync_delta(self, platform: str, limit: int = 100) -> Dict[str, Any]:
+        """
+        Sync only what changed on a platform since the last sync.
+        
+        Args:
+            platform: Platform name
+            limit: Maximum number of items to retrieve per list
+            
+        Returns:
+            Dict: Sync summary
+        """
+        return self.assistant.sync_delta(platform, limit)
+    
+    def renormalize(self, platform: str = None) -> int:
+        """
+        Re-run archived raw payloads through the current normalizers.
+        
+        Args:
+            platform: Platform name to restrict to (optional)
+            
+        Returns:
+            int: Number of profiles renormalized
+        """
+        return self.assistant.renormalize(platform)
+    
+    def start_realtime(self, platform: str, poll_interval: float = 5.0) -> bool:
+        """
+        Start real-time ingestion of new messages for a platform.
         
-        # Notify for new matches
-        for match in matches:
-            # Check if this is a new match (simplified)
-            # In a real implementation, we would track which matches have been seen
-            self.notification_system.notify_new_match(match)
+        Args:
+            platform: Platform name
+            poll_interval: Seconds between updates-feed polls for platforms without push
+            
+        Returns:
+            bool: True if ingestion was started, False otherwise
+        """
+        return self.assistant.start_realtime(platform, poll_interval)
+    
+    def stop_realtime(self, platform: str = None) -> None:
+        """
+        Stop real-time ingestion.
         
-        return matches
+        Args:
+            platform: Platform name (stops every platform if omitted)
+        """
+        self.assistant.stop_realtime(platform)
     
     def analyze_match(self, match_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -98,47 +177,118 @@ class DatingAppAIAssistant:
         """
         return self.assistant.analyze_match(match_id)
     
-    def generate_initial_message(self, match_id: str) -> Optional[Dict[str, Any]]:
+    def generate_initial_message(self, match_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Generate an initial message for a match.
         
         Args:
             match_id: Match ID
+            use_cache: Whether an identical earlier completion may be reused
             
         Returns:
             Dict or None: Generated message if successful, None otherwise
         """
-        return self.assistant.generate_initial_message(match_id)
+        return self.assistant.generate_initial_message(match_id, use_cache)
+    
+    def stream_initial_message(self, match_id: str, use_cache: bool = True) -> Optional[Iterator[Dict[str, Any]]]:
+        """
+        Generate an initial message for a match, streaming the text as it is produced.
+        
+        Args:
+            match_id: Match ID
+            use_cache: Whether an identical earlier completion may be reused
+            
+        Returns:
+            Iterator or None: Stream events if the match exists, None otherwise
+        """
+        return self.assistant.stream_initial_message(match_id, use_cache)
+    
+    def draft_openers(self, platform: str = None, limit: int = 50, max_concurrency: int = 4,
+                      use_cache: bool = True, priority: str = SPECULATIVE) -> Iterator[Dict[str, Any]]:
+        """
+        Draft initial messages for every match that has no messages yet.
+        
+        Args:
+            platform: Platform name (all platforms if omitted)
+            limit: Maximum number of matches to draft for
+            max_concurrency: Maximum number of matches drafted at once
+            use_cache: Whether identical earlier completions may be reused
+            priority: Scheduler priority class of the LLM requests
+            
+        Returns:
+            Iterator[Dict]: Generated message data, in completion order
+        """
+        return self.assistant.draft_openers(platform, limit, max_concurrency, use_cache, priority)
     
-    def generate_response(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+    def generate_response(self, conversation_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Generate a response for a conversation.
         
         Args:
             conversation_id: Conversation ID
+            use_cache: Whether an identical earlier completion may be reused
             
         Returns:
             Dict or None: Generated message if successful, None otherwise
         """
-        message = self.conversation_manager.generate_response(conversation_id)
+        message = self.conversation_manager.generate_response(conversation_id, use_cache)
         
         if message:
-            # Get match name for notification
-            cursor = self.assistant.storage.conn.cursor()
-            cursor.execute("""
-                SELECT m.name 
-                FROM matches m
-                JOIN conversations c ON m.id = c.match_id
-                WHERE c.id = ?
-            """, (conversation_id,))
+            self._notify_suggested_response(conversation_id)
+        
+        return message
+    
+    def get_reply_draft(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the reply drafted in the background for a conversation's newest message.
+        
+        Args:
+            conversation_id: Conversation ID
             
-            result = cursor.fetchone()
-            match_name = result[0] if result else "Match"
+        Returns:
+            Dict or None: Message data if a current draft exists, None otherwise
+        """
+        return self.conversation_manager.get_reply_draft(conversation_id)
+    
+    def stream_response(self, conversation_id: str, use_cache: bool = True) -> Optional[Iterator[Dict[str, Any]]]:
+        """
+        Generate a response for a conversation, streaming the text as it is produced.
+        
+        Args:
+            conversation_id: Conversation ID
+            use_cache: Whether an identical earlier completion may be reused
             
-            # Notify of suggested response
-            self.notification_system.notify_suggested_response(conversation_id, match_name)
+        Returns:
+            Iterator or None: Stream events if the conversation exists, None otherwise
+        """
+        events = self.conversation_manager.stream_response(conversation_id, use_cache)
+        if events is None:
+            return None
         
-        return message
+        def notify_when_done():
+            for event in events:
+                yield event
+                if event['type'] == 'done':
+                    self._notify_suggested_response(conversation_id)
+        
+        return notify_when_done()
+    
+    def _notify_suggested_response(self, conversation_id: str) -> None:
+        """Notify that a response was suggested for a conversation."""
+        # Get match name for notification
+        cursor = self.assistant.storage.conn.cursor()
+        cursor.execute("""
+            SELECT m.name 
+            FROM matches m
+            JOIN conversations c ON m.id = c.match_id
+            WHERE c.id = ?
+        """, (conversation_id,))
+        
+        result = cursor.fetchone()
+        match_name = result[0] if result else "Match"
+        
+        # Notify of suggested response
+        self.notification_system.notify_suggested_response(conversation_id, match_name)
     
     def approve_and_send_message(self, platform: str, match_id: str, message_data: Dict[str, Any]) -> bool:
         """
@@ -228,6 +378,15 @@ class DatingAppAIAssistant:
         """
         return self.analytics.get_user_stats()
     
+    def get_llm_metrics(self) -> Dict[str, Any]:
+        """
+        Get LLM queue depths, waits and remaining budgets.
+        
+        Returns:
+            Dict: Scheduler metrics per priority class
+        """
+        return self.assistant.message_generator.scheduler.metrics()
+    
     def get_message_activity(self, days: int = 30) -> Dict[str, Any]:
         """
         Get message activity over time.
@@ -254,5 +413,6 @@ class DatingAppAIAssistant:
     
     def close(self):
         """Close connections and clean up resources."""
+        self.conversation_manager.close()
         self.assistant.close()
         logger.info("Dating App AI Assistant closed")
@@ -5,10 +5,11 @@ Connects the webscraping and message generation modules.
 
 import os
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional
 
 from src.dating_app import DatingAppAI
 from src.message_generator import MessageGenerator
+from src.llm_scheduler import SPECULATIVE
 from src.storage import DataStorage
 
 # Configure logging
@@ -22,16 +23,17 @@ logger = logging.getLogger('integration')
 class DatingAssistant:
     """Main integration class for the dating app AI assistant."""
     
-    def __init__(self, storage_path: str = None):
+    def __init__(self, storage_path: str = None, prefetch_profiles: bool = False):
         """
         Initialize the dating assistant.
         
         Args:
             storage_path: Path to the storage database
+            prefetch_profiles: Whether to fetch full profiles of newly seen matches in the background
         """
-        self.dating_app = DatingAppAI(storage_path)
-        self.message_generator = MessageGenerator()
+        self.dating_app = DatingAppAI(storage_path, prefetch_profiles=prefetch_profiles)
         self.storage = self.dating_app.storage
+        self.message_generator = MessageGenerator(storage=self.storage)
         
         logger.info("Dating Assistant initialized")
     
@@ -73,6 +75,53 @@ class DatingAssistant:
         """
         return self.dating_app.get_matches(platform, limit)
     
+    def sync_delta(self, platform: str, limit: int = 100) -> Dict[str, Any]:
+        """
+        Sync only what changed on a platform since the last sync.
+        
+        Args:
+            platform: Platform name
+            limit: Maximum number of items to retrieve per list
+            
+        Returns:
+            Dict: Sync summary
+        """
+        return self.dating_app.sync_delta(platform, limit)
+    
+    def renormalize(self, platform: str = None) -> int:
+        """
+        Re-run archived raw payloads through the current normalizers.
+        
+        Args:
+            platform: Platform name to restrict to (optional)
+            
+        Returns:
+            int: Number of profiles renormalized
+        """
+        return self.dating_app.renormalize(platform)
+    
+    def start_realtime(self, platform: str, poll_interval: float = 5.0) -> bool:
+        """
+        Start real-time ingestion of new messages for a platform.
+        
+        Args:
+            platform: Platform name
+            poll_interval: Seconds between updates-feed polls for platforms without push
+            
+        Returns:
+            bool: True if ingestion was started, False otherwise
+        """
+        return self.dating_app.start_realtime(platform, poll_interval)
+    
+    def stop_realtime(self, platform: str = None) -> None:
+        """
+        Stop real-time ingestion.
+        
+        Args:
+            platform: Platform name (stops every platform if omitted)
+        """
+        self.dating_app.stop_realtime(platform)
+    
     def analyze_match(self, match_id: str) -> Optional[Dict[str, Any]]:
         """
         Analyze a match's profile.
@@ -96,12 +145,13 @@ class DatingAssistant:
         
         return analysis
     
-    def generate_initial_message(self, match_id: str) -> Optional[Dict[str, Any]]:
+    def generate_initial_message(self, match_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Generate an initial message for a match.
         
         Args:
             match_id: Match ID
+            use_cache: Whether an identical earlier completion may be reused
             
         Returns:
             Dict or None: Generated message if successful, None otherwise
@@ -114,17 +164,60 @@ class DatingAssistant:
             return None
         
         # Generate message
-        message = self.message_generator.generate_initial_message(match_profile)
+        message = self.message_generator.generate_initial_message(match_profile, use_cache)
         logger.info(f"Generated initial message for match {match_id}")
         
         return message
     
-    def generate_response(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+    def stream_initial_message(self, match_id: str, use_cache: bool = True) -> Optional[Iterator[Dict[str, Any]]]:
+        """
+        Generate an initial message for a match, streaming the text as it is produced.
+        
+        Args:
+            match_id: Match ID
+            use_cache: Whether an identical earlier completion may be reused
+            
+        Returns:
+            Iterator or None: Stream events (see MessageGenerator.stream_initial_message)
+            if the match exists, None otherwise
+        """
+        match_profile = self.storage.get_match(match_id)
+        
+        if not match_profile:
+            logger.warning(f"Match {match_id} not found in storage")
+            return None
+        
+        return self.message_generator.stream_initial_message(match_profile, use_cache)
+    
+    def draft_openers(self, platform: str = None, limit: int = 50, max_concurrency: int = 4,
+                      use_cache: bool = True, priority: str = SPECULATIVE) -> Iterator[Dict[str, Any]]:
+        """
+        Draft initial messages for every match that has no messages yet.
+        
+        Drafts are requested by a user waiting for them, so they run in the
+        speculative class rather than as batch work.
+        
+        Args:
+            platform: Platform name (all platforms if omitted)
+            limit: Maximum number of matches to draft for
+            max_concurrency: Maximum number of matches drafted at once
+            use_cache: Whether identical earlier completions may be reused
+            priority: Scheduler priority class of the LLM requests
+            
+        Returns:
+            Iterator[Dict]: Generated message data, in completion order
+        """
+        profiles = self.storage.get_matches_without_conversation(platform, limit)
+        logger.info(f"Drafting openers for {len(profiles)} new matches")
+        return self.message_generator.generate_initial_messages(profiles, max_concurrency, use_cache, priority)
+    
+    def generate_response(self, conversation_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Generate a response for a conversation.
         
         Args:
             conversation_id: Conversation ID
+            use_cache: Whether an identical earlier completion may be reused
             
         Returns:
             Dict or None: Generated message if successful, None otherwise
@@ -155,7 +248,8 @@ class DatingAssistant:
             return None
         
         # Generate response
-        message = self.message_generator.generate_response(messages, match_profile)
+        message = self.message_generator.generate_response(messages, match_profile, use_cache,
+                                                           conversation_id=conversation_id)
         logger.info(f"Generated response for conversation {conversation_id}")
         
         return message
@@ -0,0 +1,112 @@
+"""
+Candidate ranking module for the dating app AI assistant.
+Orders alternative generated messages with cheap local heuristics, so the
+best one is shown first without another model call.
+"""
+
+import re
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger('candidate_ranker')
+
+# Openings that make a message read as generic
+GENERIC_OPENINGS = (
+    "hey", "hi there", "hello there", "how are you", "what's up", "how's it going",
+    "how was your day", "nice profile", "you seem cool",
+)
+
+# Leftovers of the model explaining or formatting its answer
+ARTIFACT_PATTERN = re.compile(r'^(message|response|option \d+)\s*:|^["\']|\n\s*\n', re.IGNORECASE)
+
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+class CandidateRanker:
+    """Scores generated messages on length, engagement, personalization and polish."""
+
+    def __init__(self, min_length: int = 20, max_length: int = 300, ideal_length: tuple = (40, 180)):
+        """
+        Initialize the candidate ranker.
+
+        Args:
+            min_length: Characters below which a message is too short
+            max_length: Characters above which a message is too long
+            ideal_length: Range of characters messages are preferred in
+        """
+        self.min_length = min_length
+        self.max_length = max_length
+        self.ideal_length = ideal_length
+
+    def rank(self, candidates: List[str], profile_data: Dict[str, Any],
+             last_message: Optional[str] = None) -> List[str]:
+        """
+        Order candidates from best to worst, dropping empty ones and duplicates.
+
+        Candidates with equal scores keep their order.
+
+        Args:
+            candidates: Generated message texts
+            profile_data: Normalized profile data of the match
+            last_message: Latest message from the match being replied to (optional)
+
+        Returns:
+            List[str]: Distinct non-empty candidates, best first
+        """
+        distinct, seen = [], set()
+        for candidate in candidates:
+            text = (candidate or '').strip()
+            normalized = ' '.join(WORD_PATTERN.findall(text.lower()))
+            if text and normalized not in seen:
+                seen.add(normalized)
+                distinct.append(text)
+
+        return sorted(distinct, key=lambda text: -self.score(text, profile_data, last_message))
+
+    def score(self, text: str, profile_data: Dict[str, Any], last_message: Optional[str] = None) -> float:
+        """
+        Score a generated message; higher is better.
+
+        Args:
+            text: Message text
+            profile_data: Normalized profile data of the match
+            last_message: Latest message from the match being replied to (optional)
+
+        Returns:
+            float: Score
+        """
+        lowered = text.lower()
+        words = set(WORD_PATTERN.findall(lowered))
+        score = 0.0
+
+        # Brief messages get replies; walls of text and one-liners do not
+        if self.ideal_length[0] <= len(text) <= self.ideal_length[1]:
+            score += 1.0
+        elif len(text) < self.min_length or len(text) > self.max_length:
+            score -= 1.0
+
+        # One question keeps the conversation going; an interrogation does not
+        questions = text.count('?')
+        if questions == 1:
+            score += 1.0
+        elif questions > 2:
+            score -= 0.5
+
+        # Reward references to the match and to what they wrote
+        name = (profile_data.get('name') or '').lower()
+        if name and name in words:
+            score += 0.5
+        interests = [interest.lower() for interest in profile_data.get('interests') or [] if interest]
+        if any(interest in lowered for interest in interests):
+            score += 1.0
+        if last_message:
+            topics = {word for word in WORD_PATTERN.findall(last_message.lower()) if len(word) > 4}
+            score += min(1.0, 0.5 * len(topics & words))
+
+        if lowered.startswith(GENERIC_OPENINGS) and len(text) < self.ideal_length[0] * 2:
+            score -= 1.0
+        if ARTIFACT_PATTERN.search(text):
+            score -= 1.0
+        if text.count('!') > 2:
+            score -= 0.5
+
+        return score
@@ -0,0 +1,121 @@
+"""
+Completion cache module for the dating app AI assistant.
+Reuses LLM completions for identical requests through an in-memory LRU tier
+backed by a SQLite tier that survives restarts.
+"""
+
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from src.storage import DataStorage
+
+logger = logging.getLogger('completion_cache')
+
+class CompletionCache:
+    """Exact-match cache of LLM completions keyed by model, messages and parameters."""
+
+    def __init__(self, storage: DataStorage = None, max_entries: int = 256, ttl: float = 24 * 3600):
+        """
+        Initialize the completion cache.
+
+        Args:
+            storage: Data storage for the disk tier (memory only if omitted)
+            max_entries: Maximum number of completions kept in memory
+            ttl: Seconds a completion is reused
+        """
+        self.storage = storage
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.storage:
+            self.storage.delete_cached_completions(max_age=self.ttl)
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], **params) -> str:
+        """
+        Get the cache key of a completion request.
+
+        Message content is compared with leading and trailing whitespace
+        stripped from every line, so indentation of prompt literals does
+        not split otherwise identical requests.
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            **params: Other request parameters
+
+        Returns:
+            str: Request hash
+        """
+        normalized = [
+            {
+                'role': message.get('role', ''),
+                'content': '\n'.join(line.strip() for line in str(message.get('content', '')).strip().splitlines())
+            }
+            for message in messages
+        ]
+        request = {'model': model, 'messages': normalized, 'params': params}
+        return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached completion, checking memory before disk.
+
+        Args:
+            key: Request hash from make_key
+
+        Returns:
+            str or None: Completion if cached, None otherwise
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        completion = self.storage.get_cached_completion(key, self.ttl) if self.storage else None
+        with self._lock:
+            if completion is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._remember(key, completion)
+        return completion
+
+    def put(self, key: str, model: str, completion: str) -> None:
+        """
+        Cache a completion in both tiers.
+
+        Args:
+            key: Request hash from make_key
+            model: Model that produced the completion
+            completion: Completion text
+        """
+        self._remember(key, completion)
+        if self.storage:
+            self.storage.save_cached_completion(key, model, completion)
+
+    def clear(self) -> None:
+        """Drop every cached completion."""
+        with self._lock:
+            self._memory.clear()
+        if self.storage:
+            self.storage.delete_cached_completions()
+
+    def _remember(self, key: str, completion: str) -> None:
+        """Add a completion to the memory tier, evicting the least recently used."""
+        with self._lock:
+            self._memory[key] = (completion, time.monotonic())
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
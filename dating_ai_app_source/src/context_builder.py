@@ -0,0 +1,160 @@
+"""
+Conversation context module for the dating app AI assistant.
+Fits conversation history into a token budget by keeping the newest messages
+and folding older ones into a rolling summary persisted per conversation.
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+from src.storage import DataStorage
+
+logger = logging.getLogger('context_builder')
+
+# Tokens the chat format adds around each message
+MESSAGE_OVERHEAD = 4
+
+Position = Tuple[str, str]
+
+class ContextBuilder:
+    """Builds token-budgeted response context from conversation history."""
+
+    def __init__(self, storage: DataStorage = None, model: str = "gpt-4", token_budget: int = 1500,
+                 summary_tokens: int = 300, summary_batch: int = 50,
+                 summarize: Callable[[str, List[Dict[str, Any]]], Optional[str]] = None):
+        """
+        Initialize the context builder.
+
+        Args:
+            storage: Data storage holding messages and summaries (summaries are disabled if omitted)
+            model: Model whose tokenizer is used to count tokens
+            token_budget: Maximum tokens of history and summary sent with a prompt
+            summary_tokens: Part of the budget reserved for the summary
+            summary_batch: Maximum number of messages folded into the summary per call
+            summarize: Callback summarize(previous_summary, messages) returning the
+                extended summary, or None if it failed (summaries are disabled if omitted)
+        """
+        self.storage = storage
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.summary_batch = summary_batch
+        self.summarize = summarize
+        self.encoding = None
+
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding('cl100k_base')
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Count the tokens of a text.
+
+        Estimates four characters per token when tiktoken is not installed.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            int: Number of tokens
+        """
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        return len(text) // 4 + 1
+
+    def build(self, conversation_history: List[Dict[str, Any]], conversation_id: str = None,
+              **summarize_kwargs) -> Dict[str, Any]:
+        """
+        Build the context for a response.
+
+        The newest messages that fit the budget are kept verbatim. Older
+        messages are folded into the conversation's summary, which only
+        ever covers messages that have not been summarized before.
+
+        History mixes platform and local conversation IDs (synced messages
+        carry the platform's), so the summary is keyed by the local ID the
+        caller resolved rather than by any message.
+
+        Args:
+            conversation_history: Messages of one conversation, in any order
+            conversation_id: Local conversation ID (the summary is not used if omitted)
+            **summarize_kwargs: Extra arguments passed to the summarize callback
+
+        Returns:
+            Dict: 'summary' of the older messages ('' if none) and 'messages',
+            the recent messages oldest first
+        """
+        history = sorted(conversation_history, key=self._position)
+
+        summary, covered = '', None
+        if self.storage and conversation_id:
+            record = self.storage.get_conversation_summary(conversation_id)
+            if record:
+                summary = record['summary'] or ''
+                covered = (record['covered_until'] or '', record['covered_message_id'] or '')
+                history = [msg for msg in history if self._position(msg) > covered]
+
+        # Keep the newest messages that fit, always including the last one
+        budget = self.token_budget - self.summary_tokens
+        recent, used = [], 0
+        for msg in reversed(history):
+            tokens = self.count_tokens(msg.get('content') or '') + MESSAGE_OVERHEAD
+            if recent and used + tokens > budget:
+                break
+            recent.append(msg)
+            used += tokens
+        recent.reverse()
+
+        older = history[:len(history) - len(recent)]
+        if older and self.summarize and self.storage and conversation_id:
+            summary = self._extend_summary(conversation_id, summary, covered, self._position(older[-1]),
+                                           **summarize_kwargs)
+
+        return {'summary': summary, 'messages': recent}
+
+    def _extend_summary(self, conversation_id: str, summary: str, covered: Optional[Position],
+                        until: Position, **summarize_kwargs) -> str:
+        """
+        Fold the messages after the summary's coverage, up to a position, into the summary.
+
+        Messages are read from storage so turns older than the history
+        passed to build() are summarized as well. Progress is saved after
+        each batch; if summarizing fails, the rest is retried next time.
+
+        Args:
+            conversation_id: Local conversation ID
+            summary: Current summary
+            covered: Position of the last summarized message (None if nothing is summarized)
+            until: Position of the last message to summarize
+            **summarize_kwargs: Extra arguments passed to the summarize callback
+
+        Returns:
+            str: Extended summary
+        """
+        while True:
+            after_sent_at, after_id = covered or (None, None)
+            batch = self.storage.get_messages_since(conversation_id, after_sent_at, after_id, self.summary_batch)
+            batch = [msg for msg in batch if self._position(msg) <= until]
+            if not batch:
+                return summary
+
+            extended = self.summarize(summary, batch, **summarize_kwargs)
+            if extended is None:
+                logger.warning(f"Could not extend summary of conversation {conversation_id}")
+                return summary
+
+            summary = extended
+            covered = self._position(batch[-1])
+            self.storage.save_conversation_summary(conversation_id, summary, *covered)
+            logger.info(f"Summarized {len(batch)} messages of conversation {conversation_id}")
+
+    @staticmethod
+    def _position(message: Dict[str, Any]) -> Position:
+        """Get the (sent_at, id) position of a message in its conversation."""
+        return (message.get('sent_at') or '', message.get('id') or '')
@@ -8,11 +8,13 @@ import json
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from threading import Thread, Event
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+from threading import Thread, Event, Lock
+from concurrent.futures import ThreadPoolExecutor
 
 from src.storage import DataStorage
 from src.message_generator import MessageGenerator
+from src.llm_scheduler import SPECULATIVE
 
 # Configure logging
 logging.basicConfig(
@@ -25,19 +27,30 @@ logger = logging.getLogger('conversation_manager')
 class ConversationManager:
     """Manages conversations and message flow."""
     
-    def __init__(self, storage: DataStorage, message_generator: MessageGenerator):
+    def __init__(self, storage: DataStorage, message_generator: MessageGenerator, dating_app=None,
+                 draft_replies: bool = True, draft_workers: int = 2):
         """
         Initialize the conversation manager.
         
         Args:
             storage: Data storage instance
             message_generator: Message generator instance
+            dating_app: DatingAppAI whose pooled platform sessions monitors share (optional)
+            draft_replies: Whether replies to new match messages are drafted in the background
+            draft_workers: Maximum number of replies drafted at once
         """
         self.storage = storage
         self.message_generator = message_generator
+        self.dating_app = dating_app
+        self.draft_replies = draft_replies
         self.active_conversations = {}
         self.monitoring_threads = {}
         self.stop_events = {}
+        self._dating_app_lock = Lock()
+        # Newest match message awaiting a draft, per conversation
+        self._draft_triggers = {}
+        self._draft_lock = Lock()
+        self._draft_executor = ThreadPoolExecutor(max_workers=max(1, draft_workers), thread_name_prefix='reply-drafts')
         
         logger.info("Conversation Manager initialized")
     
@@ -233,10 +246,8 @@ class ConversationManager:
             check_interval: Interval between checks in seconds
             stop_event: Event to signal thread to stop
         """
-        from src.dating_app import DatingAppAI
-        
-        # Create dating app instance
-        dating_app = DatingAppAI()
+        # Every monitor shares one dating app and its pooled platform sessions
+        dating_app = self._get_dating_app()
         
         # Get platform-specific conversation ID
         cursor = self.storage.conn.cursor()
@@ -284,6 +295,20 @@ class ConversationManager:
                 logger.error(f"Error monitoring conversation: {str(e)}")
                 time.sleep(check_interval)
     
+    def _get_dating_app(self):
+        """
+        Get the dating app used by monitors, creating a shared one on first use.
+        
+        Returns:
+            DatingAppAI: Dating app instance
+        """
+        if self.dating_app is None:
+            from src.dating_app import DatingAppAI
+            with self._dating_app_lock:
+                if self.dating_app is None:
+                    self.dating_app = DatingAppAI()
+        return self.dating_app
+    
     def _notify_new_messages(self, conversation_id: str) -> None:
         """
         Notify listeners of new messages.
@@ -295,16 +320,168 @@ class ConversationManager:
         # For this prototype, we'll just log it
         logger.info(f"New messages notification for conversation {conversation_id}")
     
-    def generate_response(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+    def generate_response(self, conversation_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Generate a response for a conversation.
         
+        A reply drafted in the background for the newest message is returned
+        without generating a new one.
+        
         Args:
             conversation_id: Conversation ID
+            use_cache: Whether a draft or an identical earlier completion may be reused
             
         Returns:
             Dict or None: Generated message if successful, None otherwise
         """
+        if use_cache:
+            draft = self.get_reply_draft(conversation_id)
+            if draft:
+                return draft
+        
+        context = self._response_context(conversation_id)
+        if not context:
+            return None
+        messages, match_profile = context
+        
+        # Generate response
+        message = self.message_generator.generate_response(messages, match_profile, use_cache,
+                                                           conversation_id=conversation_id)
+        
+        # Add conversation ID
+        message["conversation_id"] = conversation_id
+        
+        logger.info(f"Generated response for conversation {conversation_id}")
+        return message
+    
+    def stream_response(self, conversation_id: str, use_cache: bool = True) -> Optional[Iterator[Dict[str, Any]]]:
+        """
+        Generate a response for a conversation, streaming the text as it is produced.
+        
+        A reply drafted in the background is sent as a single delta.
+        
+        Args:
+            conversation_id: Conversation ID
+            use_cache: Whether a draft or an identical earlier completion may be reused
+            
+        Returns:
+            Iterator or None: Stream events (see MessageGenerator.stream_response)
+            if the conversation exists, None otherwise
+        """
+        draft = self.get_reply_draft(conversation_id) if use_cache else None
+        if draft:
+            return iter([{"type": "delta", "text": draft['content']}, {"type": "done", "message": draft}])
+        
+        context = self._response_context(conversation_id)
+        if not context:
+            return None
+        messages, match_profile = context
+        
+        def events():
+            for event in self.message_generator.stream_response(messages, match_profile, use_cache,
+                                                                conversation_id):
+                if event['type'] == 'done':
+                    event['message']["conversation_id"] = conversation_id
+                    logger.info(f"Generated response for conversation {conversation_id}")
+                yield event
+        
+        return events()
+    
+    def draft_reply(self, conversation_id: str, message_id: str) -> None:
+        """
+        Draft a reply to a new match message in the background.
+        
+        Drafts run in the speculative LLM class, so they never delay a user
+        waiting on a reply. When several messages arrive before a queued
+        draft starts, only the newest is drafted for.
+        
+        Args:
+            conversation_id: Local conversation ID
+            message_id: ID of the stored match message
+        """
+        if not self.draft_replies or not self.message_generator.router:
+            return
+        
+        with self._draft_lock:
+            queued = conversation_id in self._draft_triggers
+            self._draft_triggers[conversation_id] = message_id
+        if not queued:
+            self._draft_executor.submit(self._draft_reply, conversation_id)
+    
+    def _draft_reply(self, conversation_id: str) -> None:
+        """
+        Draft a reply to the newest queued match message of a conversation.
+        
+        Args:
+            conversation_id: Conversation ID
+        """
+        with self._draft_lock:
+            message_id = self._draft_triggers.pop(conversation_id, None)
+        if not message_id:
+            return
+        
+        try:
+            if self.storage.get_latest_message_id(conversation_id) != message_id:
+                return
+            context = self._response_context(conversation_id)
+            if not context:
+                return
+            messages, match_profile = context
+            
+            # Template replies are instant, so only LLM replies are worth keeping
+            message = self.message_generator.generate_response(messages, match_profile, priority=SPECULATIVE,
+                                                               use_templates=False, conversation_id=conversation_id)
+            if not message:
+                return
+            
+            if self.storage.save_reply_draft(conversation_id, message_id, match_profile.get('id', ''),
+                                             message['content'], message.get('alternatives')):
+                logger.info(f"Drafted reply to message {message_id} in conversation {conversation_id}")
+            else:
+                logger.info(f"Discarded draft for conversation {conversation_id}, newer messages arrived")
+        
+        except Exception as e:
+            logger.error(f"Error drafting reply for conversation {conversation_id}: {str(e)}")
+    
+    def get_reply_draft(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the reply drafted in the background for a conversation's newest message.
+        
+        Args:
+            conversation_id: Conversation ID
+            
+        Returns:
+            Dict or None: Message data if a current draft exists, None otherwise
+        """
+        draft = self.storage.get_reply_draft(conversation_id)
+        if not draft:
+            return None
+        
+        logger.info(f"Using reply drafted for message {draft['message_id']} in conversation {conversation_id}")
+        return {
+            "content": draft['content'],
+            "alternatives": draft['alternatives'],
+            "match_id": draft['match_id'],
+            "conversation_id": conversation_id,
+            "reply_to": draft['message_id'],
+            "ai_generated": True,
+            "ai_approved": False
+        }
+    
+    def close(self) -> None:
+        """Stop drafting replies, dropping drafts that have not started."""
+        self._draft_executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _response_context(self, conversation_id: str) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+        """
+        Get the history and match profile a response is generated from.
+        
+        Args:
+            conversation_id: Conversation ID
+            
+        Returns:
+            Tuple or None: (messages, match profile) if found, None otherwise
+        """
         # Get conversation history
         messages = self.get_conversation_history(conversation_id)
         
@@ -330,14 +507,7 @@ class ConversationManager:
             logger.warning(f"Match {match_id} not found in storage")
             return None
         
-        # Generate response
-        message = self.message_generator.generate_response(messages, match_profile)
-        
-        # Add conversation ID
-        message["conversation_id"] = conversation_id
-        
-        logger.info(f"Generated response for conversation {conversation_id}")
-        return message
+        return messages, match_profile
     
     def analyze_conversation_flow(self, conversation_id: str) -> Dict[str, Any]:
         """
@@ -4,11 +4,16 @@ Provides a unified interface for the application functionality.
 """
 
 import os
+import time
 import logging
 import uuid
 from typing import Dict, List, Any, Optional
 
 from src.platform.factory import PlatformFactory
+from src.platform.account_pool import AccountPool, AccountSession, DEFAULT_USER, DEFAULT_ACCOUNT
+from src.platform.token_refresher import TokenRefresher
+from src.platform.prefetch import ProfilePrefetcher
+from src.platform.realtime import MessageStreamListener, UpdatesPoller
 from src.storage import DataStorage
 
 # Configure logging
@@ -22,17 +27,51 @@ logger = logging.getLogger('dating_app')
 class DatingAppAI:
     """Main class for the dating app AI assistant."""
     
-    def __init__(self, storage_path: str = None):
+    # Number of streamed matches or messages stored per transaction
+    STORE_BATCH_SIZE = 100
+    
+    def __init__(self, storage_path: str = None, identity_ttl: int = 3600,
+                 token_refresh_margin: int = 3600, prefetch_profiles: bool = False,
+                 prefetch_workers: int = 2, coalesce_ttl: float = 0.0, user: str = DEFAULT_USER,
+                 account_pool: AccountPool = None, idle_timeout: float = 1800):
         """
         Initialize the dating app AI assistant.
         
         Args:
             storage_path: Path to the storage database
+            identity_ttl: Seconds to cache the authenticated user's profile per platform
+            token_refresh_margin: Seconds before expiry at which tokens are refreshed
+            prefetch_profiles: Whether to fetch full profiles of newly seen matches in the background
+            prefetch_workers: Number of background profile fetch workers
+            coalesce_ttl: Seconds scrapers reuse successful GET responses for bursty callers
+            user: Application user whose platform accounts this instance serves
+            account_pool: Account pool shared with other instances (optional)
+            idle_timeout: Seconds after which unused accounts are evicted from a pool created here
         """
         self.storage = DataStorage(storage_path)
         self.platform_factory = PlatformFactory()
-        self.authenticators = {}
-        self.scrapers = {}
+        self.user = user
+        self.accounts = {}
+        self.normalizers = {}
+        self.identity_ttl = identity_ttl
+        self.owns_account_pool = account_pool is None
+        if account_pool is None:
+            account_pool = AccountPool(
+                self.platform_factory,
+                idle_timeout=idle_timeout,
+                coalesce_ttl=coalesce_ttl,
+                token_refresher=TokenRefresher(refresh_margin=token_refresh_margin)
+            )
+        self.account_pool = account_pool
+        self.token_refresher = account_pool.token_refresher
+        self.prefetcher = None
+        self.realtime_workers = {}
+        
+        if prefetch_profiles:
+            self.prefetcher = ProfilePrefetcher(
+                self._fetch_match_profile, self._store_match_profile, max_workers=prefetch_workers
+            )
+            self.storage.add_match_listener(self._on_match_changed)
         
         logger.info("Dating App AI Assistant initialized")
     
@@ -48,20 +87,19 @@ class DatingAppAI:
             bool: True if authentication was successful, False otherwise
         """
         try:
-            # Create authenticator if not already created
-            if platform not in self.authenticators:
-                self.authenticators[platform] = self.platform_factory.create_authenticator(platform)
-            
-            # Authenticate
-            result = self.authenticators[platform].authenticate(**auth_params)
+            # The pooled session is shared with every thread serving this account
+            account = self._account(platform)
+            result = account.authenticator.authenticate(**auth_params)
             
             if result:
                 logger.info(f"Successfully authenticated with {platform}")
                 
-                # Create scraper if authentication was successful
-                self.scrapers[platform] = self.platform_factory.create_scraper(
-                    platform, self.authenticators[platform]
-                )
+                # Recreate the scraper for the new credentials; the pool keeps
+                # the token registered for background refresh
+                account.reset_scraper()
+                
+                # Cache the account identity so sender classification never has to fetch it
+                self._get_account_identity(platform)
             else:
                 logger.warning(f"Authentication with {platform} failed")
                 
@@ -81,15 +119,57 @@ class DatingAppAI:
         Returns:
             bool: True if authenticated, False otherwise
         """
-        return (
-            platform in self.authenticators and 
-            self.authenticators[platform].is_authenticated()
-        )
+        try:
+            return self._account(platform).authenticator.is_authenticated()
+        except ValueError:
+            return False
+    
+    def select_account(self, platform: str, account: str = DEFAULT_ACCOUNT) -> None:
+        """
+        Choose which of the user's accounts on a platform this instance serves.
+        
+        Args:
+            platform: Platform name
+            account: Account name
+        """
+        self.accounts[platform] = account
+        logger.info(f"Serving {platform} account {account} for user {self.user}")
+    
+    def _account(self, platform: str) -> AccountSession:
+        """
+        Get the pooled session of the selected account on a platform.
+        
+        Args:
+            platform: Platform name
+            
+        Returns:
+            AccountSession: Account session
+            
+        Raises:
+            ValueError: If the platform is not supported
+        """
+        return self.account_pool.get(self.user, platform, self.accounts.get(platform, DEFAULT_ACCOUNT))
+    
+    def _scraper(self, platform: str):
+        """
+        Get the scraper of the selected account on a platform.
+        
+        Args:
+            platform: Platform name
+            
+        Returns:
+            BaseProfileScraper: Platform scraper
+        """
+        return self._account(platform).get_scraper()
     
     def get_user_profile(self, platform: str) -> Optional[Dict[str, Any]]:
         """
         Get the user's profile from a platform.
         
+        The profile is served from the account identity cache and only
+        fetched from the platform when the cached copy is older than
+        identity_ttl.
+        
         Args:
             platform: Platform name
             
@@ -100,13 +180,8 @@ class DatingAppAI:
             logger.warning(f"Not authenticated with {platform}")
             return None
         
-        try:
-            profile = self.scrapers[platform].get_user_profile()
-            logger.info(f"Retrieved user profile from {platform}")
-            return profile
-        except Exception as e:
-            logger.error(f"Error getting user profile from {platform}: {str(e)}")
-            return None
+        identity = self._get_account_identity(platform)
+        return identity['profile'] if identity else None
     
     def get_matches(self, platform: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -124,26 +199,41 @@ class DatingAppAI:
             return []
         
         try:
-            matches = self.scrapers[platform].get_matches(limit)
-            logger.info(f"Retrieved {len(matches)} matches from {platform}")
-            
-            # Normalize and store matches
+            # Normalize and store matches in batches as they are decoded, so
+            # large responses are never held raw alongside their normalized form
             normalized_matches = []
-            for match in matches:
-                normalized = self.scrapers[platform].normalize_profile(match)
-                normalized['platform'] = platform
-                normalized['platform_id'] = match.get('_id', match.get('id', ''))
-                
-                # Store in database
-                self.storage.save_match(normalized)
-                
-                normalized_matches.append(normalized)
+            batch = []
+            for match in self._scraper(platform).iter_matches(limit):
+                batch.append(match)
+                if len(batch) >= self.STORE_BATCH_SIZE:
+                    normalized_matches.extend(self._store_matches(platform, batch))
+                    batch = []
+            normalized_matches.extend(self._store_matches(platform, batch))
+            logger.info(f"Retrieved {len(normalized_matches)} matches from {platform}")
             
             return normalized_matches
         except Exception as e:
             logger.error(f"Error getting matches from {platform}: {str(e)}")
             return []
     
+    def _store_matches(self, platform: str, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Normalize, store and archive a batch of raw matches.
+        
+        Args:
+            platform: Platform name
+            matches: Raw matches from the platform
+            
+        Returns:
+            List[Dict]: Normalized matches
+        """
+        if not matches:
+            return []
+        normalized_matches = [self._normalize_match(platform, match) for match in matches]
+        self.storage.save_matches(normalized_matches, partial=True)
+        self._archive_raw_matches(platform, matches)
+        return normalized_matches
+    
     def get_conversations(self, platform: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get conversations from a platform.
@@ -160,22 +250,30 @@ class DatingAppAI:
             return []
         
         try:
-            conversations = self.scrapers[platform].get_conversations(limit)
+            conversations = self._scraper(platform).get_conversations(limit)
             logger.info(f"Retrieved {len(conversations)} conversations from {platform}")
             
             # Store conversations
-            for conv in conversations:
-                conversation_data = {
-                    'platform': platform,
-                    'platform_id': conv.get('_id', conv.get('id', '')),
-                    'match_id': conv.get('match_id', conv.get('participants', [''])[0]),
-                    'started_at': conv.get('created_date', ''),
-                    'last_message_at': conv.get('last_activity_date', ''),
-                    'status': 'active',
-                    'message_count': conv.get('message_count', 0)
+            conversation_data = [self._build_conversation_data(platform, conv) for conv in conversations]
+            self.storage.save_conversations(conversation_data)
+            
+            # Store the last messages some platforms embed in conversations
+            embedded = [
+                (data['platform_id'], msg)
+                for data, conv in zip(conversation_data, conversations)
+                for msg in conv.get('messages') or []
+            ]
+            if embedded:
+                user_id = self.get_user_id(platform)
+                cutoffs = {
+                    conversation_id: self.storage.get_latest_synced_message_time(conversation_id)
+                    for conversation_id, _ in embedded
                 }
-                
-                self.storage.save_conversation(conversation_data)
+                self.storage.save_messages([
+                    self._build_message_data(conversation_id, msg, user_id,
+                                             self._is_backfill(msg, cutoffs[conversation_id]))
+                    for conversation_id, msg in embedded
+                ])
             
             return conversations
         except Exception as e:
@@ -199,26 +297,355 @@ class DatingAppAI:
             return []
         
         try:
-            messages = self.scrapers[platform].get_conversation_messages(conversation_id, limit)
+            # Store messages in batches as they are decoded
+            user_id = self.get_user_id(platform)
+            cutoff = self.storage.get_latest_synced_message_time(conversation_id)
+            messages = []
+            start = 0
+            for message in self._scraper(platform).iter_conversation_messages(conversation_id, limit):
+                messages.append(message)
+                if len(messages) - start >= self.STORE_BATCH_SIZE:
+                    self.storage.save_messages([
+                        self._build_message_data(conversation_id, msg, user_id, self._is_backfill(msg, cutoff))
+                        for msg in messages[start:]
+                    ])
+                    start = len(messages)
+            self.storage.save_messages([
+                self._build_message_data(conversation_id, msg, user_id, self._is_backfill(msg, cutoff))
+                for msg in messages[start:]
+            ])
             logger.info(f"Retrieved {len(messages)} messages from conversation {conversation_id}")
             
-            # Store messages
-            for msg in messages:
-                message_data = {
-                    'conversation_id': conversation_id,
-                    'sender_type': 'match' if msg.get('from', '') != self.get_user_id(platform) else 'user',
-                    'content': msg.get('message', msg.get('text', '')),
-                    'sent_at': msg.get('created_date', msg.get('timestamp', '')),
-                    'platform_id': msg.get('_id', msg.get('id', ''))
-                }
-                
-                self.storage.save_message(message_data)
-            
             return messages
         except Exception as e:
             logger.error(f"Error getting messages from {platform}: {str(e)}")
             return []
     
+    def sync_delta(self, platform: str, limit: int = 100) -> Dict[str, Any]:
+        """
+        Sync only what changed on a platform since the last sync.
+        
+        The per-account cursor is read from storage, the platform is asked for
+        changes since that cursor, and the changes are applied through bulk
+        upserts. The cursor only advances once the changes are stored.
+        
+        Args:
+            platform: Platform name
+            limit: Maximum number of items to retrieve per list
+            
+        Returns:
+            Dict: Counts of synced 'matches', 'conversations' and 'messages',
+            plus the new 'cursor'
+        """
+        summary = {'matches': 0, 'conversations': 0, 'messages': 0, 'cursor': None}
+        
+        if not self.is_authenticated(platform):
+            logger.warning(f"Not authenticated with {platform}")
+            return summary
+        
+        try:
+            account_id = self.get_user_id(platform)
+            since = self.storage.get_sync_cursor(platform, account_id)
+            updates = self._scraper(platform).get_updates(since, limit)
+            
+            matches = [self._normalize_match(platform, match) for match in updates.get('matches', [])]
+            conversations = [
+                self._build_conversation_data(platform, conv)
+                for conv in updates.get('conversations', [])
+            ]
+            # Without a previous cursor every message is history, not news
+            messages = [
+                self._build_message_data(conversation_id, msg, account_id, backfill=not since)
+                for conversation_id, conversation_messages in updates.get('messages', {}).items()
+                for msg in conversation_messages
+            ]
+            
+            summary['matches'] = self.storage.save_matches(matches, partial=True)
+            self._archive_raw_matches(platform, updates.get('matches', []))
+            summary['conversations'] = self.storage.save_conversations(conversations)
+            summary['messages'] = self.storage.save_messages(messages)
+            
+            cursor = updates.get('cursor')
+            if cursor and cursor != since:
+                self.storage.set_sync_cursor(platform, account_id, cursor)
+            summary['cursor'] = cursor
+            
+            logger.info(f"Delta sync with {platform}: {summary['matches']} matches, "
+                        f"{summary['conversations']} conversations, {summary['messages']} messages")
+            return summary
+        except Exception as e:
+            logger.error(f"Error syncing changes from {platform}: {str(e)}")
+            return summary
+    
+    def start_realtime(self, platform: str, poll_interval: float = 5.0) -> bool:
+        """
+        Start real-time ingestion of new messages for a platform account.
+        
+        Platforms with a push channel keep one persistent connection and
+        store messages as they arrive, catching up through sync_delta after
+        every reconnect. Other platforms poll their updates feed once per
+        account instead of polling each conversation.
+        
+        Args:
+            platform: Platform name
+            poll_interval: Seconds between updates-feed polls for platforms without push
+            
+        Returns:
+            bool: True if ingestion was started, False otherwise
+        """
+        if not self.is_authenticated(platform):
+            logger.warning(f"Not authenticated with {platform}")
+            return False
+        
+        self.stop_realtime(platform)
+        account = self._account(platform)
+        scraper = account.get_scraper()
+        if scraper.SUPPORTS_MESSAGE_STREAM:
+            worker = MessageStreamListener(
+                account.name,
+                scraper,
+                lambda conversation_id, message: self._ingest_stream_message(platform, conversation_id, message),
+                on_connect=lambda: self.sync_delta(platform)
+            )
+        else:
+            worker = UpdatesPoller(account.name, lambda: self.sync_delta(platform), poll_interval)
+        
+        # Long-lived workers keep the account's session from being evicted
+        account.pin()
+        worker.start()
+        self.realtime_workers[platform] = (worker, account)
+        return True
+    
+    def stop_realtime(self, platform: str = None) -> None:
+        """
+        Stop real-time ingestion.
+        
+        Args:
+            platform: Platform name (stops every platform if omitted)
+        """
+        platforms = [platform] if platform else list(self.realtime_workers)
+        for name in platforms:
+            entry = self.realtime_workers.pop(name, None)
+            if entry:
+                worker, account = entry
+                worker.stop()
+                account.unpin()
+    
+    def _ingest_stream_message(self, platform: str, conversation_id: str, message: Dict[str, Any]) -> None:
+        """
+        Store a message pushed over a platform's message stream.
+        
+        Args:
+            platform: Platform name
+            conversation_id: Platform conversation ID
+            message: Raw message data from the platform
+        """
+        cutoff = self.storage.get_latest_synced_message_time(conversation_id)
+        self.storage.save_message(
+            self._build_message_data(conversation_id, message, self.get_user_id(platform),
+                                     self._is_backfill(message, cutoff))
+        )
+    
+    def renormalize(self, platform: str = None, batch_size: int = 500) -> int:
+        """
+        Re-run archived raw payloads through the current normalizers.
+        
+        Lets normalization improvements reach every stored profile without
+        re-downloading them from the platform.
+        
+        Args:
+            platform: Platform name to restrict to (optional)
+            batch_size: Number of profiles upserted per transaction
+            
+        Returns:
+            int: Number of profiles renormalized
+        """
+        count = 0
+        batch = []
+        partial = []
+        
+        for row_platform, platform_id, fetched_at, payload, kind in self.storage.iter_raw_payloads(platform,
+                                                                                                    batch_size):
+            try:
+                # Prefetched full profiles carry the person's ID, not the match ID they are archived under
+                normalized = self._normalize_match(row_platform, payload)
+                normalized['platform_id'] = platform_id
+                batch.append(normalized)
+                partial.append(kind != 'profile')
+            except Exception as e:
+                logger.error(f"Error renormalizing {row_platform} profile {platform_id}: {str(e)}")
+                continue
+            
+            if len(batch) >= batch_size:
+                count += self.storage.save_matches(batch, partial)
+                batch = []
+                partial = []
+        
+        count += self.storage.save_matches(batch, partial)
+        logger.info(f"Renormalized {count} profiles")
+        return count
+    
+    def _on_match_changed(self, event: str, match_id: str, match_data: Dict[str, Any]) -> None:
+        """
+        Queue newly seen matches for a full profile fetch.
+        
+        Args:
+            event: 'inserted' or 'updated'
+            match_id: Stored match ID
+            match_data: Normalized match data
+        """
+        if event == 'inserted' and self.is_authenticated(match_data.get('platform', '')):
+            self.prefetcher.enqueue(match_data['platform'], match_data.get('platform_id', ''))
+    
+    def _fetch_match_profile(self, platform: str, profile_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a match's full profile for the prefetcher.
+        
+        Args:
+            platform: Platform name
+            profile_id: Platform ID of the match
+            
+        Returns:
+            Dict or None: Raw profile data if available, None otherwise
+        """
+        if not self.is_authenticated(platform):
+            return None
+        return self._scraper(platform).get_match_profile(profile_id)
+    
+    def _store_match_profile(self, platform: str, profile_id: str, profile: Dict[str, Any]) -> None:
+        """
+        Store a prefetched full profile over the match's list-level data.
+        
+        Args:
+            platform: Platform name
+            profile_id: Platform ID of the match
+            profile: Raw profile data from the platform
+        """
+        normalized = self._normalize_match(platform, profile)
+        normalized['platform_id'] = profile_id
+        self.storage.save_match(normalized)
+        self.storage.save_raw_payloads(platform, [(profile_id, profile)], kind='profile')
+    
+    def _archive_raw_matches(self, platform: str, matches: List[Dict[str, Any]]) -> None:
+        """
+        Archive raw match payloads so they can be renormalized later.
+        
+        Args:
+            platform: Platform name
+            matches: Raw match data from the platform
+        """
+        self.storage.save_raw_payloads(
+            platform, [(match.get('_id', match.get('id', '')), match) for match in matches]
+        )
+    
+    def _get_normalizer(self, platform: str):
+        """
+        Get a scraper that can normalize a platform's raw profiles.
+        
+        Normalization needs no network access, so an unauthenticated
+        scraper is created when the platform has not been authenticated.
+        
+        Args:
+            platform: Platform name
+            
+        Returns:
+            BaseProfileScraper: Platform scraper
+        """
+        if self.is_authenticated(platform):
+            return self._scraper(platform)
+        if platform not in self.normalizers:
+            self.normalizers[platform] = self.platform_factory.create_scraper(platform)
+        return self.normalizers[platform]
+    
+    def _normalize_match(self, platform: str, match: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize raw platform match data for storage.
+        
+        Args:
+            platform: Platform name
+            match: Raw match data from the platform
+            
+        Returns:
+            Dict: Normalized match data
+        """
+        normalized = self._get_normalizer(platform).normalize_profile(match)
+        normalized['platform'] = platform
+        normalized['platform_id'] = match.get('_id', match.get('id', ''))
+        return normalized
+    
+    def _build_conversation_data(self, platform: str, conv: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build storage data from a raw platform conversation.
+        
+        Args:
+            platform: Platform name
+            conv: Raw conversation data from the platform
+            
+        Returns:
+            Dict: Conversation data
+        """
+        # A Tinder conversation is the match itself; elsewhere the match is a participant
+        if platform == 'tinder':
+            match_id = conv.get('_id', conv.get('id', ''))
+        else:
+            match_id = conv.get('match_id', conv.get('participants', [''])[0])
+        return {
+            'platform': platform,
+            'platform_id': conv.get('_id', conv.get('id', conv.get('channel_url', ''))),
+            'match_id': match_id,
+            'started_at': conv.get('created_date', ''),
+            'last_message_at': conv.get('last_activity_date', ''),
+            'status': 'active',
+            'message_count': conv.get('message_count', 0)
+        }
+    
+    def _build_message_data(self, conversation_id: str, msg: Dict[str, Any], user_id: str,
+                            backfill: bool = False) -> Dict[str, Any]:
+        """
+        Build storage data from a raw platform message.
+        
+        Args:
+            conversation_id: Conversation ID
+            msg: Raw message data from the platform
+            user_id: Platform user ID of the authenticated account
+            backfill: Whether the message is history rather than news
+            
+        Returns:
+            Dict: Message data
+        """
+        sender = msg.get('from', (msg.get('user') or {}).get('user_id', ''))
+        return {
+            'conversation_id': conversation_id,
+            'sender_type': 'match' if sender != user_id else 'user',
+            'content': msg.get('message', msg.get('text', '')),
+            'sent_at': self._message_time(msg),
+            'platform_id': msg.get('_id', msg.get('id', msg.get('message_id', ''))),
+            'backfill': backfill
+        }
+    
+    @staticmethod
+    def _message_time(msg: Dict[str, Any]) -> Any:
+        """Get the send time of a raw platform message."""
+        return msg.get('created_date', msg.get('timestamp', msg.get('created_at', '')))
+    
+    @classmethod
+    def _is_backfill(cls, msg: Dict[str, Any], cutoff: Optional[str]) -> bool:
+        """
+        Check whether a raw message fetched outside a delta sync is history rather than news.
+        
+        A conversation seen for the first time is all history, as is
+        anything not newer than the messages already synced for it.
+        
+        Args:
+            msg: Raw message data from the platform
+            cutoff: Send time of the newest synced message of the conversation
+                (None if none were synced), read before storing any of the fetch
+            
+        Returns:
+            bool: True if the message is history
+        """
+        return cutoff is None or str(cls._message_time(msg)) <= cutoff
+    
     def get_user_id(self, platform: str) -> str:
         """
         Get the user's ID from a platform.
@@ -232,15 +659,47 @@ class DatingAppAI:
         if not self.is_authenticated(platform):
             return ''
         
+        identity = self._get_account_identity(platform)
+        return identity['user_id'] if identity else ''
+    
+    def _get_account_identity(self, platform: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached identity of the authenticated account on a platform.
+        
+        Args:
+            platform: Platform name
+            
+        Returns:
+            Dict or None: Cached 'profile' and 'user_id' if available, None otherwise
+        """
+        account = self._account(platform)
+        identity = account.identity
+        if identity and time.monotonic() - identity['fetched_at'] < self.identity_ttl:
+            return identity
+        
         try:
-            profile = self.get_user_profile(platform)
-            if profile:
-                return profile.get('_id', profile.get('id', ''))
-            return ''
-        except Exception:
-            return ''
+            profile = self._scraper(platform).get_user_profile()
+            logger.info(f"Retrieved user profile from {platform}")
+        except Exception as e:
+            logger.error(f"Error getting user profile from {platform}: {str(e)}")
+            # Keep serving a stale identity rather than misclassifying senders
+            return identity
+        
+        identity = {
+            'profile': profile,
+            'user_id': profile.get('_id', profile.get('id', '')),
+            'fetched_at': time.monotonic()
+        }
+        account.identity = identity
+        return identity
     
     def close(self):
         """Close connections and clean up resources."""
+        self.stop_realtime()
+        if self.owns_account_pool:
+            self.token_refresher.stop()
+            self.account_pool.close()
+        if self.prefetcher:
+            self.prefetcher.stop()
         self.storage.close()
         logger.info("Dating App AI Assistant closed")
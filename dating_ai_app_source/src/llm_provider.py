@@ -0,0 +1,466 @@
+"""
+LLM provider module for the dating app AI assistant.
+Puts OpenAI, OpenAI-compatible local servers and an offline deterministic
+stand-in behind one completion interface selected from the environment.
+"""
+
+import os
+import copy
+import json
+import time
+import random
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+logger = logging.getLogger('llm_provider')
+
+Messages = List[Dict[str, Any]]
+
+class LLMError(Exception):
+    """Raised when a provider cannot produce a completion."""
+
+class BaseLLMProvider(ABC):
+    """Base class for chat completion providers."""
+
+    name = 'base'
+
+    # Cheaper, faster model of the same service for routine tasks (None if there is none)
+    fast_model = None
+
+    def __init__(self, model: str):
+        """
+        Initialize the provider.
+
+        Args:
+            model: Model name sent with each request
+        """
+        self.model = model
+
+    @abstractmethod
+    def complete(self, messages: Messages, **params) -> str:
+        """
+        Get a chat completion.
+
+        Args:
+            messages: Chat messages
+            **params: Extra request parameters (temperature, max_tokens, timeout, ...)
+
+        Returns:
+            str: Completion text
+
+        Raises:
+            LLMError: If the request fails
+        """
+        pass
+
+    def complete_json(self, messages: Messages, **params) -> Dict[str, Any]:
+        """
+        Get a chat completion that is a JSON object.
+
+        Args:
+            messages: Chat messages asking for JSON
+            **params: Extra request parameters
+
+        Returns:
+            Dict: Decoded object
+
+        Raises:
+            LLMError: If the request fails or the completion is not a JSON object
+        """
+        return parse_json_object(self.complete(messages, **params))
+
+    def complete_n(self, messages: Messages, n: int, **params) -> List[str]:
+        """
+        Get several alternative chat completions from one request.
+
+        Providers that cannot sample several choices per request return one.
+
+        Args:
+            messages: Chat messages
+            n: Number of completions wanted
+            **params: Extra request parameters
+
+        Returns:
+            List[str]: Completion texts, at most n
+
+        Raises:
+            LLMError: If the request fails
+        """
+        return [self.complete(messages, **params)]
+
+    def stream(self, messages: Messages, **params) -> Iterator[str]:
+        """
+        Stream a chat completion.
+
+        Providers without streaming yield the whole completion at once.
+
+        Args:
+            messages: Chat messages
+            **params: Extra request parameters
+
+        Returns:
+            Iterator[str]: Pieces of the completion text as they arrive
+
+        Raises:
+            LLMError: If the request fails
+        """
+        yield self.complete(messages, **params)
+
+    def stream_n(self, messages: Messages, n: int, **params) -> Iterator[Tuple[int, str]]:
+        """
+        Stream several alternative chat completions from one request.
+
+        Providers that cannot sample several choices per request stream one.
+
+        Args:
+            messages: Chat messages
+            n: Number of completions wanted
+            **params: Extra request parameters
+
+        Returns:
+            Iterator[Tuple[int, str]]: (choice index, piece of text) as pieces arrive
+
+        Raises:
+            LLMError: If the request fails
+        """
+        for text in self.stream(messages, **params):
+            yield 0, text
+
+    def complete_batch(self, requests: List[Messages], max_concurrency: int = 4,
+                       **params) -> List[Optional[str]]:
+        """
+        Get completions for several requests concurrently.
+
+        Args:
+            requests: Chat messages of each request
+            max_concurrency: Maximum number of requests in flight
+            **params: Extra request parameters shared by every request
+
+        Returns:
+            List: Completion of each request in order, None where it failed
+        """
+        def complete_quietly(messages):
+            try:
+                return self.complete(messages, **params)
+            except LLMError as e:
+                logger.error(f"Batch completion failed: {str(e)}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix='llm-batch') as executor:
+            return list(executor.map(complete_quietly, requests))
+
+    def with_model(self, model: str) -> 'BaseLLMProvider':
+        """
+        Get a provider for another model that shares this provider's connections.
+
+        Args:
+            model: Model name
+
+        Returns:
+            BaseLLMProvider: Provider sending requests with the given model
+        """
+        provider = copy.copy(self)
+        provider.model = model
+        return provider
+
+    def close(self) -> None:
+        """Release the provider's connections."""
+
+class OpenAIProvider(BaseLLMProvider):
+    """Provider for the OpenAI chat completions API."""
+
+    name = 'openai'
+    fast_model = 'gpt-4o-mini'
+
+    def __init__(self, model: str = 'gpt-4', api_key: str = None, base_url: str = None,
+                 timeout: float = 60.0):
+        """
+        Initialize the OpenAI provider.
+
+        Args:
+            model: Model name
+            api_key: API key (defaults to OPENAI_API_KEY)
+            base_url: API base URL (defaults to the OpenAI API)
+            timeout: Request timeout in seconds
+
+        Raises:
+            LLMError: If the openai package is not installed
+        """
+        super().__init__(model)
+        if openai is None:
+            raise LLMError("openai package not installed")
+        self.client = openai.OpenAI(
+            api_key=api_key or os.environ.get('OPENAI_API_KEY'),
+            base_url=base_url,
+            timeout=timeout
+        )
+
+    def complete(self, messages: Messages, **params) -> str:
+        try:
+            response = self.client.chat.completions.create(model=self.model, messages=messages, **params)
+            return response.choices[0].message.content or ''
+        except openai.OpenAIError as e:
+            raise LLMError(str(e)) from e
+
+    def complete_json(self, messages: Messages, **params) -> Dict[str, Any]:
+        params.setdefault('response_format', {"type": "json_object"})
+        return parse_json_object(self.complete(messages, **params))
+
+    def complete_n(self, messages: Messages, n: int, **params) -> List[str]:
+        try:
+            response = self.client.chat.completions.create(model=self.model, messages=messages, n=n, **params)
+            return [choice.message.content or '' for choice in sorted(response.choices, key=lambda c: c.index)]
+        except openai.OpenAIError as e:
+            raise LLMError(str(e)) from e
+
+    def stream(self, messages: Messages, **params) -> Iterator[str]:
+        try:
+            for chunk in self.client.chat.completions.create(model=self.model, messages=messages,
+                                                             stream=True, **params):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except openai.OpenAIError as e:
+            raise LLMError(str(e)) from e
+
+    def stream_n(self, messages: Messages, n: int, **params) -> Iterator[Tuple[int, str]]:
+        try:
+            for chunk in self.client.chat.completions.create(model=self.model, messages=messages,
+                                                             n=n, stream=True, **params):
+                for choice in chunk.choices:
+                    if choice.delta.content:
+                        yield choice.index, choice.delta.content
+        except openai.OpenAIError as e:
+            raise LLMError(str(e)) from e
+
+    def close(self) -> None:
+        self.client.close()
+
+class LocalProvider(OpenAIProvider):
+    """Provider for a local server exposing the OpenAI API (llama.cpp, vLLM, Ollama, ...)."""
+
+    name = 'local'
+    fast_model = None
+
+    def __init__(self, model: str = 'local', base_url: str = 'http://localhost:8000/v1',
+                 api_key: str = None, timeout: float = 120.0):
+        """
+        Initialize the local provider.
+
+        Args:
+            model: Model name the server expects
+            base_url: Base URL of the server's OpenAI-compatible API
+            api_key: API key if the server requires one
+            timeout: Request timeout in seconds
+        """
+        # The client requires a key even when the server ignores it
+        super().__init__(model, api_key or 'not-needed', base_url, timeout)
+
+    def complete_json(self, messages: Messages, **params) -> Dict[str, Any]:
+        # Not every local server supports response_format; rely on the prompt instead
+        return parse_json_object(self.complete(messages, **params))
+
+class FakeLLMProvider(BaseLLMProvider):
+    """
+    Offline stand-in returning deterministic completions.
+
+    The same messages always produce the same text, so runs are
+    reproducible. Latency and failures are injected to load-test the
+    code around the model without a live service.
+    """
+
+    name = 'fake'
+
+    OPENERS = (
+        "That sounds like a lot of fun!",
+        "I love that.",
+        "Okay, that's really interesting.",
+        "Ha, I was just thinking about that.",
+    )
+
+    QUESTIONS = (
+        "What got you into {topic}?",
+        "What's your favorite thing about {topic}?",
+        "How long have you been into {topic}?",
+        "Any {topic} recommendations for a beginner?",
+    )
+
+    def __init__(self, model: str = 'fake', latency: float = 0.0, jitter: float = 0.0,
+                 tokens_per_second: float = 0.0, failure_rate: float = 0.0, seed: int = None,
+                 json_factory: Callable[[Messages], Dict[str, Any]] = None):
+        """
+        Initialize the fake provider.
+
+        Args:
+            model: Model name reported to callers
+            latency: Seconds before the first token
+            jitter: Maximum extra seconds added to the latency at random
+            tokens_per_second: Streaming speed after the first token (0 for no delay)
+            failure_rate: Probability that a request raises LLMError
+            seed: Seed of the latency and failure draws (random if omitted)
+            json_factory: Callback building JSON completions from the messages
+                (defaults to a profile-analysis shaped object)
+        """
+        super().__init__(model)
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.failure_rate = failure_rate
+        self.json_factory = json_factory or self._analysis_object
+        self.requests = 0
+        self._rng = random.Random(seed)
+
+    def complete(self, messages: Messages, **params) -> str:
+        return self.complete_n(messages, 1, **params)[0]
+
+    def complete_json(self, messages: Messages, **params) -> Dict[str, Any]:
+        self._wait_first_token(params.get('timeout'))
+        return self.json_factory(messages)
+
+    def complete_n(self, messages: Messages, n: int, **params) -> List[str]:
+        self._wait_first_token(params.get('timeout'))
+        texts = [self._text(messages, index) for index in range(max(1, n))]
+        if self.tokens_per_second:
+            time.sleep(max(len(text.split()) for text in texts) / self.tokens_per_second)
+        return texts
+
+    def stream(self, messages: Messages, **params) -> Iterator[str]:
+        for _, text in self.stream_n(messages, 1, **params):
+            yield text
+
+    def stream_n(self, messages: Messages, n: int, **params) -> Iterator[Tuple[int, str]]:
+        self._wait_first_token(params.get('timeout'))
+        choices = [self._text(messages, index).split(' ') for index in range(max(1, n))]
+        # Choices advance word by word in step, like interleaved API chunks
+        for i in range(max(len(words) for words in choices)):
+            if i and self.tokens_per_second:
+                time.sleep(1 / self.tokens_per_second)
+            for index, words in enumerate(choices):
+                if i < len(words):
+                    yield index, words[i] if i == 0 else ' ' + words[i]
+
+    def _wait_first_token(self, timeout: float = None) -> None:
+        """Sleep for the configured latency, or time out like a real client, and fail at the configured rate."""
+        self.requests += 1
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if timeout is not None and delay > timeout:
+            time.sleep(max(0.0, timeout))
+            raise LLMError(f"Request timed out after {timeout:.2f}s")
+        if delay:
+            time.sleep(delay)
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            raise LLMError("Injected failure")
+
+    def _text(self, messages: Messages, index: int = 0) -> str:
+        """Build the text of one choice of a request from a hash of its messages."""
+        rng = random.Random(self._digest(messages) + index)
+        topic = self._topic(messages, rng)
+        return f"{rng.choice(self.OPENERS)} {rng.choice(self.QUESTIONS).format(topic=topic)}"
+
+    def _analysis_object(self, messages: Messages) -> Dict[str, Any]:
+        """Build a profile analysis from the words of the request."""
+        rng = random.Random(self._digest(messages))
+        topics = sorted({self._topic(messages, rng) for _ in range(3)})
+        return {
+            'topics': [
+                {'name': topic, 'score': rng.randint(5, 10), 'reason': f"Mentioned {topic}"}
+                for topic in topics
+            ],
+            'hooks': [{'text': f"Ask about {topic}", 'type': 'question'} for topic in topics],
+            'tone': rng.choice(['friendly', 'humorous', 'curious'])
+        }
+
+    @staticmethod
+    def _digest(messages: Messages) -> int:
+        """Get a stable integer hash of the messages."""
+        encoded = json.dumps(messages, sort_keys=True, default=str).encode('utf-8')
+        return int(hashlib.sha256(encoded).hexdigest()[:16], 16)
+
+    @staticmethod
+    def _topic(messages: Messages, rng: random.Random) -> str:
+        """Pick a longer word from the last message as the topic."""
+        content = str(messages[-1].get('content', '')) if messages else ''
+        words = [word.strip('.,!?:;"\'()').lower() for word in content.split()]
+        words = [word for word in words if len(word) > 4 and word.isalpha()]
+        return rng.choice(words) if words else 'that'
+
+PROVIDERS = {
+    OpenAIProvider.name: OpenAIProvider,
+    LocalProvider.name: LocalProvider,
+    FakeLLMProvider.name: FakeLLMProvider,
+}
+
+def parse_json_object(text: str) -> Dict[str, Any]:
+    """
+    Decode the JSON object in a completion.
+
+    Text around the object, such as a Markdown code fence, is ignored.
+
+    Args:
+        text: Completion text
+
+    Returns:
+        Dict: Decoded object
+
+    Raises:
+        LLMError: If the text holds no JSON object
+    """
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end < start:
+        raise LLMError("Completion is not a JSON object")
+    try:
+        return json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise LLMError(f"Completion is not valid JSON: {str(e)}") from e
+
+def create_provider(name: str = None, **options) -> Optional[BaseLLMProvider]:
+    """
+    Create the configured LLM provider.
+
+    Without arguments the provider is chosen by DATING_AI_LLM_PROVIDER
+    ('openai', 'local' or 'fake', default 'openai'). DATING_AI_LLM_MODEL
+    and DATING_AI_LLM_URL set the model and the local server URL, and
+    DATING_AI_FAKE_LLM_LATENCY and DATING_AI_FAKE_LLM_FAILURE_RATE tune
+    the fake provider. Explicit options take precedence.
+
+    Args:
+        name: Provider name (optional)
+        **options: Provider constructor arguments
+
+    Returns:
+        BaseLLMProvider or None: Provider, None if OpenAI is selected without an API key
+        or the provider cannot be created
+    """
+    name = (name or os.environ.get('DATING_AI_LLM_PROVIDER') or OpenAIProvider.name).lower()
+    provider_class = PROVIDERS.get(name)
+    if provider_class is None:
+        logger.error(f"Unknown LLM provider: {name}")
+        return None
+
+    if os.environ.get('DATING_AI_LLM_MODEL'):
+        options.setdefault('model', os.environ['DATING_AI_LLM_MODEL'])
+    if name == LocalProvider.name and os.environ.get('DATING_AI_LLM_URL'):
+        options.setdefault('base_url', os.environ['DATING_AI_LLM_URL'])
+    if name == FakeLLMProvider.name:
+        options.setdefault('latency', float(os.environ.get('DATING_AI_FAKE_LLM_LATENCY', 0)))
+        options.setdefault('failure_rate', float(os.environ.get('DATING_AI_FAKE_LLM_FAILURE_RATE', 0)))
+
+    if name == OpenAIProvider.name and not (options.get('api_key') or os.environ.get('OPENAI_API_KEY')):
+        logger.warning("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
+        return None
+
+    try:
+        provider = provider_class(**options)
+    except LLMError as e:
+        logger.error(f"Could not create LLM provider {name}: {str(e)}")
+        return None
+
+    logger.info(f"Using LLM provider {name} with model {provider.model}")
+    return provider
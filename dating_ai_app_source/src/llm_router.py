@@ -0,0 +1,370 @@
+"""
+LLM routing module for the dating app AI assistant.
+Sends each generation task to its own model, hedges slow requests to a
+secondary model at the primary's p90 latency and enforces per-request deadlines.
+"""
+
+import os
+import time
+import logging
+import threading
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from src.llm_provider import BaseLLMProvider, LLMError, Messages
+
+logger = logging.getLogger('llm_router')
+
+class LLMTimeout(LLMError):
+    """Raised when no model answers before the request's deadline."""
+
+class LatencyTracker:
+    """Recent request latencies per model, used to pick hedge delays."""
+
+    def __init__(self, window: int = 200, min_samples: int = 10):
+        """
+        Initialize the latency tracker.
+
+        Args:
+            window: Number of recent latencies kept per model
+            min_samples: Samples needed before percentiles are reported
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        """
+        Record the latency of a successful request.
+
+        Args:
+            key: Model key
+            seconds: Request latency
+        """
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, key: str, percent: float) -> Optional[float]:
+        """
+        Get a latency percentile of a model.
+
+        Args:
+            key: Model key
+            percent: Percentile between 0 and 100
+
+        Returns:
+            float or None: Latency in seconds, None until min_samples are recorded
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percent / 100))
+        return samples[index]
+
+class Route:
+    """Models and deadline used for one task."""
+
+    def __init__(self, primary: BaseLLMProvider, secondary: BaseLLMProvider = None,
+                 deadline: float = None):
+        """
+        Initialize the route.
+
+        Args:
+            primary: Provider tried first
+            secondary: Provider hedged to when the primary is slow or fails (optional)
+            deadline: Seconds after which the request gives up (no deadline if omitted)
+        """
+        self.primary = primary
+        self.secondary = secondary
+        self.deadline = deadline
+
+class LLMRouter:
+    """Routes completion requests to per-task models with hedging and deadlines."""
+
+    # Generation tasks; requests for other tasks use the default route
+    TASKS = ('analysis', 'opener', 'reply', 'summary')
+
+    def __init__(self, routes: Dict[str, Route], default: Route = None, rate_limiter: Any = None,
+                 hedge_percentile: float = 90, default_hedge_delay: float = 3.0, max_workers: int = 8):
+        """
+        Initialize the router.
+
+        Args:
+            routes: Route of each task
+            default: Route of tasks without their own (defaults to the 'reply' route)
+            rate_limiter: RateLimiter or LLMScheduler a hedged request must get a token
+                from without waiting (optional)
+            hedge_percentile: Latency percentile of the primary after which a request is hedged
+            default_hedge_delay: Hedge delay in seconds until enough latencies are recorded
+            max_workers: Maximum number of requests in flight
+        """
+        self.routes = routes
+        self.default = default or routes.get('reply') or next(iter(routes.values()))
+        self.rate_limiter = rate_limiter
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay = default_hedge_delay
+        self.latency = LatencyTracker()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='llm-router')
+
+    @classmethod
+    def from_provider(cls, provider: BaseLLMProvider, fast_model: str = None, deadline: float = None,
+                      rate_limiter: Any = None) -> 'LLMRouter':
+        """
+        Create the default routes for a provider.
+
+        Analysis and summaries go to the provider's fast model, hedged to the
+        main model; openers and replies go to the main model, hedged to the
+        fast one. DATING_AI_LLM_FAST_MODEL and DATING_AI_LLM_DEADLINE
+        override the fast model and the deadline of interactive tasks.
+
+        Args:
+            provider: Provider of the main model
+            fast_model: Cheaper, faster model (defaults to the provider's fast model)
+            deadline: Seconds before interactive requests give up (defaults to 8)
+            rate_limiter: RateLimiter or LLMScheduler shared with the callers (optional)
+
+        Returns:
+            LLMRouter: Router
+        """
+        fast_model = fast_model or os.environ.get('DATING_AI_LLM_FAST_MODEL') or provider.fast_model
+        deadline = deadline or float(os.environ.get('DATING_AI_LLM_DEADLINE', 8.0))
+
+        fast = provider.with_model(fast_model) if fast_model and fast_model != provider.model else None
+        routes = {
+            'analysis': Route(fast or provider, provider if fast else None, deadline),
+            'opener': Route(provider, fast, deadline),
+            'reply': Route(provider, fast, deadline),
+            # Summaries are not awaited by a user, so they only need to finish eventually
+            'summary': Route(fast or provider),
+        }
+        return cls(routes, rate_limiter=rate_limiter)
+
+    def route(self, task: str) -> Route:
+        """Get the route of a task."""
+        return self.routes.get(task, self.default)
+
+    def model_for(self, task: str) -> str:
+        """Get the primary model of a task."""
+        return self.route(task).primary.model
+
+    def complete(self, task: str, messages: Messages, started_at: float = None, **params) -> str:
+        """
+        Get a chat completion for a task.
+
+        Args:
+            task: Task name (see TASKS)
+            messages: Chat messages
+            started_at: time.monotonic() when the request was queued, which the
+                deadline counts from (defaults to now)
+            **params: Extra request parameters
+
+        Returns:
+            str: Completion text of whichever model answered first
+
+        Raises:
+            LLMTimeout: If no model answered before the deadline
+            LLMError: If every model failed
+        """
+        return self._hedged(task, 'complete', started_at,
+                            lambda provider, timeout: provider.complete(messages,
+                                                                        **self._with_timeout(params, timeout)))
+
+    def complete_json(self, task: str, messages: Messages, started_at: float = None, **params) -> Dict[str, Any]:
+        """
+        Get a chat completion that is a JSON object for a task.
+
+        Args:
+            task: Task name (see TASKS)
+            messages: Chat messages asking for JSON
+            started_at: time.monotonic() when the request was queued (defaults to now)
+            **params: Extra request parameters
+
+        Returns:
+            Dict: Decoded object
+
+        Raises:
+            LLMTimeout: If no model answered before the deadline
+            LLMError: If every model failed
+        """
+        return self._hedged(task, 'complete', started_at,
+                            lambda provider, timeout: provider.complete_json(messages,
+                                                                             **self._with_timeout(params, timeout)))
+
+    def complete_n(self, task: str, messages: Messages, n: int, started_at: float = None, **params) -> List[str]:
+        """
+        Get several alternative chat completions for a task from one request.
+
+        Args:
+            task: Task name (see TASKS)
+            messages: Chat messages
+            n: Number of completions wanted
+            started_at: time.monotonic() when the request was queued (defaults to now)
+            **params: Extra request parameters
+
+        Returns:
+            List[str]: Completion texts of whichever model answered first, at most n
+
+        Raises:
+            LLMTimeout: If no model answered before the deadline
+            LLMError: If every model failed
+        """
+        return self._hedged(task, 'complete', started_at,
+                            lambda provider, timeout: provider.complete_n(messages, n,
+                                                                          **self._with_timeout(params, timeout)))
+
+    def stream(self, task: str, messages: Messages, started_at: float = None, **params) -> Iterator[str]:
+        """
+        Stream a chat completion for a task.
+
+        Hedging and the deadline apply to the first token; once text
+        arrives, the rest of that model's stream is passed through.
+
+        Args:
+            task: Task name (see TASKS)
+            messages: Chat messages
+            started_at: time.monotonic() when the request was queued (defaults to now)
+            **params: Extra request parameters
+
+        Returns:
+            Iterator[str]: Pieces of the completion text
+
+        Raises:
+            LLMTimeout: If no model sent a token before the deadline
+            LLMError: If every model failed
+        """
+        def open_stream(provider, timeout):
+            pieces = iter(provider.stream(messages, **self._with_timeout(params, timeout)))
+            first = next(pieces, None)
+            return pieces if first is None else itertools.chain([first], pieces)
+
+        yield from self._hedged(task, 'stream', started_at, open_stream)
+
+    def stream_n(self, task: str, messages: Messages, n: int, started_at: float = None,
+                 **params) -> Iterator[Tuple[int, str]]:
+        """
+        Stream several alternative chat completions for a task from one request.
+
+        Hedging and the deadline apply to the first token of any choice.
+
+        Args:
+            task: Task name (see TASKS)
+            messages: Chat messages
+            n: Number of completions wanted
+            started_at: time.monotonic() when the request was queued (defaults to now)
+            **params: Extra request parameters
+
+        Returns:
+            Iterator[Tuple[int, str]]: (choice index, piece of text) as pieces arrive
+
+        Raises:
+            LLMTimeout: If no model sent a token before the deadline
+            LLMError: If every model failed
+        """
+        def open_stream(provider, timeout):
+            pieces = iter(provider.stream_n(messages, n, **self._with_timeout(params, timeout)))
+            first = next(pieces, None)
+            return pieces if first is None else itertools.chain([first], pieces)
+
+        yield from self._hedged(task, 'stream', started_at, open_stream)
+
+    def close(self) -> None:
+        """Stop the request threads without waiting for abandoned requests."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _hedged(self, task: str, kind: str, started_at: Optional[float],
+                call: Callable[[BaseLLMProvider, Optional[float]], Any]) -> Any:
+        """
+        Run a request against a task's route.
+
+        The primary is asked first. If it has not answered by its p90
+        latency, the secondary is asked as well and the first answer wins;
+        if the primary fails, the secondary takes over. The deadline counts
+        from when the request was queued, and each request is sent with the
+        time left as its timeout, so requests that lose or miss the deadline
+        are abandoned and end by the deadline instead of holding a worker.
+
+        Args:
+            task: Task name
+            kind: Request kind, tracked separately because streams report time to first token
+            started_at: time.monotonic() when the request was queued (None for now)
+            call: Function sending the request to a provider with a timeout (None for no limit)
+
+        Returns:
+            Any: Result of the first successful request
+        """
+        route = self.route(task)
+        started = time.monotonic()
+        deadline_at = (started_at or started) + route.deadline if route.deadline else None
+        hedge_at = started + self._hedge_delay(route.primary, kind) if route.secondary else None
+
+        pending = {self._submit(route.primary, kind, call, deadline_at): route.primary}
+        hedged = route.secondary is None
+        error = None
+
+        while pending or not hedged:
+            if pending:
+                timeouts = [at - time.monotonic() for at in (deadline_at, None if hedged else hedge_at) if at]
+                done, _ = wait(pending, timeout=max(0.0, min(timeouts)) if timeouts else None,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    provider = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.warning(f"{task} request to {provider.model} failed: {str(e)}")
+                        error = e
+                        continue
+                    if provider is not route.primary:
+                        logger.info(f"Hedged {task} request answered by {provider.model}")
+                    return result
+
+            if deadline_at and time.monotonic() >= deadline_at:
+                logger.warning(f"{task} request missed its {route.deadline:.1f}s deadline")
+                raise LLMTimeout(f"No answer within {route.deadline:.1f}s")
+
+            if not hedged and (not pending or time.monotonic() >= hedge_at):
+                hedged = True
+                # A hedge only goes out if the rate limit has room; a takeover after
+                # a failure may wait for a token until the deadline
+                wait_for = 0 if pending else (None if deadline_at is None else max(0.0, deadline_at - time.monotonic()))
+                if self.rate_limiter is None or self.rate_limiter.acquire(timeout=wait_for):
+                    pending[self._submit(route.secondary, kind, call, deadline_at)] = route.secondary
+
+        raise error or LLMError(f"No model available for {task}")
+
+    def _submit(self, provider: BaseLLMProvider, kind: str, call: Callable[[BaseLLMProvider, Optional[float]], Any],
+                deadline_at: Optional[float] = None):
+        """Send a request on the executor, timed out at the deadline, recording its latency if it succeeds."""
+        def run():
+            started = time.monotonic()
+            timeout = None
+            if deadline_at is not None:
+                timeout = deadline_at - started
+                if timeout <= 0:
+                    raise LLMTimeout("Deadline passed before the request was sent")
+            result = call(provider, timeout)
+            self.latency.record(self._latency_key(provider, kind), time.monotonic() - started)
+            return result
+
+        return self.executor.submit(run)
+
+    @staticmethod
+    def _with_timeout(params: Dict[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        """Get request parameters whose timeout does not outlast a deadline."""
+        if timeout is None:
+            return params
+        return dict(params, timeout=min(timeout, params.get('timeout') or timeout))
+
+    def _hedge_delay(self, provider: BaseLLMProvider, kind: str) -> float:
+        """Get the seconds to wait for a provider before hedging."""
+        delay = self.latency.percentile(self._latency_key(provider, kind), self.hedge_percentile)
+        return self.default_hedge_delay if delay is None else delay
+
+    @staticmethod
+    def _latency_key(provider: BaseLLMProvider, kind: str) -> str:
+        """Get the latency tracker key of a provider's model."""
+        return f"{provider.name}:{provider.model}:{kind}"
@@ -0,0 +1,292 @@
+"""
+LLM scheduling module for the dating app AI assistant.
+Admits LLM jobs by priority class with per-class concurrency caps and
+request and token-per-minute budgets, so background work never delays
+a user waiting on a draft.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger('llm_scheduler')
+
+# Priority classes, highest first
+INTERACTIVE = 'interactive'
+SPECULATIVE = 'speculative'
+BATCH = 'batch'
+PRIORITIES = (INTERACTIVE, SPECULATIVE, BATCH)
+
+class LLMScheduler:
+    """
+    Central admission control for LLM requests.
+
+    Jobs wait in one FIFO queue per priority class. An interactive job
+    starts as soon as a slot is free and the budgets are not exhausted.
+    Speculative and batch jobs additionally wait while any higher class
+    is queued, never take the slots reserved for interactive work and
+    leave a share of the budgets untouched, so they cannot make an
+    interactive job wait.
+    """
+
+    def __init__(self, max_concurrency: int = 8, class_limits: Dict[str, int] = None,
+                 requests_per_second: float = 1.0, request_burst: int = 5,
+                 tokens_per_minute: int = 40000, interactive_reserve: int = 2,
+                 budget_reserve: float = 0.2):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum number of jobs running at once
+            class_limits: Maximum running jobs per priority class
+                (defaults to max_concurrency for interactive, 2 for the others)
+            requests_per_second: Sustained request rate
+            request_burst: Maximum requests sent back to back
+            tokens_per_minute: Sustained token budget (prompt and completion)
+            interactive_reserve: Slots background jobs may not use
+            budget_reserve: Share of each budget background jobs may not use
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.class_limits = {INTERACTIVE: self.max_concurrency, SPECULATIVE: 2, BATCH: 2}
+        self.class_limits.update(class_limits or {})
+        self.requests_per_second = requests_per_second
+        self.request_burst = max(1, request_burst)
+        self.tokens_per_minute = tokens_per_minute
+        self.interactive_reserve = min(interactive_reserve, self.max_concurrency - 1)
+        self.budget_reserve = budget_reserve
+
+        self._requests = float(self.request_burst)
+        self._tokens = float(tokens_per_minute)
+        self._updated_at = time.monotonic()
+        self._queues: Dict[str, Deque[object]] = {priority: deque() for priority in PRIORITIES}
+        self._running = {priority: 0 for priority in PRIORITIES}
+        self._completed = {priority: 0 for priority in PRIORITIES}
+        self._wait_total = {priority: 0.0 for priority in PRIORITIES}
+        self._wait_max = {priority: 0.0 for priority in PRIORITIES}
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self, priority: str = INTERACTIVE, tokens: int = 0) -> Iterator[None]:
+        """
+        Hold a slot for one LLM request while the block runs.
+
+        Args:
+            priority: Priority class (INTERACTIVE, SPECULATIVE or BATCH)
+            tokens: Estimated tokens of the request (see estimate_tokens)
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        self._admit(priority, tokens)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._running[priority] -= 1
+                self._completed[priority] += 1
+                self._condition.notify_all()
+
+    def run(self, priority: str, func: Callable[..., Any], *args, tokens: int = 0, **kwargs) -> Any:
+        """
+        Run a function that sends one LLM request once it is admitted.
+
+        Args:
+            priority: Priority class
+            func: Function to run
+            *args: Positional arguments of the function
+            tokens: Estimated tokens of the request
+            **kwargs: Keyword arguments of the function
+
+        Returns:
+            Any: Result of the function
+        """
+        with self.slot(priority, tokens):
+            return func(*args, **kwargs)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for request budget for an extra request of a running job, such as a hedge.
+
+        Matches RateLimiter.acquire so the scheduler can stand in for a limiter.
+
+        Args:
+            timeout: Maximum seconds to wait (waits indefinitely if None)
+
+        Returns:
+            bool: True if the request may be sent, False if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                self._refill()
+                if self._requests >= 1:
+                    self._requests -= 1
+                    return True
+                wait = (1 - self._requests) / self.requests_per_second
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._condition.wait(wait)
+
+    @staticmethod
+    def estimate_tokens(messages: List[Dict[str, Any]], completion_tokens: int = 300) -> int:
+        """
+        Estimate the tokens a chat request will use.
+
+        Args:
+            messages: Chat messages
+            completion_tokens: Expected completion length
+
+        Returns:
+            int: Estimated prompt and completion tokens
+        """
+        return sum(len(str(message.get('content', ''))) for message in messages) // 4 + completion_tokens
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get queue depths, running jobs, waits and remaining budgets.
+
+        Returns:
+            Dict: Metrics per priority class and budget levels
+        """
+        with self._condition:
+            self._refill()
+            classes = {}
+            for priority in PRIORITIES:
+                completed = self._completed[priority]
+                admitted = completed + self._running[priority]
+                classes[priority] = {
+                    'queued': len(self._queues[priority]),
+                    'running': self._running[priority],
+                    'limit': self.class_limits[priority],
+                    'completed': completed,
+                    'avg_wait': self._wait_total[priority] / admitted if admitted else 0.0,
+                    'max_wait': self._wait_max[priority],
+                }
+            return {
+                'classes': classes,
+                'running': sum(self._running.values()),
+                'max_concurrency': self.max_concurrency,
+                'requests_available': round(self._requests, 2),
+                'tokens_available': int(self._tokens),
+            }
+
+    def _admit(self, priority: str, tokens: int) -> None:
+        """Wait until a job may start, then take its slot and budget."""
+        ticket = object()
+        queued_at = time.monotonic()
+        with self._condition:
+            queue = self._queues[priority]
+            queue.append(ticket)
+            while True:
+                wait = self._start_delay(priority, ticket, tokens)
+                if wait == 0:
+                    break
+                self._condition.wait(wait)
+
+            queue.popleft()
+            self._running[priority] += 1
+            self._requests -= 1
+            self._tokens -= tokens
+
+            waited = time.monotonic() - queued_at
+            self._wait_total[priority] += waited
+            self._wait_max[priority] = max(self._wait_max[priority], waited)
+            # Let the next job in this class re-check now that the head moved
+            self._condition.notify_all()
+
+        if waited > 1.0:
+            logger.info(f"{priority} LLM job waited {waited:.2f}s for admission")
+
+    def _start_delay(self, priority: str, ticket: object, tokens: int) -> Optional[float]:
+        """
+        Check whether a queued job may start.
+
+        Returns:
+            float or None: 0 if it may start, seconds until the budget allows it,
+            or None to wait for another job to finish or start
+        """
+        if self._queues[priority][0] is not ticket:
+            return None
+        if self._running[priority] >= self.class_limits[priority]:
+            return None
+
+        running = sum(self._running.values())
+        self._refill()
+
+        if priority == INTERACTIVE:
+            if running >= self.max_concurrency:
+                return None
+            # Interactive jobs only wait for an empty budget and may overdraw tokens
+            return self._budget_delay(1, 1)
+
+        higher = PRIORITIES[:PRIORITIES.index(priority)]
+        if any(self._queues[other] for other in higher):
+            return None
+        if running >= self.max_concurrency - self.interactive_reserve:
+            return None
+        # Background jobs leave part of each budget to interactive work
+        return self._budget_delay(
+            1 + self.budget_reserve * self.request_burst,
+            tokens + self.budget_reserve * self.tokens_per_minute
+        )
+
+    def _budget_delay(self, requests: float, tokens: float) -> float:
+        """Get the seconds until the budgets hold the given amounts (0 if they do now)."""
+        # A job larger than the whole budget waits for a full bucket instead of forever
+        requests = min(requests, self.request_burst)
+        tokens = min(tokens, self.tokens_per_minute)
+
+        delays = [0.0]
+        if self._requests < requests:
+            delays.append((requests - self._requests) / self.requests_per_second)
+        if self.tokens_per_minute and self._tokens < tokens:
+            delays.append((tokens - self._tokens) * 60 / self.tokens_per_minute)
+        return max(delays)
+
+    def _refill(self) -> None:
+        """Add the budget accrued since the last refill."""
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._requests = min(self.request_burst, self._requests + elapsed * self.requests_per_second)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+_schedulers: Dict[str, LLMScheduler] = {}
+_scheduler_settings: Dict[str, Dict[str, Any]] = {}
+_schedulers_lock = threading.Lock()
+
+def get_llm_scheduler(name: str = 'llm', **kwargs) -> LLMScheduler:
+    """
+    Get the shared scheduler for an LLM quota, creating it if needed.
+
+    The first caller configures the scheduler. Later callers share it
+    as is, and a warning is logged when they ask for other settings.
+
+    Args:
+        name: Quota name
+        **kwargs: Arguments passed to LLMScheduler on creation
+
+    Returns:
+        LLMScheduler: Scheduler for the quota
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(name)
+        if scheduler is None:
+            scheduler = LLMScheduler(**kwargs)
+            _schedulers[name] = scheduler
+            _scheduler_settings[name] = dict(kwargs)
+            return scheduler
+
+        settings = _scheduler_settings[name]
+        ignored = {key: value for key, value in kwargs.items() if key not in settings or settings[key] != value}
+        if ignored:
+            logger.warning(f"LLM scheduler '{name}' already exists with {settings}; "
+                           f"ignoring different settings {ignored}")
+        return scheduler
@@ -5,10 +5,20 @@ Provides functionality for analyzing profiles and generating personalized messag
 
 import os
 import json
+import hashlib
 import logging
 import random
-from typing import Dict, List, Any, Optional, Tuple
-import openai
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Callable, Generator, Iterator, Optional, Tuple
+
+from src.storage import DataStorage
+from src.completion_cache import CompletionCache
+from src.context_builder import ContextBuilder
+from src.candidate_ranker import CandidateRanker
+from src.llm_provider import BaseLLMProvider, LLMError, create_provider
+from src.llm_router import LLMRouter
+from src.llm_scheduler import LLMScheduler, INTERACTIVE, BATCH, get_llm_scheduler
 
 # Configure logging
 logging.basicConfig(
@@ -18,29 +28,57 @@ logging.basicConfig(
 )
 logger = logging.getLogger('message_generator')
 
+def _deadline_start(priority: str) -> Optional[float]:
+    """
+    Get the time the deadline of an LLM request counts from.
+    
+    A user waiting on an interactive request also waits for its admission,
+    so its deadline counts from before the scheduler queue. Background
+    requests may queue for long, so theirs counts from admission (None).
+    
+    Args:
+        priority: Scheduler priority class of the request
+        
+    Returns:
+        float or None: time.monotonic() now for interactive requests, None otherwise
+    """
+    return time.monotonic() if priority == INTERACTIVE else None
+
 class ProfileAnalyzer:
     """Analyzes dating profiles to identify conversation hooks and topics."""
     
-    def __init__(self):
-        """Initialize the profile analyzer."""
-        self.openai_client = None
-        self._initialize_openai()
-        
-    def _initialize_openai(self):
-        """Initialize the OpenAI client if API key is available."""
-        api_key = os.environ.get('OPENAI_API_KEY')
-        if api_key:
-            self.openai_client = openai.OpenAI(api_key=api_key)
-            logger.info("OpenAI client initialized")
-        else:
-            logger.warning("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
+    # Bump when the analysis prompt changes so cached analyses are not reused
+    PROMPT_VERSION = 1
+    
+    # Profile fields the analysis depends on
+    ANALYZED_FIELDS = ('name', 'bio', 'interests', 'job', 'education')
+    
+    def __init__(self, storage: DataStorage = None, cache_ttl: float = 7 * 24 * 3600,
+                 scheduler: LLMScheduler = None, llm: BaseLLMProvider = None,
+                 router: LLMRouter = None):
+        """
+        Initialize the profile analyzer.
+        
+        Args:
+            storage: Data storage used to cache analyses (optional)
+            cache_ttl: Seconds a cached analysis is reused
+            scheduler: Scheduler that admits LLM requests (optional)
+            llm: LLM provider (defaults to the configured provider, see create_provider)
+            router: Router choosing the analysis model (defaults to LLMRouter.from_provider(llm))
+        """
+        self.storage = storage
+        self.cache_ttl = cache_ttl
+        self.scheduler = scheduler
+        self.llm = llm or (None if router else create_provider())
+        self.router = router or (LLMRouter.from_provider(self.llm, rate_limiter=scheduler) if self.llm else None)
     
-    def analyze_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_profile(self, profile_data: Dict[str, Any], priority: str = INTERACTIVE) -> Dict[str, Any]:
         """
         Analyze a profile to identify conversation hooks and topics.
         
         Args:
             profile_data: Normalized profile data
+            priority: Scheduler priority class of the LLM request
             
         Returns:
             Dict: Analysis results including topics, hooks, and tone
@@ -62,22 +100,31 @@ class ProfileAnalyzer:
             'match_id': profile_data.get('id', '')
         }
         
-        # Basic analysis without OpenAI
-        if not self.openai_client:
+        # Basic analysis without an LLM
+        if not self.router:
             analysis = self._basic_analysis(profile_data, analysis)
             logger.info(f"Completed basic profile analysis for {name}")
             return analysis
         
-        # Advanced analysis with OpenAI
+        # Unchanged profiles reuse their cached analysis
+        cache_key = self.cache_key(profile_data)
+        if self.storage:
+            cached = self.storage.get_profile_analysis(cache_key, self.cache_ttl)
+            if cached:
+                cached['match_id'] = analysis['match_id']
+                logger.info(f"Using cached profile analysis for {name}")
+                return cached
+        
+        # Advanced analysis with the LLM
         try:
-            # Prepare profile summary for OpenAI
+            # Prepare profile summary for the LLM
             profile_summary = f"Name: {name}\nBio: {bio}\nInterests: {', '.join(interests)}\n"
             if job:
                 profile_summary += f"Job: {job.get('title', '')} at {job.get('company', '')}\n"
             if education:
                 profile_summary += f"Education: {education}\n"
             
-            # Create prompt for OpenAI
+            # Create prompt for the LLM
             prompt = f"""
             Analyze this dating profile and identify:
             1. Potential conversation topics (with relevance score 1-10)
@@ -101,20 +148,19 @@ class ProfileAnalyzer:
             }}
             """
             
-            # Call OpenAI API
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert dating profile analyzer."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"}
-            )
-            
-            # Parse response
-            result = json.loads(response.choices[0].message.content)
+            # Call the LLM
+            messages = [
+                {"role": "system", "content": "You are an expert dating profile analyzer."},
+                {"role": "user", "content": prompt}
+            ]
+            if self.scheduler:
+                result = self.scheduler.run(priority, self.router.complete_json, 'analysis', messages,
+                                            tokens=self.scheduler.estimate_tokens(messages),
+                                            started_at=_deadline_start(priority))
+            else:
+                result = self.router.complete_json('analysis', messages)
             
-            # Update analysis with OpenAI results
+            # Update analysis with LLM results
             analysis['topics'] = result.get('topics', [])
             analysis['hooks'] = result.get('hooks', [])
             analysis['tone'] = result.get('tone', 'friendly')
@@ -123,18 +169,37 @@ class ProfileAnalyzer:
             for topic in analysis['topics']:
                 analysis['interests_score'][topic['name']] = topic['score']
             
-            logger.info(f"Completed OpenAI profile analysis for {name}")
+            logger.info(f"Completed LLM profile analysis for {name}")
+            
+            # Only model analyses are cached; fallbacks are retried next time
+            if self.storage:
+                self.storage.save_profile_analysis(cache_key, analysis['match_id'], analysis)
             
         except Exception as e:
-            logger.error(f"Error in OpenAI profile analysis: {str(e)}")
+            logger.error(f"Error in LLM profile analysis: {str(e)}")
             # Fall back to basic analysis
             analysis = self._basic_analysis(profile_data, analysis)
             
         return analysis
     
+    def cache_key(self, profile_data: Dict[str, Any]) -> str:
+        """
+        Get the analysis cache key of a profile.
+        
+        Args:
+            profile_data: Normalized profile data
+            
+        Returns:
+            str: Hash of the analyzed fields, model and prompt version
+        """
+        content = {field: profile_data.get(field) for field in self.ANALYZED_FIELDS}
+        content['model'] = self.router.model_for('analysis') if self.router else None
+        content['prompt_version'] = self.PROMPT_VERSION
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+    
     def _basic_analysis(self, profile_data: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Perform basic profile analysis without OpenAI.
+        Perform basic profile analysis without an LLM.
         
         Args:
             profile_data: Normalized profile data
@@ -200,12 +265,30 @@ class ProfileAnalyzer:
 class MessageGenerator:
     """Generates personalized messages based on profile analysis."""
     
-    def __init__(self, templates_path: str = None):
+    def __init__(self, templates_path: str = None, storage: DataStorage = None,
+                 llm_rate: float = 1.0, llm_burst: int = 5, llm_tokens_per_minute: int = 40000,
+                 context_tokens: int = 1500, summary_tokens: int = 300, candidates: int = 3,
+                 llm: BaseLLMProvider = None, router: LLMRouter = None, scheduler: LLMScheduler = None):
         """
         Initialize the message generator.
         
         Args:
             templates_path: Path to message templates file
+            storage: Data storage used to cache profile analyses, completions and
+                conversation summaries (optional)
+            llm_rate: Sustained LLM requests per second shared by analysis and generation
+            llm_burst: Maximum LLM requests sent back to back
+            llm_tokens_per_minute: LLM token budget shared by analysis and generation
+            context_tokens: Maximum tokens of conversation history sent with a response prompt
+            summary_tokens: Part of context_tokens reserved for the summary of older messages
+            candidates: Alternative messages requested per generation call; the best is
+                returned as the message and the rest as its alternatives
+            llm: LLM provider shared with the profile analyzer (defaults to the configured
+                provider, see create_provider); templates are used if none is available
+            router: Router choosing the model, hedging and deadline of each task
+                (defaults to LLMRouter.from_provider(llm))
+            scheduler: Scheduler admitting LLM requests by priority (defaults to the
+                process-wide 'llm' scheduler, see get_llm_scheduler)
         """
         self.templates_path = templates_path or os.path.join(
             os.path.dirname(os.path.abspath(__file__)), 
@@ -213,18 +296,21 @@ class MessageGenerator:
             'message_templates.json'
         )
         self.templates = self._load_templates()
-        self.profile_analyzer = ProfileAnalyzer()
-        self.openai_client = None
-        self._initialize_openai()
-    
-    def _initialize_openai(self):
-        """Initialize the OpenAI client if API key is available."""
-        api_key = os.environ.get('OPENAI_API_KEY')
-        if api_key:
-            self.openai_client = openai.OpenAI(api_key=api_key)
-            logger.info("OpenAI client initialized")
-        else:
-            logger.warning("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
+        self.llm = llm or (None if router else create_provider())
+        self.scheduler = scheduler or get_llm_scheduler(
+            'llm', requests_per_second=llm_rate, request_burst=llm_burst, tokens_per_minute=llm_tokens_per_minute
+        )
+        self.router = router or (LLMRouter.from_provider(self.llm, rate_limiter=self.scheduler) if self.llm else None)
+        self.profile_analyzer = ProfileAnalyzer(storage, scheduler=self.scheduler, llm=self.llm,
+                                                router=self.router)
+        self.completion_cache = CompletionCache(storage)
+        self.candidates = max(1, candidates)
+        self.ranker = CandidateRanker()
+        self.context_builder = ContextBuilder(
+            storage, self.router.model_for('reply') if self.router else "gpt-4",
+            token_budget=context_tokens, summary_tokens=summary_tokens,
+            summarize=self._summarize_conversation
+        )
     
     def _load_templates(self) -> Dict[str, List[str]]:
         """
@@ -278,40 +364,121 @@ class MessageGenerator:
             logger.error(f"Error loading templates: {str(e)}")
             return default_templates
     
-    def generate_initial_message(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_initial_message(self, profile_data: Dict[str, Any], use_cache: bool = True,
+                                 priority: str = INTERACTIVE) -> Dict[str, Any]:
         """
         Generate an initial message for a match.
         
         Args:
             profile_data: Normalized profile data
+            use_cache: Whether an identical earlier completion may be reused
+            priority: Scheduler priority class of the LLM requests
             
         Returns:
             Dict: Generated message data
         """
         # Analyze profile
-        analysis = self.profile_analyzer.analyze_profile(profile_data)
+        analysis = self.profile_analyzer.analyze_profile(profile_data, priority)
         
-        # Generate message using OpenAI if available
-        if self.openai_client:
+        # Generate message using the LLM if available
+        if self.router:
             try:
-                return self._generate_with_openai(profile_data, analysis)
+                return self._generate_with_llm(profile_data, analysis, use_cache, priority)
             except Exception as e:
-                logger.error(f"Error generating message with OpenAI: {str(e)}")
+                logger.error(f"Error generating message with LLM: {str(e)}")
                 # Fall back to template-based generation
         
         # Template-based generation
         return self._generate_with_templates(profile_data, analysis)
     
-    def _generate_with_openai(self, profile_data: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_initial_messages(self, profiles: List[Dict[str, Any]], max_concurrency: int = 4,
+                                  use_cache: bool = True, priority: str = BATCH) -> Iterator[Dict[str, Any]]:
+        """
+        Generate initial messages for many matches concurrently.
+        
+        Analysis and generation for each profile run on a bounded pool in a
+        background priority class, so a large batch neither exceeds the LLM
+        budget nor delays interactive requests.
+        
+        Args:
+            profiles: Normalized profile data of the matches
+            max_concurrency: Maximum number of profiles processed at once
+            use_cache: Whether identical earlier completions may be reused
+            priority: Scheduler priority class of the LLM requests (SPECULATIVE
+                when a user is watching the results arrive)
+            
+        Returns:
+            Iterator[Dict]: Generated message data in completion order; a failed
+            profile yields a dict with 'match_id' and 'error' instead
+        """
+        if not profiles:
+            return
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix='openers') as executor:
+            futures = {
+                executor.submit(self.generate_initial_message, profile, use_cache, priority): profile
+                for profile in profiles
+            }
+            try:
+                for future in as_completed(futures):
+                    profile = futures[future]
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        logger.error(f"Error generating message for {profile.get('name', '')}: {str(e)}")
+                        yield {"match_id": profile.get('id', ''), "error": str(e)}
+            finally:
+                # A caller that stops reading (e.g. a closed page) leaves nothing queued
+                for future in futures:
+                    future.cancel()
+    
+    def _generate_with_llm(self, profile_data: Dict[str, Any], analysis: Dict[str, Any],
+                           use_cache: bool = True, priority: str = INTERACTIVE) -> Dict[str, Any]:
         """
-        Generate a message using OpenAI.
+        Generate a message using the LLM.
         
         Args:
             profile_data: Normalized profile data
             analysis: Profile analysis results
+            use_cache: Whether an identical earlier completion may be reused
+            priority: Scheduler priority class of the LLM request
             
         Returns:
-            Dict: Generated message data
+            Dict: Generated message data, with the other candidates, best first,
+            in 'alternatives'
+        """
+        name = profile_data.get('name', '')
+        
+        # Call the LLM once for all candidates and put the best first
+        candidates = self._complete_candidates(self._initial_message_prompt(profile_data, analysis), use_cache,
+                                               'opener', priority)
+        ranked = self.ranker.rank(candidates, profile_data)
+        if not ranked:
+            raise LLMError("LLM returned no usable message")
+        
+        # Create message data
+        message_data = {
+            "content": ranked[0],
+            "alternatives": ranked[1:],
+            "match_id": profile_data.get('id', ''),
+            "ai_generated": True,
+            "ai_approved": False,
+            "analysis_used": analysis
+        }
+        
+        logger.info(f"Generated LLM message for {name}")
+        return message_data
+    
+    def _initial_message_prompt(self, profile_data: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for an initial message.
+        
+        Args:
+            profile_data: Normalized profile data
+            analysis: Profile analysis results
+            
+        Returns:
+            List[Dict]: Chat messages
         """
         name = profile_data.get('name', '')
         
@@ -340,7 +507,7 @@ class MessageGenerator:
         if analysis.get('tone'):
             analysis_summary += f"Suggested Tone: {analysis['tone']}\n"
         
-        # Create prompt for OpenAI
+        # Create prompt for the LLM
         prompt = f"""
         Create an engaging initial message for a dating app match based on their profile.
         
@@ -361,29 +528,152 @@ class MessageGenerator:
         Return only the message text, without any explanations or formatting.
         """
         
-        # Call OpenAI API
-        response = self.openai_client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert at writing engaging dating app messages."},
-                {"role": "user", "content": prompt}
-            ]
-        )
+        return [
+            {"role": "system", "content": "You are an expert at writing engaging dating app messages."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _complete(self, messages: List[Dict[str, Any]], use_cache: bool = True, task: str = 'reply',
+                  priority: str = INTERACTIVE, **params) -> str:
+        """
+        Get a chat completion, reusing an identical earlier request when allowed.
         
-        # Get message text
-        message_text = response.choices[0].message.content.strip()
+        A fresh completion is cached even when use_cache is False, so later
+        requests reuse the newest text.
         
-        # Create message data
-        message_data = {
-            "content": message_text,
-            "match_id": profile_data.get('id', ''),
-            "ai_generated": True,
-            "ai_approved": False,
-            "analysis_used": analysis
-        }
+        Args:
+            messages: Chat messages
+            use_cache: Whether a cached completion may be returned
+            task: Task routed to its model (see LLMRouter.TASKS)
+            priority: Scheduler priority class of the request
+            **params: Extra parameters passed to the API
+            
+        Returns:
+            str: Completion text
+            
+        Raises:
+            LLMError: If the request fails or misses its deadline
+        """
+        model = self.router.model_for(task)
+        key = self.completion_cache.make_key(model, messages, **params)
+        if use_cache:
+            cached = self.completion_cache.get(key)
+            if cached is not None:
+                logger.info("Using cached completion")
+                return cached
+        
+        started_at = _deadline_start(priority)
+        with self.scheduler.slot(priority, self.scheduler.estimate_tokens(messages)):
+            completion = self.router.complete(task, messages, started_at=started_at, **params).strip()
+        self.completion_cache.put(key, model, completion)
+        return completion
+    
+    def _complete_candidates(self, messages: List[Dict[str, Any]], use_cache: bool = True, task: str = 'reply',
+                             priority: str = INTERACTIVE, **params) -> List[str]:
+        """
+        Get the configured number of alternative completions from a single request.
         
-        logger.info(f"Generated OpenAI message for {name}")
-        return message_data
+        The candidates are cached together, in the order the model returned them.
+        
+        Args:
+            messages: Chat messages
+            use_cache: Whether cached candidates may be returned
+            task: Task routed to its model (see LLMRouter.TASKS)
+            priority: Scheduler priority class of the request
+            **params: Extra parameters passed to the API
+            
+        Returns:
+            List[str]: Completion texts
+            
+        Raises:
+            LLMError: If the request fails or misses its deadline
+        """
+        model = self.router.model_for(task)
+        key = self.completion_cache.make_key(model, messages, n=self.candidates, **params)
+        if use_cache:
+            cached = self.completion_cache.get(key)
+            if cached is not None:
+                logger.info("Using cached candidates")
+                return json.loads(cached)
+        
+        tokens = self.scheduler.estimate_tokens(messages, completion_tokens=300 * self.candidates)
+        started_at = _deadline_start(priority)
+        with self.scheduler.slot(priority, tokens):
+            completions = self.router.complete_n(task, messages, self.candidates, started_at=started_at, **params)
+        completions = [completion.strip() for completion in completions]
+        self.completion_cache.put(key, model, json.dumps(completions))
+        return completions
+    
+    def _stream_complete(self, messages: List[Dict[str, Any]], use_cache: bool = True, task: str = 'reply',
+                         rank: Callable[[List[str]], List[str]] = None,
+                         **params) -> Generator[Dict[str, Any], None, Optional[List[str]]]:
+        """
+        Stream alternative completions from a single request, yielding delta
+        events for the first one as its tokens arrive.
+        
+        The other candidates are collected while the first streams. Cached
+        candidates are ranked and the best is sent as a single delta. Streams
+        are always interactive and hold their scheduler slot until the last token.
+        
+        Args:
+            messages: Chat messages
+            use_cache: Whether cached candidates may be returned
+            task: Task routed to its model (see LLMRouter.TASKS)
+            rank: Callable ordering candidates best first and dropping unusable ones
+            **params: Extra parameters passed to the API
+            
+        Returns:
+            Generator: Delta events; its return value is the candidates, the
+            one sent first and the others ranked, or None if the request failed
+        """
+        rank = rank or (lambda candidates: [candidate for candidate in candidates if candidate])
+        model = self.router.model_for(task)
+        key = self.completion_cache.make_key(model, messages, n=self.candidates, **params)
+        if use_cache:
+            cached = self.completion_cache.get(key)
+            ranked = rank(json.loads(cached)) if cached is not None else None
+            if ranked:
+                logger.info("Using cached candidates")
+                yield {"type": "delta", "text": ranked[0]}
+                return ranked
+        
+        choices = [[] for _ in range(self.candidates)]
+        started = time.monotonic()
+        tokens = self.scheduler.estimate_tokens(messages, completion_tokens=300 * self.candidates)
+        try:
+            with self.scheduler.slot(INTERACTIVE, tokens):
+                for index, text in self.router.stream_n(task, messages, self.candidates, started_at=started,
+                                                        **params):
+                    if index >= len(choices):
+                        continue
+                    parts = choices[index]
+                    # Match the stripped text of non-streamed completions
+                    if not parts:
+                        text = text.lstrip()
+                    if text:
+                        if index == 0:
+                            if not parts:
+                                logger.info(f"First token after {time.monotonic() - started:.2f}s")
+                            yield {"type": "delta", "text": text}
+                        parts.append(text)
+        except Exception as e:
+            logger.error(f"Error streaming completion from LLM: {str(e)}")
+            if choices[0]:
+                yield {"type": "reset"}
+            return None
+        
+        completions = [''.join(parts).strip() for parts in choices]
+        logger.info(f"Completion streamed in {time.monotonic() - started:.2f}s")
+        self.completion_cache.put(key, model, json.dumps(completions))
+        
+        streamed, others = completions[0], rank(completions[1:])
+        if not streamed:
+            # Nothing was shown yet, so the best alternative takes the first place
+            if not others:
+                return None
+            yield {"type": "delta", "text": others[0]}
+            return others
+        return [streamed] + [candidate for candidate in others if candidate != streamed]
     
     def _generate_with_templates(self, profile_data: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -450,51 +740,199 @@ class MessageGenerator:
         logger.info(f"Generated template message for {name}")
         return message_data
     
-    def generate_response(self, conversation_history: List[Dict[str, Any]], profile_data: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_response(self, conversation_history: List[Dict[str, Any]], profile_data: Dict[str, Any],
+                          use_cache: bool = True, priority: str = INTERACTIVE,
+                          use_templates: bool = True, conversation_id: str = None) -> Optional[Dict[str, Any]]:
         """
         Generate a response message based on conversation history.
         
         Args:
             conversation_history: List of previous messages
             profile_data: Normalized profile data
+            use_cache: Whether an identical earlier completion may be reused
+            priority: Scheduler priority class of the LLM requests
+            use_templates: Whether to fall back to templates without a working LLM
+            conversation_id: Local conversation ID keying the history summary (optional)
             
         Returns:
-            Dict: Generated message data
+            Dict or None: Generated message data, None if the LLM failed and
+            templates are not used
         """
-        # Generate response using OpenAI if available
-        if self.openai_client and conversation_history:
+        # Generate response using the LLM if available
+        if self.router and conversation_history:
             try:
-                return self._generate_response_with_openai(conversation_history, profile_data)
+                return self._generate_response_with_llm(conversation_history, profile_data, use_cache, priority,
+                                                        conversation_id)
             except Exception as e:
-                logger.error(f"Error generating response with OpenAI: {str(e)}")
+                logger.error(f"Error generating response with LLM: {str(e)}")
                 # Fall back to template-based generation
         
+        if not use_templates:
+            return None
+        
         # Template-based response generation
         return self._generate_response_with_templates(conversation_history, profile_data)
     
-    def _generate_response_with_openai(self, conversation_history: List[Dict[str, Any]], profile_data: Dict[str, Any]) -> Dict[str, Any]:
+    def stream_initial_message(self, profile_data: Dict[str, Any],
+                               use_cache: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Generate an initial message, yielding the text as it is produced.
+        
+        Args:
+            profile_data: Normalized profile data
+            use_cache: Whether an identical earlier completion may be reused
+            
+        Returns:
+            Iterator[Dict]: Events, see _stream_message
+        """
+        analysis = self.profile_analyzer.analyze_profile(profile_data)
+        yield from self._stream_message(
+            lambda: self._initial_message_prompt(profile_data, analysis),
+            lambda: self._generate_with_templates(profile_data, analysis),
+            {"match_id": profile_data.get('id', ''), "analysis_used": analysis},
+            use_cache, 'opener',
+            lambda candidates: self.ranker.rank(candidates, profile_data)
+        )
+    
+    def stream_response(self, conversation_history: List[Dict[str, Any]], profile_data: Dict[str, Any],
+                        use_cache: bool = True, conversation_id: str = None) -> Iterator[Dict[str, Any]]:
         """
-        Generate a response using OpenAI.
+        Generate a response, yielding the text as it is produced.
         
         Args:
             conversation_history: List of previous messages
             profile_data: Normalized profile data
+            use_cache: Whether an identical earlier completion may be reused
+            conversation_id: Local conversation ID keying the history summary (optional)
             
         Returns:
-            Dict: Generated message data
+            Iterator[Dict]: Events, see _stream_message
+        """
+        yield from self._stream_message(
+            ((lambda: self._response_prompt(conversation_history, profile_data, conversation_id=conversation_id))
+             if conversation_history else None),
+            lambda: self._generate_response_with_templates(conversation_history, profile_data),
+            {"match_id": profile_data.get('id', '')},
+            use_cache, 'reply',
+            lambda candidates: self.ranker.rank(candidates, profile_data,
+                                                self._last_match_message(conversation_history))
+        )
+    
+    def _stream_message(self, build_prompt, generate_with_templates, extra: Dict[str, Any],
+                        use_cache: bool = True, task: str = 'reply', rank=None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a message from the LLM, falling back to templates.
+        
+        Yields {'type': 'delta', 'text': ...} for each piece of text, then
+        {'type': 'done', 'message': message_data}, where the message data
+        holds the other candidates in 'alternatives'. If the LLM fails after
+        text was sent, {'type': 'reset'} tells the caller to discard it
+        before the template message follows. Template mode sends the whole
+        message as a single delta.
+        
+        Args:
+            build_prompt: Callable returning the chat messages (None to use templates)
+            generate_with_templates: Callable returning template message data
+            extra: Fields added to the message data of an LLM message
+            use_cache: Whether an identical earlier completion may be reused
+            task: Task routed to its model (see LLMRouter.TASKS)
+            rank: Callable ordering candidates best first (see _stream_complete)
+            
+        Returns:
+            Iterator[Dict]: Events
+        """
+        if self.router and build_prompt:
+            candidates = yield from self._stream_complete(build_prompt(), use_cache, task, rank)
+            if candidates is not None:
+                message_data = {
+                    "content": candidates[0],
+                    "alternatives": candidates[1:],
+                    "ai_generated": True,
+                    "ai_approved": False
+                }
+                message_data.update(extra)
+                yield {"type": "done", "message": message_data}
+                return
+        
+        message_data = generate_with_templates()
+        yield {"type": "delta", "text": message_data['content']}
+        yield {"type": "done", "message": message_data}
+    
+    def _generate_response_with_llm(self, conversation_history: List[Dict[str, Any]], profile_data: Dict[str, Any],
+                                    use_cache: bool = True, priority: str = INTERACTIVE,
+                                    conversation_id: str = None) -> Dict[str, Any]:
+        """
+        Generate a response using the LLM.
+        
+        Args:
+            conversation_history: List of previous messages
+            profile_data: Normalized profile data
+            use_cache: Whether an identical earlier completion may be reused
+            priority: Scheduler priority class of the LLM requests
+            conversation_id: Local conversation ID keying the history summary (optional)
+            
+        Returns:
+            Dict: Generated message data, with the other candidates, best first,
+            in 'alternatives'
         """
         name = profile_data.get('name', '')
         
+        # Call the LLM once for all candidates and put the best first
+        prompt = self._response_prompt(conversation_history, profile_data, priority, conversation_id)
+        candidates = self._complete_candidates(prompt, use_cache, 'reply', priority)
+        ranked = self.ranker.rank(candidates, profile_data, self._last_match_message(conversation_history))
+        if not ranked:
+            raise LLMError("LLM returned no usable response")
+        
+        # Create message data
+        message_data = {
+            "content": ranked[0],
+            "alternatives": ranked[1:],
+            "match_id": profile_data.get('id', ''),
+            "ai_generated": True,
+            "ai_approved": False
+        }
+        
+        logger.info(f"Generated LLM response for {name}")
+        return message_data
+    
+    @staticmethod
+    def _last_match_message(conversation_history: List[Dict[str, Any]]) -> Optional[str]:
+        """Get the text of the newest message from the match (None if there is none)."""
+        received = [msg for msg in conversation_history if msg.get('sender_type') == 'match']
+        if not received:
+            return None
+        return max(received, key=lambda msg: (msg.get('sent_at') or '', msg.get('id') or '')).get('content')
+    
+    def _response_prompt(self, conversation_history: List[Dict[str, Any]], profile_data: Dict[str, Any],
+                         priority: str = INTERACTIVE, conversation_id: str = None) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for a response.
+        
+        Args:
+            conversation_history: List of previous messages
+            profile_data: Normalized profile data
+            priority: Scheduler priority class of any summary request
+            conversation_id: Local conversation ID keying the history summary (optional)
+            
+        Returns:
+            List[Dict]: Chat messages
+        """
+        name = profile_data.get('name', '')
+        
+        # Fit the history into the token budget, oldest first
+        context = self.context_builder.build(conversation_history, conversation_id, priority=priority)
+        
         # Format conversation history
         formatted_history = []
-        for msg in conversation_history:
+        for msg in context['messages']:
             role = "assistant" if msg.get('sender_type') == 'user' else "user"
             formatted_history.append({
                 "role": role,
                 "content": msg.get('content', '')
             })
         
-        # Create prompt for OpenAI
+        # Create prompt for the LLM
         system_prompt = f"""
         You are helping someone have a conversation on a dating app with {name}.
         
@@ -511,28 +949,54 @@ class MessageGenerator:
         Return only the message text, without any explanations or formatting.
         """
         
-        # Call OpenAI API
+        if context['summary']:
+            system_prompt += f"""
+        Summary of the earlier conversation:
+        {context['summary']}
+        """
+        
         messages = [{"role": "system", "content": system_prompt}]
         messages.extend(formatted_history)
+        return messages
+    
+    def _summarize_conversation(self, summary: str, messages: List[Dict[str, Any]],
+                                priority: str = INTERACTIVE) -> Optional[str]:
+        """
+        Extend a conversation summary with older messages.
         
-        response = self.openai_client.chat.completions.create(
-            model="gpt-4",
-            messages=messages
-        )
+        The summary runs at the priority of the response waiting on it.
         
-        # Get message text
-        message_text = response.choices[0].message.content.strip()
+        Args:
+            summary: Summary of the messages before these ('' if none)
+            messages: Messages to fold in, oldest first
+            priority: Scheduler priority class of the request
+            
+        Returns:
+            str or None: Extended summary if successful, None otherwise
+        """
+        transcript = "\n".join(
+            f"{'Me' if msg.get('sender_type') == 'user' else 'Match'}: {msg.get('content', '')}"
+            for msg in messages
+        )
+        max_words = max(50, self.context_builder.summary_tokens * 3 // 4)
         
-        # Create message data
-        message_data = {
-            "content": message_text,
-            "match_id": profile_data.get('id', ''),
-            "ai_generated": True,
-            "ai_approved": False
-        }
+        prompt = [
+            {"role": "system", "content": f"""
+            You summarize dating app conversations for someone who is continuing them.
+            
+            Update the summary with the new messages. Keep names, facts each person shared,
+            plans, open questions and the overall tone. Use at most {max_words} words.
+            
+            Return only the summary text.
+            """},
+            {"role": "user", "content": f"Summary so far:\n{summary or '(none)'}\n\nNew messages:\n{transcript}"}
+        ]
         
-        logger.info(f"Generated OpenAI response for {name}")
-        return message_data
+        try:
+            return self._complete(prompt, task='summary', priority=priority)
+        except Exception as e:
+            logger.error(f"Error summarizing conversation with LLM: {str(e)}")
+            return None
     
     def _generate_response_with_templates(self, conversation_history: List[Dict[str, Any]], profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,295 @@
+"""
+Photo cache module for the dating app AI assistant.
+Downloads match photos into a content-addressed on-disk cache with thumbnails
+and least-recently-used eviction.
+"""
+
+import io
+import os
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Any, Optional, Set, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+logger = logging.getLogger('photo_cache')
+
+class PhotoCache:
+    """Content-addressed cache of match photos and their thumbnails."""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = 500 * 1024 * 1024,
+                 thumbnail_size: Tuple[int, int] = (320, 320), max_workers: int = 4,
+                 timeout: float = 10.0):
+        """
+        Initialize the photo cache.
+
+        Args:
+            cache_dir: Directory for cached photos (defaults to ~/.dating_ai_app/photos)
+            max_bytes: Maximum total size of cached files before eviction
+            thumbnail_size: Maximum thumbnail width and height in pixels
+            max_workers: Maximum number of concurrent downloads
+            timeout: Download timeout in seconds
+        """
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser('~'), '.dating_ai_app', 'photos')
+        self.max_bytes = max_bytes
+        self.thumbnail_size = thumbnail_size
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='photo-cache')
+        self.http = requests.Session()
+        self._pending: Set[str] = set()
+        self._lock = threading.RLock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(self.cache_dir, 'index.db'), check_same_thread=False)
+        self._initialize_index()
+
+        if Image is None:
+            logger.warning("Pillow not installed. Thumbnails will be the original images.")
+
+    def _initialize_index(self) -> None:
+        """Create the cache index tables."""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS photo_urls (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL
+            )
+            ''')
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS photo_blobs (
+                digest TEXT PRIMARY KEY,
+                content_type TEXT,
+                size INTEGER,
+                last_access REAL
+            )
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_photo_urls_digest ON photo_urls (digest)")
+            self.conn.commit()
+
+    def digest_for(self, url: str) -> Optional[str]:
+        """
+        Get the content digest of a cached photo URL.
+
+        Args:
+            url: Remote photo URL
+
+        Returns:
+            str or None: Digest if the photo is cached, None otherwise
+        """
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT digest FROM photo_urls WHERE url = ?", (url,))
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def prefetch(self, urls: List[str]) -> int:
+        """
+        Queue photos for background download.
+
+        URLs that are already cached or downloading are skipped.
+
+        Args:
+            urls: Remote photo URLs
+
+        Returns:
+            int: Number of downloads queued
+        """
+        queued = 0
+        for url in urls:
+            if not url or self.digest_for(url):
+                continue
+            with self._lock:
+                if url in self._pending:
+                    continue
+                self._pending.add(url)
+            self.executor.submit(self._fetch_quietly, url)
+            queued += 1
+        return queued
+
+    def fetch(self, url: str) -> Optional[str]:
+        """
+        Download a photo into the cache.
+
+        Args:
+            url: Remote photo URL
+
+        Returns:
+            str or None: Digest of the cached photo if successful, None otherwise
+        """
+        digest = self.digest_for(url)
+        if digest:
+            return digest
+
+        try:
+            response = self.http.get(url, timeout=self.timeout)
+            if response.status_code != 200:
+                logger.warning(f"Failed to download photo {url}: {response.status_code}")
+                return None
+            data = response.content
+            content_type = response.headers.get('Content-Type', 'image/jpeg').split(';')[0]
+        except requests.RequestException as e:
+            logger.error(f"Error downloading photo {url}: {str(e)}")
+            return None
+
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+
+        # Identical images from different URLs share one file
+        if not os.path.exists(path):
+            self._write_atomic(path, data)
+            self._write_atomic(self._path(digest, thumbnail=True), self._make_thumbnail(data))
+
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+            INSERT OR IGNORE INTO photo_blobs (digest, content_type, size, last_access)
+            VALUES (?, ?, ?, ?)
+            ''', (digest, content_type, self._disk_size(digest), time.time()))
+            cursor.execute("INSERT OR REPLACE INTO photo_urls (url, digest) VALUES (?, ?)", (url, digest))
+            self.conn.commit()
+
+        logger.info(f"Cached photo {url} as {digest[:12]}")
+        self._evict()
+        return digest
+
+    def open(self, digest: str, thumbnail: bool = False) -> Optional[Tuple[str, str]]:
+        """
+        Get the file of a cached photo and mark it as recently used.
+
+        Args:
+            digest: Photo digest
+            thumbnail: Whether to return the thumbnail instead of the original
+
+        Returns:
+            Tuple or None: (file path, content type) if cached, None otherwise
+        """
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT content_type FROM photo_blobs WHERE digest = ?", (digest,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            cursor.execute("UPDATE photo_blobs SET last_access = ? WHERE digest = ?", (time.time(), digest))
+            self.conn.commit()
+
+        path = self._path(digest, thumbnail)
+        if not os.path.exists(path):
+            return None
+        return path, ('image/jpeg' if thumbnail and Image is not None else row[0])
+
+    def total_size(self) -> int:
+        """Get the total size of cached files in bytes."""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT COALESCE(SUM(size), 0) FROM photo_blobs")
+            return cursor.fetchone()[0]
+
+    def close(self) -> None:
+        """Stop downloads and close the index."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.http.close()
+        with self._lock:
+            self.conn.close()
+
+    def _fetch_quietly(self, url: str) -> None:
+        """Download a photo for prefetch, logging instead of raising."""
+        try:
+            self.fetch(url)
+        except Exception as e:
+            logger.error(f"Error caching photo {url}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard(url)
+
+    def _evict(self) -> None:
+        """Remove least recently used photos until the cache fits in max_bytes."""
+        with self._lock:
+            total = self.total_size()
+            if total <= self.max_bytes:
+                return
+
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT digest, size FROM photo_blobs ORDER BY last_access ASC")
+            evicted = 0
+            for digest, size in cursor.fetchall():
+                if total <= self.max_bytes:
+                    break
+                for path in (self._path(digest), self._path(digest, thumbnail=True)):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                self.conn.execute("DELETE FROM photo_blobs WHERE digest = ?", (digest,))
+                self.conn.execute("DELETE FROM photo_urls WHERE digest = ?", (digest,))
+                total -= size or 0
+                evicted += 1
+            self.conn.commit()
+        logger.info(f"Evicted {evicted} photos from cache")
+
+    def _make_thumbnail(self, data: bytes) -> bytes:
+        """
+        Create a JPEG thumbnail of an image.
+
+        Args:
+            data: Original image bytes
+
+        Returns:
+            bytes: Thumbnail bytes (the original if Pillow is unavailable or the image is unreadable)
+        """
+        if Image is None:
+            return data
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.thumbnail(self.thumbnail_size)
+            output = io.BytesIO()
+            image.convert('RGB').save(output, format='JPEG', quality=85)
+            return output.getvalue()
+        except Exception as e:
+            logger.warning(f"Could not create thumbnail: {str(e)}")
+            return data
+
+    def _path(self, digest: str, thumbnail: bool = False) -> str:
+        """Get the file path of a cached photo, sharded by digest prefix."""
+        name = f"{digest}_thumb" if thumbnail else digest
+        return os.path.join(self.cache_dir, digest[:2], name)
+
+    def _disk_size(self, digest: str) -> int:
+        """Get the combined size of a photo and its thumbnail on disk."""
+        size = 0
+        for path in (self._path(digest), self._path(digest, thumbnail=True)):
+            if os.path.exists(path):
+                size += os.path.getsize(path)
+        return size
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        """Write a file so readers never see a partial image."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def photo_urls(photos: Any) -> List[str]:
+        """
+        Get the URLs of a match's photos in any of their stored forms.
+
+        Args:
+            photos: List of photo dicts or URLs, or a comma-separated string
+
+        Returns:
+            List[str]: Photo URLs
+        """
+        if isinstance(photos, str):
+            return [url.strip() for url in photos.split(',') if url.strip()]
+        return [photo.get('url', '') if isinstance(photo, dict) else photo for photo in photos or []]
@@ -0,0 +1,297 @@
+"""
+Account pool module for dating platforms.
+Keys authenticators, scrapers and HTTP connection pools by (user, platform, account),
+creates them lazily, shares them across threads and evicts idle ones.
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+import requests
+from typing import Dict, List, Optional, Tuple
+
+from .auth import BaseAuthenticator
+from .scraper import BaseProfileScraper
+from .factory import PlatformFactory
+from .token_refresher import TokenRefresher
+
+logger = logging.getLogger('platform.account_pool')
+
+DEFAULT_USER = 'default'
+DEFAULT_ACCOUNT = 'default'
+
+AccountKey = Tuple[str, str, str]
+
+class AccountSession:
+    """Authenticator, scraper and HTTP pool shared by everything serving one account."""
+
+    def __init__(self, key: AccountKey, authenticator: BaseAuthenticator, factory: PlatformFactory,
+                 coalesce_ttl: float = 0.0):
+        """
+        Initialize the account session.
+
+        Args:
+            key: (user, platform, account) key
+            authenticator: Authenticator loaded from the account's credentials
+            factory: Platform factory used to create the scraper
+            coalesce_ttl: Seconds the scraper reuses successful GET responses
+        """
+        self.key = key
+        self.authenticator = authenticator
+        self.factory = factory
+        self.coalesce_ttl = coalesce_ttl
+        self.http = requests.Session()
+        self.identity = None
+        self.last_used = time.monotonic()
+        self._scraper = None
+        self._pins = 0
+        self._lock = threading.Lock()
+
+    @property
+    def platform(self) -> str:
+        """Platform name of the account."""
+        return self.key[1]
+
+    @property
+    def name(self) -> str:
+        """Account name used in logs and background worker names."""
+        return '/'.join(self.key)
+
+    def get_scraper(self) -> BaseProfileScraper:
+        """
+        Get the account's scraper, creating it on first use.
+
+        Returns:
+            BaseProfileScraper: Scraper sending through the account's HTTP pool
+        """
+        self.touch()
+        with self._lock:
+            if self._scraper is None:
+                self._scraper = self.factory.create_scraper(
+                    self.platform, self.authenticator,
+                    coalesce_ttl=self.coalesce_ttl, http_session=self.http
+                )
+            return self._scraper
+
+    def reset_scraper(self) -> None:
+        """Drop the scraper so the next use creates one for the current credentials."""
+        with self._lock:
+            scraper, self._scraper = self._scraper, None
+        if scraper:
+            scraper.close()
+        self.identity = None
+
+    def touch(self) -> None:
+        """Mark the account as recently used."""
+        self.last_used = time.monotonic()
+
+    def pin(self) -> None:
+        """Keep the account from being evicted while a long-lived worker uses it."""
+        with self._lock:
+            self._pins += 1
+
+    def unpin(self) -> None:
+        """Release a pin taken with pin()."""
+        with self._lock:
+            self._pins = max(0, self._pins - 1)
+        self.touch()
+
+    def is_idle(self, idle_timeout: float) -> bool:
+        """
+        Check if the account can be evicted.
+
+        Args:
+            idle_timeout: Seconds without use after which an unpinned account is idle
+
+        Returns:
+            bool: True if idle, False otherwise
+        """
+        with self._lock:
+            pinned = self._pins > 0
+        return not pinned and time.monotonic() - self.last_used >= idle_timeout
+
+    def close(self) -> None:
+        """Close the scraper and the HTTP pool."""
+        self.reset_scraper()
+        self.http.close()
+
+class AccountPool:
+    """Registry of account sessions shared by every thread in the process."""
+
+    def __init__(self, factory: PlatformFactory = None, idle_timeout: float = 1800,
+                 sweep_interval: float = 60, coalesce_ttl: float = 0.0,
+                 token_refresher: TokenRefresher = None, credentials_dir: str = None):
+        """
+        Initialize the account pool.
+
+        Args:
+            factory: Platform factory (defaults to PlatformFactory)
+            idle_timeout: Seconds without use after which an account is evicted
+            sweep_interval: Seconds between idle eviction sweeps
+            coalesce_ttl: Seconds scrapers reuse successful GET responses
+            token_refresher: Refresher that pooled authenticators are registered with (optional)
+            credentials_dir: Directory for the credentials of non-default accounts
+                (defaults to ~/.dating_ai_app/accounts)
+        """
+        self.factory = factory or PlatformFactory()
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self.coalesce_ttl = coalesce_ttl
+        self.token_refresher = token_refresher
+        self.credentials_dir = credentials_dir or os.path.join(
+            os.path.expanduser('~'), '.dating_ai_app', 'accounts'
+        )
+        self.sessions: Dict[AccountKey, AccountSession] = {}
+        self._lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def get(self, user: str, platform: str, account: str = DEFAULT_ACCOUNT,
+            create: bool = True) -> Optional[AccountSession]:
+        """
+        Get an account's session, creating it from its saved credentials if needed.
+
+        Args:
+            user: Application user the account belongs to
+            platform: Platform name
+            account: Account name on the platform
+            create: Whether to create the session if it is not pooled
+
+        Returns:
+            AccountSession or None: Session, None if not pooled and create is False
+        """
+        key = (user, platform.lower(), account)
+        with self._lock:
+            session = self.sessions.get(key)
+            if session is None:
+                if not create:
+                    return None
+                authenticator = self.factory.create_authenticator(
+                    key[1], self.credentials_file(*key)
+                )
+                session = AccountSession(key, authenticator, self.factory, self.coalesce_ttl)
+                self.sessions[key] = session
+                logger.info(f"Created session for account {session.name}")
+
+                if self.token_refresher:
+                    self.token_refresher.register(session.name, authenticator)
+                    self.token_refresher.start()
+                self.start()
+
+        session.touch()
+        return session
+
+    def credentials_file(self, user: str, platform: str, account: str) -> Optional[str]:
+        """
+        Get the credentials file of an account.
+
+        The default account of the default user keeps the platform's
+        original credentials file so existing logins carry over.
+
+        Args:
+            user: Application user
+            platform: Platform name
+            account: Account name
+
+        Returns:
+            str or None: Path to the credentials file, None for the platform default
+        """
+        if user == DEFAULT_USER and account == DEFAULT_ACCOUNT:
+            return None
+        safe = lambda value: re.sub(r'[^A-Za-z0-9_.-]', '_', value)
+        return os.path.join(self.credentials_dir, safe(user), f"{platform}_{safe(account)}_credentials.json")
+
+    def accounts(self, user: str = None) -> List[AccountKey]:
+        """
+        List pooled accounts.
+
+        Args:
+            user: Only list this user's accounts (optional)
+
+        Returns:
+            List[Tuple]: (user, platform, account) keys
+        """
+        with self._lock:
+            return [key for key in self.sessions if user is None or key[0] == user]
+
+    def remove(self, user: str, platform: str, account: str = DEFAULT_ACCOUNT) -> bool:
+        """
+        Close and drop an account's session.
+
+        Args:
+            user: Application user
+            platform: Platform name
+            account: Account name
+
+        Returns:
+            bool: True if the session was pooled, False otherwise
+        """
+        with self._lock:
+            session = self.sessions.pop((user, platform.lower(), account), None)
+        if not session:
+            return False
+        self._close_session(session)
+        return True
+
+    def evict_idle(self) -> int:
+        """
+        Close the sessions of accounts that have been idle for idle_timeout.
+
+        Evicted accounts are recreated from their saved credentials on next use.
+
+        Returns:
+            int: Number of sessions evicted
+        """
+        with self._lock:
+            idle = [key for key, session in self.sessions.items() if session.is_idle(self.idle_timeout)]
+            evicted = [self.sessions.pop(key) for key in idle]
+
+        for session in evicted:
+            self._close_session(session)
+            logger.info(f"Evicted idle session for account {session.name}")
+        return len(evicted)
+
+    def start(self) -> None:
+        """Start the background eviction thread if it is not already running."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='account-pool')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background eviction thread."""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def close(self) -> None:
+        """Stop eviction and close every pooled session."""
+        self.stop()
+        with self._lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            self._close_session(session)
+
+    def _close_session(self, session: AccountSession) -> None:
+        """Unregister a session from token refresh and close it."""
+        if self.token_refresher:
+            self.token_refresher.unregister(session.name)
+        try:
+            session.close()
+        except Exception as e:
+            logger.error(f"Error closing session for account {session.name}: {str(e)}")
+
+    def _run(self) -> None:
+        """Eviction loop run by the background thread."""
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.evict_idle()
+            except Exception as e:
+                logger.error(f"Error evicting idle accounts: {str(e)}")
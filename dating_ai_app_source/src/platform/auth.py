@@ -5,6 +5,7 @@ Provides abstract classes and common functionality for platform-specific authent
 
 import os
 import json
+import time
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
@@ -34,9 +35,40 @@ class BaseAuthenticator(ABC):
         """
         self.credentials_file = credentials_file or self._get_default_credentials_file()
         self.credentials = self._load_credentials()
+        self._expiry_deadline = 0.0
         self.token = self.credentials.get('token')
         self.token_expiry = self.credentials.get('token_expiry')
     
+    @property
+    def token_expiry(self) -> Optional[str]:
+        """Token expiry as an ISO format string."""
+        return self._token_expiry
+    
+    @token_expiry.setter
+    def token_expiry(self, value: Optional[str]) -> None:
+        """
+        Set the token expiry and convert it to a monotonic deadline.
+        
+        Parsing happens once here so that is_authenticated only has to
+        compare two floats on every call.
+        
+        Args:
+            value: Token expiry as an ISO format string
+        """
+        self._token_expiry = value
+        self._expiry_deadline = 0.0
+        
+        if not value:
+            return
+        
+        try:
+            expiry = datetime.fromisoformat(value)
+            remaining = (expiry - datetime.now(expiry.tzinfo)).total_seconds()
+            self._expiry_deadline = time.monotonic() + remaining
+            logger.info(f"Token valid until {expiry}")
+        except (ValueError, TypeError) as e:
+            logger.error(f"Error parsing token expiry: {str(e)}")
+    
     def _get_default_credentials_file(self) -> str:
         """Get the default credentials file path."""
         platform_name = self.__class__.__name__.lower().replace('authenticator', '')
@@ -70,26 +102,18 @@ class BaseAuthenticator(ABC):
     
     def is_authenticated(self) -> bool:
         """Check if the current token is valid and not expired."""
-        if not self.token:
-            logger.info("No authentication token found")
-            return False
-        
-        if not self.token_expiry:
-            logger.info("No token expiry information found")
-            return False
+        return bool(self.token) and time.monotonic() < self._expiry_deadline
+    
+    def seconds_until_expiry(self) -> float:
+        """
+        Get the number of seconds until the current token expires.
         
-        # Parse token expiry and check if it's still valid
-        try:
-            expiry = datetime.fromisoformat(self.token_expiry)
-            if expiry <= datetime.now():
-                logger.info(f"Token expired at {expiry}")
-                return False
-            
-            logger.info(f"Token valid until {expiry}")
-            return True
-        except (ValueError, TypeError) as e:
-            logger.error(f"Error parsing token expiry: {str(e)}")
-            return False
+        Returns:
+            float: Seconds until expiry (zero or negative if expired or missing)
+        """
+        if not self.token:
+            return 0.0
+        return self._expiry_deadline - time.monotonic()
     
     def get_auth_headers(self) -> Dict[str, str]:
         """Get authentication headers for API requests."""
@@ -3,18 +3,26 @@ Platform factory module for creating platform-specific components.
 Provides a unified interface for creating authenticators and scrapers.
 """
 
+import os
 import logging
+import requests
 from typing import Dict, Any, Optional, Union
 
 from .auth import BaseAuthenticator
 from .scraper import BaseProfileScraper
+from .retry import RetryPolicy
 from .tinder_auth import TinderAuthenticator
 from .tinder_scraper import TinderProfileScraper
 from .hinge_auth import HingeAuthenticator
 from .hinge_scraper import HingeProfileScraper
+from .mock_server import point_platforms_at
 
 logger = logging.getLogger('platform.factory')
 
+# Point all platform clients at a local mock server when configured
+if os.environ.get('DATING_AI_PLATFORM_URL'):
+    point_platforms_at(os.environ['DATING_AI_PLATFORM_URL'])
+
 class PlatformFactory:
     """Factory for creating platform-specific components."""
     
@@ -45,7 +53,8 @@ class PlatformFactory:
     
     @staticmethod
     def create_scraper(platform: str, authenticator: Optional[BaseAuthenticator] = None, 
-                      credentials_file: str = None) -> BaseProfileScraper:
+                      credentials_file: str = None, retry_policy: RetryPolicy = None,
+                      coalesce_ttl: float = 0.0, http_session: requests.Session = None) -> BaseProfileScraper:
         """
         Create a platform-specific profile scraper.
         
@@ -53,6 +62,9 @@ class PlatformFactory:
             platform: Platform name ('tinder' or 'hinge')
             authenticator: Platform-specific authenticator (optional)
             credentials_file: Path to credentials file (used if authenticator not provided)
+            retry_policy: Retry policy for platform requests (optional)
+            coalesce_ttl: Seconds to reuse successful GET responses (optional)
+            http_session: Pooled HTTP session for platform requests (optional)
             
         Returns:
             BaseProfileScraper: Platform-specific profile scraper
@@ -76,9 +88,9 @@ class PlatformFactory:
         
         # Create and return the appropriate scraper
         if platform == 'tinder':
-            return TinderProfileScraper(authenticator)
+            return TinderProfileScraper(authenticator, retry_policy, coalesce_ttl, http_session=http_session)
         elif platform == 'hinge':
-            return HingeProfileScraper(authenticator)
+            return HingeProfileScraper(authenticator, retry_policy, coalesce_ttl, http_session)
         else:
             logger.error(f"Unsupported platform: {platform}")
             raise ValueError(f"Unsupported platform: {platform}")
@@ -6,9 +6,12 @@ Implements profile scraping for the Hinge platform.
 import requests
 import logging
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 
 from .scraper import BaseProfileScraper, ScrapingError
+from .retry import RetryPolicy
+from .sendbird_session import SendBirdSession
+from .websocket import WebSocketConnection
 from .hinge_auth import HingeAuthenticator
 
 logger = logging.getLogger('platform.hinge_scraper')
@@ -16,20 +19,31 @@ logger = logging.getLogger('platform.hinge_scraper')
 class HingeProfileScraper(BaseProfileScraper):
     """Profile scraper for the Hinge platform."""
     
+    PLATFORM = "hinge"
+    SUPPORTS_MESSAGE_STREAM = True
     BASE_URL = "https://prod-api.hingeaws.net"
     SENDBIRD_URL = "https://api-{app_id}.sendbird.com/v3"
+    SENDBIRD_WS_URL = "wss://ws-{app_id}.sendbird.com"
     SENDBIRD_APP_ID = "2D7B4CDB-932F-458D-9CBF-2781B4E0C241"  # From app
     
-    def __init__(self, authenticator: HingeAuthenticator):
+    def __init__(self, authenticator: HingeAuthenticator, retry_policy: RetryPolicy = None,
+                 coalesce_ttl: float = 0.0, http_session: requests.Session = None):
         """
         Initialize the Hinge profile scraper.
         
         Args:
             authenticator: Hinge authenticator
+            retry_policy: Retry policy for platform requests (optional)
+            coalesce_ttl: Seconds to reuse successful GET responses (optional)
+            http_session: Pooled HTTP session for platform requests (optional)
         """
-        super().__init__(authenticator)
+        super().__init__(authenticator, retry_policy, coalesce_ttl, http_session)
         self.authenticator = authenticator  # Type hint for IDE
-        self.sendbird_token = self.authenticator.credentials.get('sendbird_token')
+        self.sendbird = SendBirdSession(self.authenticator, self._fetch_sendbird_token)
+    
+    def close(self) -> None:
+        """Close the SendBird session's HTTP pool."""
+        self.sendbird.close()
     
     def get_user_profile(self) -> Dict[str, Any]:
         """
@@ -42,8 +56,10 @@ class HingeProfileScraper(BaseProfileScraper):
             raise ScrapingError("Not authenticated. Cannot get user profile.")
         
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f"{self.BASE_URL}/users/me",
+                'users_me',
                 headers=self.authenticator.get_auth_headers()
             )
             
@@ -69,28 +85,31 @@ class HingeProfileScraper(BaseProfileScraper):
         Returns:
             List[Dict]: List of match profiles
         """
+        matches = list(self.iter_matches(limit))
+        logger.info(f"Successfully retrieved {len(matches)} matches")
+        return matches
+    
+    def iter_matches(self, limit: int = 10) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the user's matches one at a time as they are decoded.
+        
+        Args:
+            limit: Maximum number of matches to retrieve
+            
+        Returns:
+            Iterator[Dict]: Match profiles
+        """
         if not self.authenticator.is_authenticated():
             raise ScrapingError("Not authenticated. Cannot get matches.")
         
-        try:
-            response = requests.get(
-                f"{self.BASE_URL}/relationships",
-                params={"type": "match", "page_size": limit},
-                headers=self.authenticator.get_auth_headers()
-            )
-            
-            if response.status_code == 200:
-                matches_data = response.json()
-                matches = matches_data.get('results', [])
-                logger.info(f"Successfully retrieved {len(matches)} matches")
-                return matches
-            else:
-                logger.error(f"Failed to get matches: {response.status_code} - {response.text}")
-                raise ScrapingError(f"Failed to get matches: {response.status_code}")
-                
-        except requests.RequestException as e:
-            logger.error(f"Request error while getting matches: {str(e)}")
-            raise ScrapingError(f"Request error: {str(e)}")
+        yield from self._stream_items(
+            f"{self.BASE_URL}/relationships",
+            'relationships',
+            ['results'],
+            'matches',
+            params={"type": "match", "page_size": limit},
+            headers=self.authenticator.get_auth_headers()
+        )
     
     def get_match_profile(self, match_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -106,8 +125,10 @@ class HingeProfileScraper(BaseProfileScraper):
             raise ScrapingError("Not authenticated. Cannot get match profile.")
         
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f"{self.BASE_URL}/users/{match_id}",
+                'users',
                 headers=self.authenticator.get_auth_headers()
             )
             
@@ -139,16 +160,13 @@ class HingeProfileScraper(BaseProfileScraper):
         if not self.authenticator.is_authenticated():
             raise ScrapingError("Not authenticated. Cannot get conversations.")
         
-        # Ensure we have a SendBird token
-        if not self.sendbird_token:
-            self._get_sendbird_token()
-        
         try:
             # Get conversations from SendBird
-            response = requests.get(
-                f"{self.SENDBIRD_URL.format(app_id=self.SENDBIRD_APP_ID)}/users/me/group_channels",
-                params={"limit": limit},
-                headers=self._get_sendbird_headers()
+            response = self._sendbird_request(
+                'GET',
+                "/users/me/group_channels",
+                'group_channels',
+                params={"limit": limit}
             )
             
             if response.status_code == 200:
@@ -175,38 +193,231 @@ class HingeProfileScraper(BaseProfileScraper):
         Returns:
             List[Dict]: List of messages
         """
+        messages = list(self.iter_conversation_messages(conversation_id, limit))
+        logger.info(f"Successfully retrieved {len(messages)} messages for conversation {conversation_id}")
+        return messages
+    
+    def iter_conversation_messages(self, conversation_id: str, limit: int = 50) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a conversation's messages one at a time as they are decoded.
+        
+        Args:
+            conversation_id: ID of the conversation
+            limit: Maximum number of messages to retrieve
+            
+        Returns:
+            Iterator[Dict]: Messages
+        """
         if not self.authenticator.is_authenticated():
             raise ScrapingError("Not authenticated. Cannot get conversation messages.")
         
-        # Ensure we have a SendBird token
-        if not self.sendbird_token:
-            self._get_sendbird_token()
+        # Get messages from SendBird
+        yield from self._stream_items(
+            f"/group_channels/{conversation_id}/messages",
+            'messages',
+            ['messages'],
+            'messages',
+            send=self._sendbird_request,
+            params={"limit": limit}
+        )
+    
+    def get_updates(self, since: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """
+        Get conversations and messages changed since a sync cursor.
+        
+        SendBird channels are read newest-activity first and paging stops at
+        the first channel whose last message is not newer than the cursor.
+        Only new messages are fetched for the changed channels. The cursor is
+        only advanced once every change since the old cursor has been read,
+        so no channel or message is skipped by the next call. Hinge has no
+        change feed for relationships, so matches are left to get_matches.
+        
+        Args:
+            since: Latest SendBird message timestamp (ms) seen by a previous call
+            limit: Page size for channels and for new messages per channel
+            
+        Returns:
+            Dict: Changed 'conversations', new 'messages' keyed by channel URL,
+            and the new 'cursor'
+        """
+        if not self.authenticator.is_authenticated():
+            raise ScrapingError("Not authenticated. Cannot get updates.")
+        
+        since_ts = int(since) if since else 0
+        latest_ts = since_ts
+        changed = []
+        token = None
         
         try:
-            # Get messages from SendBird
-            response = requests.get(
-                f"{self.SENDBIRD_URL.format(app_id=self.SENDBIRD_APP_ID)}/group_channels/{conversation_id}/messages",
-                params={"limit": limit},
-                headers=self._get_sendbird_headers()
-            )
+            while True:
+                params = {"limit": limit, "order": "latest_last_message", "show_empty": "false"}
+                if token:
+                    params["token"] = token
+                response = self._sendbird_request(
+                    'GET',
+                    "/users/me/group_channels",
+                    'group_channels',
+                    params=params
+                )
+                
+                if response.status_code != 200:
+                    logger.error(f"Failed to get updated channels: {response.status_code} - {response.text}")
+                    raise ScrapingError(f"Failed to get updated channels: {response.status_code}")
+                
+                channels_data = response.json()
+                reached_cursor = False
+                for channel in channels_data.get('channels', []):
+                    last_ts = (channel.get('last_message') or {}).get('created_at', 0)
+                    if last_ts <= since_ts:
+                        reached_cursor = True
+                        break
+                    latest_ts = max(latest_ts, last_ts)
+                    changed.append(channel)
+                
+                token = channels_data.get('next')
+                if reached_cursor or not token:
+                    break
             
-            if response.status_code == 200:
-                messages_data = response.json()
-                messages = messages_data.get('messages', [])
-                logger.info(f"Successfully retrieved {len(messages)} messages for conversation {conversation_id}")
-                return messages
-            else:
-                logger.error(f"Failed to get messages: {response.status_code} - {response.text}")
-                raise ScrapingError(f"Failed to get messages: {response.status_code}")
+            messages = {}
+            for channel in changed:
+                channel_url = channel.get('channel_url', channel.get('id', ''))
+                if not since_ts:
+                    messages[channel_url] = self.get_conversation_messages(channel_url, limit)
+                    continue
                 
+                messages[channel_url] = self._get_messages_since(channel_url, since_ts, limit)
+            
+            logger.info(f"Successfully retrieved updates for {len(changed)} conversations")
+            return {
+                'matches': [],
+                'conversations': changed,
+                'messages': messages,
+                'cursor': str(latest_ts) if latest_ts else since
+            }
+            
         except requests.RequestException as e:
-            logger.error(f"Request error while getting messages: {str(e)}")
+            logger.error(f"Request error while getting updates: {str(e)}")
             raise ScrapingError(f"Request error: {str(e)}")
     
-    def _get_sendbird_token(self) -> None:
+    def _get_messages_since(self, channel_url: str, since_ts: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get all messages of a channel newer than a timestamp, paging forward.
+        
+        Later pages are anchored on the last message read rather than its
+        timestamp, so messages sharing a timestamp are never skipped.
+        
+        Args:
+            channel_url: SendBird channel URL
+            since_ts: Timestamp (ms) after which messages are returned
+            limit: Page size
+            
+        Returns:
+            List[Dict]: Messages, oldest first
+        """
+        messages = []
+        seen = set()
+        anchor = {"message_ts": since_ts}
+        while True:
+            response = self._sendbird_request(
+                'GET',
+                f"/group_channels/{channel_url}/messages",
+                'messages',
+                params=dict(anchor, prev_limit=0, next_limit=limit, include="false")
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Failed to get new messages: {response.status_code} - {response.text}")
+                raise ScrapingError(f"Failed to get new messages: {response.status_code}")
+            
+            page = response.json().get('messages', [])
+            new_messages = [message for message in page if message.get('message_id') not in seen]
+            messages.extend(new_messages)
+            seen.update(message.get('message_id') for message in new_messages)
+            if len(page) < limit or not new_messages:
+                return messages
+            anchor = {"message_id": page[-1].get('message_id')}
+    
+    def open_message_stream(self) -> WebSocketConnection:
+        """
+        Open the SendBird WebSocket channel that pushes new messages.
+        
+        Returns:
+            WebSocketConnection: Open connection
+            
+        Raises:
+            ScrapingError: If not authenticated
+        """
+        if not self.authenticator.is_authenticated():
+            raise ScrapingError("Not authenticated. Cannot open message stream.")
+        
+        url = (f"{self.SENDBIRD_WS_URL.format(app_id=self.SENDBIRD_APP_ID)}/"
+               f"?ai={self.SENDBIRD_APP_ID}&access_token={self.sendbird.get_token()}")
+        connection = WebSocketConnection.connect(url, timeout=self.retry_policy.timeout)
+        logger.info("Opened SendBird message stream")
+        return connection
+    
+    def parse_stream_event(self, frame: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a SendBird WebSocket frame.
+        
+        SendBird frames are a four letter command followed by a JSON body.
+        
+        Args:
+            frame: Text frame
+            
+        Returns:
+            Dict or None: Message or reply event, None for frames that need no handling
+        """
+        command, body = frame[:4], frame[4:]
+        if command == 'PING':
+            return {'type': 'reply', 'frame': 'PONG' + body}
+        if command != 'MESG':
+            return None
+        
+        try:
+            message = json.loads(body)
+        except ValueError:
+            logger.warning("Ignoring malformed SendBird message frame")
+            return None
+        return {'type': 'message', 'conversation_id': message.get('channel_url', ''), 'message': message}
+    
+    def _sendbird_request(self, method: str, path: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Send a SendBird request through the pooled session.
+        
+        A 401 invalidates the token used, and the request is retried once
+        with a refreshed token.
+        
+        Args:
+            method: HTTP method
+            path: Path relative to the SendBird API root
+            endpoint: Logical endpoint name used for the circuit breaker
+            **kwargs: Arguments passed to requests
+            
+        Returns:
+            requests.Response: Final response
+        """
+        url = f"{self.SENDBIRD_URL.format(app_id=self.SENDBIRD_APP_ID)}{path}"
+        token = self.sendbird.get_token()
+        response = self._request(method, url, endpoint, session=self.sendbird.http,
+                                 headers=self.sendbird.headers(token), **kwargs)
+        
+        if response.status_code == 401:
+            # Release the connection of a streamed response before retrying
+            response.close()
+            self.sendbird.invalidate(token)
+            token = self.sendbird.get_token()
+            response = self._request(method, url, endpoint, session=self.sendbird.http,
+                                     headers=self.sendbird.headers(token), **kwargs)
+        return response
+    
+    def _fetch_sendbird_token(self) -> Tuple[str, Optional[float]]:
         """
-        Get a SendBird token for messaging.
+        Get a new SendBird token for messaging.
         
+        Returns:
+            Tuple: SendBird token and its lifetime in seconds (None if not reported)
+            
         Raises:
             ScrapingError: If token retrieval fails
         """
@@ -214,24 +425,23 @@ class HingeProfileScraper(BaseProfileScraper):
             raise ScrapingError("Not authenticated. Cannot get SendBird token.")
         
         try:
-            response = requests.get(
+            response = self._send(
+                'GET',
                 f"{self.BASE_URL}/chat/token",
+                'chat_token',
                 headers=self.authenticator.get_auth_headers()
             )
             
             if response.status_code == 200:
                 token_data = response.json()
-                self.sendbird_token = token_data.get('token')
+                token = token_data.get('token')
                 
-                if not self.sendbird_token:
+                if not token:
                     logger.error("SendBird token response did not contain token")
                     raise ScrapingError("Failed to get SendBird token: No token in response")
                 
-                # Save token in authenticator credentials
-                self.authenticator.credentials['sendbird_token'] = self.sendbird_token
-                self.authenticator._save_credentials()
-                
                 logger.info("Successfully retrieved SendBird token")
+                return token, token_data.get('expires_in')
             else:
                 logger.error(f"Failed to get SendBird token: {response.status_code} - {response.text}")
                 raise ScrapingError(f"Failed to get SendBird token: {response.status_code}")
@@ -240,19 +450,6 @@ class HingeProfileScraper(BaseProfileScraper):
             logger.error(f"Request error while getting SendBird token: {str(e)}")
             raise ScrapingError(f"Request error: {str(e)}")
     
-    def _get_sendbird_headers(self) -> Dict[str, str]:
-        """
-        Get headers for SendBird API requests.
-        
-        Returns:
-            Dict[str, str]: Headers for SendBird API
-        """
-        return {
-            "Authorization": f"Bearer {self.sendbird_token}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-    
     def normalize_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Normalize Hinge profile data to a standard format.
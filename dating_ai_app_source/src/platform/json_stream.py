@@ -0,0 +1,196 @@
+"""
+Streaming JSON decoding module for platform responses.
+Yields the items of an array nested in a JSON document one at a time
+without materializing the whole document.
+"""
+
+import json
+import codecs
+import logging
+from typing import Any, Iterable, Iterator, List
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger('platform.json_stream')
+
+WHITESPACE = ' \t\n\r'
+
+def iter_response_items(response, path: List[str], chunk_size: int = 65536) -> Iterator[Any]:
+    """
+    Yield the items of an array in a streamed HTTP response.
+
+    Uses ijson when it is installed and falls back to the built-in
+    incremental decoder otherwise. The response is closed afterwards.
+
+    Args:
+        response: requests.Response opened with stream=True
+        path: Object keys leading to the array (e.g. ['data', 'matches'])
+        chunk_size: Bytes read from the network at a time
+
+    Returns:
+        Iterator: Decoded array items
+    """
+    try:
+        if ijson is not None:
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, '.'.join(path + ['item']))
+        else:
+            yield from iter_json_array(response.iter_content(chunk_size), path)
+    finally:
+        response.close()
+
+def iter_json_array(chunks: Iterable[bytes], path: List[str]) -> Iterator[Any]:
+    """
+    Yield the items of an array in a chunked JSON document.
+
+    Only the text of the item being decoded is buffered, so memory stays
+    bounded by the largest item rather than the whole document. Yields
+    nothing if the path does not lead to an array.
+
+    Args:
+        chunks: Chunks of the UTF-8 encoded document
+        path: Object keys leading to the array
+
+    Returns:
+        Iterator: Decoded array items
+
+    Raises:
+        ValueError: If the document is malformed or truncated
+    """
+    reader = _ChunkReader(chunks)
+    if not _seek_array(reader, path):
+        return
+
+    decoder = json.JSONDecoder()
+    while True:
+        char = reader.next_significant()
+        if char == ']':
+            return
+        if char == ',':
+            char = reader.next_significant()
+        if char is None:
+            raise ValueError("Truncated JSON array")
+
+        # Put the first character back and decode one item, reading more
+        # of the document while the item is incomplete
+        reader.pos -= 1
+        while True:
+            try:
+                item, end = decoder.raw_decode(reader.buffer, reader.pos)
+            except json.JSONDecodeError:
+                if not reader.fill():
+                    raise ValueError("Truncated or malformed JSON array item")
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(reader.buffer) and reader.fill():
+                continue
+            break
+        reader.pos = end
+        reader.compact()
+        yield item
+
+class _ChunkReader:
+    """Character reader over decoded chunks with a compacting buffer."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer, returning False at the end of the stream."""
+        for chunk in self.chunks:
+            text = self.decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        return False
+
+    def compact(self) -> None:
+        """Drop consumed text from the buffer."""
+        if self.pos > 65536:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+    def next_char(self):
+        """Return the next character, or None at the end of the stream."""
+        if self.pos >= len(self.buffer):
+            self.compact()
+            if not self.fill():
+                return None
+        char = self.buffer[self.pos]
+        self.pos += 1
+        return char
+
+    def next_significant(self):
+        """Return the next non-whitespace character, or None at the end of the stream."""
+        char = self.next_char()
+        while char is not None and char in WHITESPACE:
+            char = self.next_char()
+        return char
+
+    def read_string(self) -> str:
+        """Read the rest of a string literal whose opening quote was consumed."""
+        chars = ['"']
+        while True:
+            char = self.next_char()
+            if char is None:
+                raise ValueError("Truncated JSON string")
+            chars.append(char)
+            if char == '\\':
+                chars.append(self.next_char() or '')
+            elif char == '"':
+                return json.loads(''.join(chars))
+
+def _seek_array(reader: _ChunkReader, path: List[str]) -> bool:
+    """
+    Advance the reader to just after the opening bracket of the target array.
+
+    Args:
+        reader: Chunk reader positioned at the start of the document
+        path: Object keys leading to the array
+
+    Returns:
+        bool: True if the array was found, False otherwise
+    """
+    # Keys of the containers currently open; None marks an array level
+    stack = []
+    key = None
+    expecting_key = False
+
+    while True:
+        char = reader.next_significant()
+        if char is None:
+            return False
+
+        if char == '"':
+            text = reader.read_string()
+            if expecting_key:
+                key = text
+            continue
+        if char == ':':
+            expecting_key = False
+            continue
+        if char == ',':
+            expecting_key = bool(stack) and stack[-1][0] == '{'
+            continue
+
+        if char in '{[':
+            parent_key = key if stack and stack[-1][0] == '{' else None
+            keys = [entry[1] for entry in stack[1:]] + ([parent_key] if stack else [])
+            if char == '[' and keys == path and all(entry[0] == '{' for entry in stack):
+                return True
+            stack.append((char, parent_key))
+            expecting_key = char == '{'
+            key = None
+            continue
+
+        if char in '}]':
+            if not stack:
+                return False
+            stack.pop()
+            expecting_key = False
@@ -0,0 +1,660 @@
+"""
+Local mock platform server for load and latency testing.
+Mimics the Tinder, Hinge and SendBird endpoints used by the platform clients
+(including the SendBird WebSocket push channel) and serves synthetic
+profiles and conversations at configurable scale.
+"""
+
+import json
+import time
+import itertools
+import uuid
+import queue
+import random
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from .websocket import WebSocketConnection, WebSocketClosed, accept_key
+
+logger = logging.getLogger('platform.mock_server')
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Casey", "Riley", "Morgan", "Jamie",
+               "Avery", "Quinn", "Drew", "Charlie", "Robin", "Skyler", "Emerson", "Rowan"]
+INTERESTS = ["Hiking", "Travel", "Cooking", "Music", "Movies", "Books", "Yoga", "Coffee",
+             "Photography", "Running", "Art", "Board games", "Climbing", "Wine", "Dogs", "Surfing"]
+JOBS = [("Designer", "Studio Nine"), ("Engineer", "Acme"), ("Teacher", "Lincoln High"),
+        ("Nurse", "City Hospital"), ("Chef", "Bistro 21"), ("Analyst", "Northwind")]
+SCHOOLS = ["State University", "City College", "Tech Institute", "Arts Academy"]
+CITIES = ["Austin", "Denver", "Seattle", "Chicago", "Boston", "Portland"]
+LINES = ["Hey! How's your week going?", "Haha that's amazing", "Have you been there before?",
+         "What are you up to this weekend?", "I love that place too", "No way, me too!",
+         "What got you into that?", "That sounds like so much fun"]
+
+class MockPlatformConfig:
+    """Configuration for the mock platform server."""
+
+    def __init__(self, matches: int = 100, messages_per_conversation: int = 20,
+                 latency_ms: float = 0.0, latency_jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: float = 0.0, seed: int = 42):
+        """
+        Initialize the mock platform configuration.
+
+        Args:
+            matches: Number of synthetic matches per platform
+            messages_per_conversation: Number of synthetic messages per conversation
+            latency_ms: Base latency added to every response in milliseconds
+            latency_jitter_ms: Maximum random latency added on top of the base latency
+            error_rate: Fraction of requests answered with a 500 error
+            rate_limit: Requests per second allowed before answering 429 (0 to disable)
+            seed: Random seed for the synthetic data
+        """
+        self.matches = matches
+        self.messages_per_conversation = messages_per_conversation
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.seed = seed
+
+class MockPlatformState:
+    """Synthetic platform data shared by all request handlers."""
+
+    def __init__(self, config: MockPlatformConfig):
+        """
+        Generate the synthetic data set.
+
+        Args:
+            config: Mock platform configuration
+        """
+        self.config = config
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+        self.tinder_user_id = "tinder_me"
+        self.hinge_user_id = "hinge_me"
+        self.tinder_matches: List[Dict[str, Any]] = []
+        self.tinder_messages: Dict[str, List[Dict[str, Any]]] = {}
+        self.hinge_profiles: Dict[str, Dict[str, Any]] = {}
+        self.hinge_relationships: List[Dict[str, Any]] = []
+        self.sendbird_channels: List[Dict[str, Any]] = []
+        self.sendbird_messages: Dict[str, List[Dict[str, Any]]] = {}
+        self.stream_subscribers: List[queue.Queue] = []
+        self._generate()
+        # SendBird message IDs of new messages continue after the generated ones
+        self.message_ids = itertools.count(max(
+            (message["message_id"] for messages in self.sendbird_messages.values() for message in messages),
+            default=0
+        ) + 1)
+
+    def _generate(self) -> None:
+        """Generate synthetic matches and conversations for both platforms."""
+        base_time = datetime.now() - timedelta(days=30)
+
+        for i in range(self.config.matches):
+            created = base_time + timedelta(minutes=i * 7)
+
+            # Tinder match with the person embedded, as in /v2/matches
+            match_id = f"tm{i:06d}"
+            person = self._tinder_person(f"tp{i:06d}")
+            messages = [
+                {
+                    "_id": f"{match_id}_m{j:04d}",
+                    "match_id": match_id,
+                    "from": self.tinder_user_id if j % 2 else person["_id"],
+                    "to": person["_id"] if j % 2 else self.tinder_user_id,
+                    "message": self.rng.choice(LINES),
+                    "sent_date": (created + timedelta(minutes=j)).isoformat() + "Z",
+                    "created_date": (created + timedelta(minutes=j)).isoformat() + "Z"
+                }
+                for j in range(self.config.messages_per_conversation)
+            ]
+            self.tinder_messages[match_id] = messages
+            self.tinder_matches.append({
+                "_id": match_id,
+                "id": match_id,
+                "person": person,
+                "participants": [person["_id"]],
+                "created_date": created.isoformat() + "Z",
+                "last_activity_date": messages[-1]["created_date"] if messages else created.isoformat() + "Z",
+                "message_count": len(messages),
+                "messages": messages[-1:]
+            })
+
+            # Hinge profile, relationship and SendBird channel
+            subject_id = f"hp{i:06d}"
+            self.hinge_profiles[subject_id] = self._hinge_profile(subject_id)
+            self.hinge_relationships.append({
+                "id": subject_id,
+                "subject_id": subject_id,
+                "type": "match",
+                "created": created.isoformat() + "Z"
+            })
+            channel_url = f"sendbird_group_channel_{i:06d}"
+            created_ms = int(created.timestamp() * 1000)
+            channel_messages = [
+                {
+                    "message_id": created_ms + j,
+                    "type": "MESG",
+                    "channel_url": channel_url,
+                    "message": self.rng.choice(LINES),
+                    "created_at": created_ms + j * 60000,
+                    "user": {"user_id": self.hinge_user_id if j % 2 else subject_id}
+                }
+                for j in range(self.config.messages_per_conversation)
+            ]
+            self.sendbird_messages[channel_url] = channel_messages
+            self.sendbird_channels.append({
+                "channel_url": channel_url,
+                "name": self.hinge_profiles[subject_id]["first_name"],
+                "created_at": created_ms,
+                "members": [{"user_id": self.hinge_user_id}, {"user_id": subject_id}],
+                "participants": [subject_id],
+                "last_message": channel_messages[-1] if channel_messages else None,
+                "message_count": len(channel_messages)
+            })
+
+    def _tinder_person(self, person_id: str) -> Dict[str, Any]:
+        """Generate a synthetic Tinder person."""
+        rng = self.rng
+        job_title, company = rng.choice(JOBS)
+        birth_year = datetime.now().year - rng.randint(21, 45)
+        return {
+            "_id": person_id,
+            "name": rng.choice(FIRST_NAMES),
+            "bio": f"{rng.choice(INTERESTS)} enthusiast. Ask me about {rng.choice(INTERESTS).lower()}.",
+            "birth_date": f"{birth_year}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T00:00:00.000Z",
+            "gender": rng.randint(0, 1),
+            "photos": [
+                {"id": f"{person_id}_p{k}", "url": f"https://images.example.com/{person_id}/{k}.jpg"}
+                for k in range(rng.randint(1, 5))
+            ],
+            "jobs": [{"title": {"name": job_title}, "company": {"name": company}}],
+            "schools": [{"name": rng.choice(SCHOOLS)}],
+            "distance_mi": rng.randint(1, 50),
+            "user_interests": {
+                "selected_interests": [{"name": name} for name in rng.sample(INTERESTS, 3)]
+            }
+        }
+
+    def _hinge_profile(self, subject_id: str) -> Dict[str, Any]:
+        """Generate a synthetic Hinge profile."""
+        rng = self.rng
+        job_title, company = rng.choice(JOBS)
+        return {
+            "id": subject_id,
+            "first_name": rng.choice(FIRST_NAMES),
+            "age": rng.randint(21, 45),
+            "gender": rng.randint(0, 1),
+            "photos": [
+                {"id": f"{subject_id}_p{k}", "url": f"https://images.example.com/{subject_id}/{k}.jpg"}
+                for k in range(rng.randint(1, 6))
+            ],
+            "work": {"position": job_title, "company_name": company},
+            "education": [{"school_name": rng.choice(SCHOOLS)}],
+            "location": {"city": rng.choice(CITIES)},
+            "vitals": {"drinking": "Sometimes", "smoking": "No"},
+            "prompts": [
+                {"prompt_type": "My simple pleasures", "answer": rng.choice(INTERESTS)},
+                {"prompt_type": "I'm looking for", "answer": f"Someone into {rng.choice(INTERESTS).lower()}"}
+            ],
+            "last_active": datetime.now().isoformat()
+        }
+
+    def add_incoming_message(self, platform: str, index: int, text: str = None) -> Dict[str, Any]:
+        """
+        Simulate a new message from a match.
+
+        Args:
+            platform: Platform name ('tinder' or 'hinge')
+            index: Index of the match/conversation
+            text: Message text (random if omitted)
+
+        Returns:
+            Dict: The new platform message
+        """
+        text = text or self.rng.choice(LINES)
+        with self.lock:
+            if platform == 'tinder':
+                match = self.tinder_matches[index]
+                now = datetime.now().isoformat() + "Z"
+                message = {
+                    "_id": f"{match['_id']}_m{uuid.uuid4().hex[:8]}",
+                    "match_id": match["_id"],
+                    "from": match["person"]["_id"],
+                    "to": self.tinder_user_id,
+                    "message": text,
+                    "sent_date": now,
+                    "created_date": now
+                }
+                self.tinder_messages[match["_id"]].append(message)
+                match["last_activity_date"] = now
+                match["message_count"] += 1
+                match["messages"] = [message]
+            else:
+                channel = self.sendbird_channels[index]
+                # Keep timestamps increasing within the channel, as message_ts paging relies on
+                last_ms = (channel.get("last_message") or {}).get("created_at", 0)
+                now_ms = max(int(time.time() * 1000), last_ms + 1)
+                message = {
+                    "message_id": next(self.message_ids),
+                    "type": "MESG",
+                    "channel_url": channel["channel_url"],
+                    "message": text,
+                    "created_at": now_ms,
+                    "user": {"user_id": channel["participants"][0]}
+                }
+                self.sendbird_messages[channel["channel_url"]].append(message)
+                channel["last_message"] = message
+                channel["message_count"] += 1
+                for subscriber in self.stream_subscribers:
+                    subscriber.put("MESG" + json.dumps(message))
+        return message
+
+def _paginate(items: List[Any], size: int, token: Optional[str]) -> Tuple[List[Any], Optional[str]]:
+    """
+    Slice a list into a page using an offset token.
+
+    Args:
+        items: Full list of items
+        size: Page size
+        token: Offset token from the previous page
+
+    Returns:
+        Tuple: Page of items and the next token (None on the last page)
+    """
+    start = int(token) if token and token.isdigit() else 0
+    end = start + max(1, size)
+    return items[start:end], (str(end) if end < len(items) else None)
+
+class MockPlatformHandler(BaseHTTPRequestHandler):
+    """Request handler routing mock Tinder, Hinge and SendBird endpoints."""
+
+    server_version = "MockPlatform/1.0"
+
+    def log_message(self, format: str, *args) -> None:
+        """Send request logs to the module logger instead of stderr."""
+        logger.debug(format % args)
+
+    def do_GET(self) -> None:
+        self._dispatch('GET')
+
+    def do_POST(self) -> None:
+        self._dispatch('POST')
+
+    def _dispatch(self, method: str) -> None:
+        """Apply fault injection and route the request."""
+        server = self.server
+        config = server.state.config
+
+        if method == 'GET' and self.headers.get('Upgrade', '').lower() == 'websocket':
+            self._serve_message_stream()
+            return
+
+        delay = config.latency_ms + random.uniform(0, config.latency_jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        if not server.acquire_rate_limit():
+            self._send_json(429, {"error": "rate limited"}, {"Retry-After": "1"})
+            return
+
+        if config.error_rate and random.random() < config.error_rate:
+            self._send_json(500, {"error": "injected failure"})
+            return
+
+        parsed = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        parts = [part for part in parsed.path.split('/') if part]
+        body = self._read_json() if method == 'POST' else {}
+
+        try:
+            if parts and parts[0] == 'tinder':
+                result = self._route_tinder(method, parts[1:], query, body)
+            elif parts and parts[0] == 'hinge':
+                result = self._route_hinge(method, parts[1:], query, body)
+            elif parts and parts[0] == 'sendbird':
+                result = self._route_sendbird(method, parts[1:], query)
+            elif parts == ['recaptcha']:
+                result = (200, {"recaptchaSiteKey": "mock"})
+            else:
+                result = None
+        except PermissionError:
+            result = (401, {"error": "unauthorized"})
+
+        if result is None:
+            self._send_json(404, {"error": "not found"})
+        else:
+            self._send_json(*result)
+
+    def _require_auth(self, header: str) -> None:
+        """Reject requests without the platform's auth header."""
+        if not self.headers.get(header):
+            raise PermissionError(header)
+
+    def _route_tinder(self, method: str, parts: List[str], query: Dict[str, str],
+                      body: Dict[str, Any]) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Route Tinder endpoints."""
+        self._require_auth('X-Auth-Token')
+        state = self.server.state
+
+        with state.lock:
+            if method == 'GET' and parts == ['profile']:
+                return 200, {"_id": state.tinder_user_id, "name": "Mock User"}
+
+            if method == 'GET' and parts == ['v2', 'matches']:
+                page, next_token = _paginate(state.tinder_matches, int(query.get('count', 60)),
+                                             query.get('page_token'))
+                data = {"matches": page}
+                if next_token:
+                    data["next_page_token"] = next_token
+                return 200, {"meta": {"status": 200}, "data": data}
+
+            if method == 'GET' and len(parts) == 4 and parts[:2] == ['v2', 'matches'] and parts[3] == 'messages':
+                messages = state.tinder_messages.get(parts[2])
+                if messages is None:
+                    return 404, {"error": "match not found"}
+                newest_first = list(reversed(messages))
+                page, next_token = _paginate(newest_first, int(query.get('count', 100)),
+                                             query.get('page_token'))
+                data = {"messages": page}
+                if next_token:
+                    data["next_page_token"] = next_token
+                return 200, {"meta": {"status": 200}, "data": data}
+
+            if method == 'GET' and len(parts) == 2 and parts[0] == 'user':
+                for match in state.tinder_matches:
+                    if parts[1] in (match["_id"], match["person"]["_id"]):
+                        return 200, {"status": 200, "results": match["person"]}
+                return 404, {"error": "user not found"}
+
+            if method == 'POST' and parts == ['updates']:
+                since = body.get('last_activity_date') or ''
+                changed = []
+                for match in state.tinder_matches:
+                    if match["last_activity_date"] > since:
+                        new_messages = [m for m in state.tinder_messages[match["_id"]]
+                                        if m["created_date"] > since]
+                        changed.append(dict(match, messages=new_messages))
+                latest = max([m["last_activity_date"] for m in state.tinder_matches] + [since])
+                return 200, {"matches": changed, "blocks": [], "last_activity_date": latest}
+
+        return None
+
+    def _route_hinge(self, method: str, parts: List[str], query: Dict[str, str],
+                     body: Dict[str, Any]) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Route Hinge endpoints."""
+        state = self.server.state
+
+        if method == 'POST' and parts == ['identity', 'install']:
+            return 200, {"install_id": body.get('install_id')}
+        if method == 'POST' and parts == ['identity', 'request']:
+            return 200, {"status": "sent"}
+        if method == 'POST' and parts == ['identity', 'verify']:
+            return 200, {"token": f"hinge_{uuid.uuid4().hex}"}
+
+        self._require_auth('Authorization')
+
+        with state.lock:
+            if method == 'GET' and parts in (['users', 'me'], ['profile']):
+                return 200, {"id": state.hinge_user_id, "first_name": "Mock User"}
+
+            if method == 'GET' and parts == ['chat', 'token']:
+                return 200, {"token": f"sendbird_{uuid.uuid4().hex}", "expires_in": 3600}
+
+            if method == 'GET' and parts == ['relationships']:
+                page, next_token = _paginate(state.hinge_relationships, int(query.get('page_size', 50)),
+                                             query.get('page'))
+                return 200, {"results": page, "next": next_token}
+
+            if method == 'GET' and len(parts) == 2 and parts[0] == 'users':
+                profile = state.hinge_profiles.get(parts[1])
+                if profile is None:
+                    return 404, {"error": "user not found"}
+                return 200, profile
+
+        return None
+
+    def _route_sendbird(self, method: str, parts: List[str],
+                        query: Dict[str, str]) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Route SendBird endpoints."""
+        self._require_auth('Authorization')
+        state = self.server.state
+        if parts and parts[0] == 'v3':
+            parts = parts[1:]
+
+        with state.lock:
+            if method == 'GET' and parts == ['users', 'me', 'group_channels']:
+                channels = sorted(
+                    state.sendbird_channels,
+                    key=lambda c: (c.get("last_message") or {}).get("created_at", 0),
+                    reverse=True
+                )
+                page, next_token = _paginate(channels, int(query.get('limit', 10)), query.get('token'))
+                return 200, {"channels": page, "next": next_token or ""}
+
+            if method == 'GET' and len(parts) == 3 and parts[0] == 'group_channels' and parts[2] == 'messages':
+                messages = state.sendbird_messages.get(parts[1])
+                if messages is None:
+                    return 404, {"error": "channel not found"}
+
+                prev_limit = int(query.get('prev_limit', 15))
+                next_limit = int(query.get('next_limit', 15))
+                if 'message_id' in query:
+                    # Anchor on a message, as SendBird does, so equal timestamps page cleanly
+                    ids = [str(m["message_id"]) for m in messages]
+                    if query['message_id'] not in ids:
+                        return 400, {"error": "message not found"}
+                    anchor = ids.index(query['message_id'])
+                    before = messages[max(0, anchor + 1 - prev_limit):anchor + 1] if prev_limit else []
+                    return 200, {"messages": before + messages[anchor + 1:anchor + 1 + next_limit]}
+
+                if 'message_ts' in query:
+                    message_ts = int(query['message_ts'])
+                    before = [m for m in messages if m["created_at"] <= message_ts][-prev_limit:] if prev_limit else []
+                    after = [m for m in messages if m["created_at"] > message_ts][:next_limit]
+                    return 200, {"messages": before + after}
+
+                return 200, {"messages": messages[-int(query.get('limit', 50)):]}
+
+        return None
+
+    def _serve_message_stream(self) -> None:
+        """Serve the SendBird-style WebSocket channel, pushing new Hinge messages."""
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        if parsed.path.rstrip('/') != '/sendbird-ws':
+            self._send_json(404, {"error": "not found"})
+            return
+        if not query.get('access_token'):
+            self._send_json(401, {"error": "unauthorized"})
+            return
+
+        self.send_response(101)
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', accept_key(self.headers.get('Sec-WebSocket-Key', '')))
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+
+        state = self.server.state
+        events = queue.Queue()
+        connection = WebSocketConnection(self.connection, client=False)
+        with state.lock:
+            state.stream_subscribers.append(events)
+
+        try:
+            connection.send_text("LOGI" + json.dumps({"user_id": state.hinge_user_id}))
+            while not self.server.stopping.is_set():
+                try:
+                    connection.send_text(events.get(timeout=0.2))
+                except queue.Empty:
+                    pass
+                # Answer pings and notice closes from the client
+                connection.recv(timeout=0)
+        except (WebSocketClosed, OSError):
+            pass
+        finally:
+            with state.lock:
+                state.stream_subscribers.remove(events)
+            connection.closed = True
+
+    def _read_json(self) -> Dict[str, Any]:
+        """Read a JSON request body."""
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None) -> None:
+        """Write a JSON response."""
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+class MockPlatformServer(ThreadingHTTPServer):
+    """Threaded HTTP server serving the mock platforms."""
+
+    daemon_threads = True
+
+    def __init__(self, config: MockPlatformConfig = None, host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize the mock platform server.
+
+        Args:
+            config: Mock platform configuration (defaults if omitted)
+            host: Host to bind
+            port: Port to bind (0 picks a free port)
+        """
+        super().__init__((host, port), MockPlatformHandler)
+        self.state = MockPlatformState(config or MockPlatformConfig())
+        self._thread = None
+        self.stopping = threading.Event()
+        self._rate_lock = threading.Lock()
+        self._tokens = self.state.config.rate_limit
+        self._last_refill = time.monotonic()
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def acquire_rate_limit(self) -> bool:
+        """
+        Take a token from the server-wide rate limit bucket.
+
+        Returns:
+            bool: True if the request may proceed, False if it should get a 429
+        """
+        rate = self.state.config.rate_limit
+        if not rate:
+            return True
+
+        with self._rate_lock:
+            now = time.monotonic()
+            self._tokens = min(rate, self._tokens + (now - self._last_refill) * rate)
+            self._last_refill = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def start(self) -> str:
+        """
+        Serve requests on a background thread.
+
+        Returns:
+            str: Base URL of the server
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name='mock-platform-server')
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info(f"Mock platform server listening on {self.base_url}")
+        return self.base_url
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        self.stopping.set()
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+        logger.info("Mock platform server stopped")
+
+    def __enter__(self) -> 'MockPlatformServer':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+def point_platforms_at(base_url: str) -> None:
+    """
+    Point every platform client's BASE_URL/SENDBIRD_URL at a mock server.
+
+    Args:
+        base_url: Base URL of the mock server (e.g. http://127.0.0.1:8765)
+    """
+    from .tinder_auth import TinderAuthenticator
+    from .tinder_scraper import TinderProfileScraper
+    from .hinge_auth import HingeAuthenticator
+    from .hinge_scraper import HingeProfileScraper
+
+    base_url = base_url.rstrip('/')
+    TinderAuthenticator.BASE_URL = f"{base_url}/tinder"
+    TinderProfileScraper.BASE_URL = f"{base_url}/tinder"
+    HingeAuthenticator.BASE_URL = f"{base_url}/hinge"
+    HingeAuthenticator.RECAPTCHA_URL = f"{base_url}/recaptcha"
+    HingeProfileScraper.BASE_URL = f"{base_url}/hinge"
+    HingeProfileScraper.SENDBIRD_URL = f"{base_url}/sendbird/v3"
+    HingeProfileScraper.SENDBIRD_WS_URL = f"{base_url.replace('http', 'ws', 1)}/sendbird-ws"
+    logger.info(f"Platform clients pointed at {base_url}")
+
+def main():
+    """Run the mock platform server from the command line."""
+    parser = argparse.ArgumentParser(description="Mock Tinder/Hinge/SendBird server")
+    parser.add_argument('--host', default='127.0.0.1', help='Host to bind')
+    parser.add_argument('--port', type=int, default=8765, help='Port to bind')
+    parser.add_argument('--matches', type=int, default=100, help='Synthetic matches per platform')
+    parser.add_argument('--messages', type=int, default=20, help='Synthetic messages per conversation')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Base latency per response')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Maximum random extra latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests failing with 500')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='Requests per second before 429 (0 disables)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for synthetic data')
+    args = parser.parse_args()
+
+    config = MockPlatformConfig(
+        matches=args.matches,
+        messages_per_conversation=args.messages,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed
+    )
+    server = MockPlatformServer(config, args.host, args.port)
+    print(f"Mock platform server listening on {server.base_url}")
+    print(f"Set DATING_AI_PLATFORM_URL={server.base_url} to point the app at it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Profile prefetch module for dating platforms.
+Fetches full match profiles in the background with a bounded worker pool.
+"""
+
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from .retry import get_rate_limiter
+
+logger = logging.getLogger('platform.prefetch')
+
+class ProfilePrefetcher:
+    """Bounded background worker pool that fetches full match profiles."""
+
+    def __init__(self, fetch_profile: Callable[[str, str], Optional[Dict[str, Any]]],
+                 store_profile: Callable[[str, str, Dict[str, Any]], None],
+                 max_workers: int = 2, max_pending: int = 100,
+                 rate: float = 1.0, burst: int = 3):
+        """
+        Initialize the profile prefetcher.
+
+        Args:
+            fetch_profile: Callback fetch_profile(platform, profile_id) returning raw profile data
+            store_profile: Callback store_profile(platform, profile_id, profile) storing a fetched profile
+            max_workers: Number of background worker threads
+            max_pending: Maximum number of queued profiles (further requests are dropped)
+            rate: Sustained profile fetches per second per platform
+            burst: Profile fetches allowed back to back per platform
+        """
+        self.fetch_profile = fetch_profile
+        self.store_profile = store_profile
+        self.max_workers = max(1, max_workers)
+        self.rate = rate
+        self.burst = burst
+        self._queue = queue.Queue(maxsize=max(1, max_pending))
+        self._pending: Set[Tuple[str, str]] = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def enqueue(self, platform: str, profile_id: str) -> bool:
+        """
+        Queue a profile for background fetching.
+
+        Args:
+            platform: Platform name
+            profile_id: Platform ID of the profile
+
+        Returns:
+            bool: True if the profile was queued, False if already pending or the queue is full
+        """
+        if not profile_id:
+            return False
+
+        key = (platform, profile_id)
+        with self._lock:
+            if key in self._pending:
+                return False
+            try:
+                self._queue.put_nowait(key)
+            except queue.Full:
+                logger.warning(f"Prefetch queue full, dropping {platform} profile {profile_id}")
+                return False
+            self._pending.add(key)
+
+        self.start()
+        return True
+
+    def pending(self) -> int:
+        """Get the number of profiles waiting to be fetched."""
+        with self._lock:
+            return len(self._pending)
+
+    def start(self) -> None:
+        """Start the worker threads if they are not already running."""
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            if self._threads:
+                return
+
+            self._stop_event.clear()
+            for index in range(self.max_workers):
+                thread = threading.Thread(target=self._run, name=f'profile-prefetch-{index}')
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+        logger.info(f"Profile prefetcher started with {self.max_workers} workers")
+
+    def stop(self) -> None:
+        """Stop the worker threads, discarding queued profiles."""
+        self._stop_event.set()
+        with self._lock:
+            threads = self._threads
+            self._threads = []
+        for thread in threads:
+            thread.join(timeout=5)
+
+        with self._lock:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._pending.clear()
+        logger.info("Profile prefetcher stopped")
+
+    def _run(self) -> None:
+        """Fetch loop run by each worker thread."""
+        while not self._stop_event.is_set():
+            try:
+                platform, profile_id = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            try:
+                limiter = get_rate_limiter(platform, rate=self.rate, burst=self.burst)
+                while not limiter.acquire(timeout=1):
+                    if self._stop_event.is_set():
+                        return
+
+                profile = self.fetch_profile(platform, profile_id)
+                if profile:
+                    self.store_profile(platform, profile_id, profile)
+                    logger.info(f"Prefetched {platform} profile {profile_id}")
+            except Exception as e:
+                logger.error(f"Error prefetching {platform} profile {profile_id}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._pending.discard((platform, profile_id))
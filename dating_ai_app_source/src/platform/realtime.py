@@ -0,0 +1,149 @@
+"""
+Real-time ingestion module for dating platforms.
+Keeps one persistent push channel or one updates-feed poller per account
+instead of polling each conversation.
+"""
+
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict
+
+from .scraper import BaseProfileScraper
+from .websocket import WebSocketClosed
+
+logger = logging.getLogger('platform.realtime')
+
+class _IngestionWorker(ABC):
+    """Background thread shared by the ingestion strategies."""
+
+    def __init__(self, name: str):
+        """
+        Initialize the worker.
+
+        Args:
+            name: Account name used in logs and the thread name
+        """
+        self.name = name
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the background thread if it is not already running."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f'realtime-{self.name}')
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info(f"Started {self.__class__.__name__} for {self.name}")
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self._thread = None
+        logger.info(f"Stopped {self.__class__.__name__} for {self.name}")
+
+    def is_running(self) -> bool:
+        """Check if the background thread is running."""
+        return bool(self._thread and self._thread.is_alive())
+
+    @abstractmethod
+    def _run(self) -> None:
+        """Run the ingestion loop until stopped."""
+        pass
+
+class MessageStreamListener(_IngestionWorker):
+    """Persistent push channel for one account, reconnecting with backoff."""
+
+    def __init__(self, name: str, scraper: BaseProfileScraper,
+                 on_message: Callable[[str, Dict[str, Any]], None],
+                 on_connect: Callable[[], Any] = None,
+                 ping_interval: float = 30.0, max_backoff: float = 60.0):
+        """
+        Initialize the message stream listener.
+
+        Args:
+            name: Account name
+            scraper: Scraper whose platform supports a message stream
+            on_message: Callback on_message(conversation_id, raw_message) for each pushed message
+            on_connect: Callback run after each (re)connect to catch up on missed changes (optional)
+            ping_interval: Seconds of silence before a keepalive ping is sent
+            max_backoff: Maximum seconds between reconnect attempts
+        """
+        super().__init__(name)
+        self.scraper = scraper
+        self.on_message = on_message
+        self.on_connect = on_connect
+        self.ping_interval = ping_interval
+        self.max_backoff = max_backoff
+
+    def _run(self) -> None:
+        """Connect, dispatch pushed messages and reconnect until stopped."""
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            connection = None
+            try:
+                connection = self.scraper.open_message_stream()
+                backoff = 1.0
+                if self.on_connect:
+                    self.on_connect()
+
+                last_activity = time.monotonic()
+                while not self._stop_event.is_set():
+                    frame = connection.recv(timeout=1.0)
+                    if frame is None:
+                        if time.monotonic() - last_activity >= self.ping_interval:
+                            connection.ping()
+                            last_activity = time.monotonic()
+                        continue
+
+                    last_activity = time.monotonic()
+                    event = self.scraper.parse_stream_event(frame)
+                    if not event:
+                        continue
+                    if event['type'] == 'reply':
+                        connection.send_text(event['frame'])
+                    elif event['type'] == 'message':
+                        self.on_message(event['conversation_id'], event['message'])
+
+            except WebSocketClosed:
+                logger.warning(f"Message stream for {self.name} closed, reconnecting")
+            except Exception as e:
+                logger.error(f"Message stream error for {self.name}: {str(e)}")
+            finally:
+                if connection:
+                    connection.close()
+
+            if not self._stop_event.is_set():
+                self._stop_event.wait(backoff)
+                backoff = min(self.max_backoff, backoff * 2)
+
+class UpdatesPoller(_IngestionWorker):
+    """Fallback that polls an account's updates feed on a fixed interval."""
+
+    def __init__(self, name: str, poll: Callable[[], Any], interval: float = 5.0):
+        """
+        Initialize the updates poller.
+
+        Args:
+            name: Account name
+            poll: Callback that fetches and stores the account's changes
+            interval: Seconds between polls
+        """
+        super().__init__(name)
+        self.poll = poll
+        self.interval = interval
+
+    def _run(self) -> None:
+        """Poll until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Updates poll error for {self.name}: {str(e)}")
+            self._stop_event.wait(self.interval)
@@ -0,0 +1,251 @@
+"""
+Retry, rate limiting and circuit breaker module for platform requests.
+Provides jittered exponential backoff, per-platform rate limiters and
+per-endpoint circuit breakers.
+"""
+
+import random
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger('platform.retry')
+
+# HTTP methods that can be safely retried without side effects
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+class RetryPolicy:
+    """Configurable retry policy with jittered exponential backoff."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 timeout: float = 10.0, retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504),
+                 retry_non_idempotent: bool = False):
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts: Maximum number of attempts per request (including the first)
+            base_delay: Base backoff delay in seconds
+            max_delay: Upper bound for a single backoff delay in seconds
+            timeout: Per-attempt request timeout in seconds
+            retry_statuses: HTTP status codes considered transient
+            retry_non_idempotent: Whether non-idempotent requests may be retried
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def can_retry(self, method: str, idempotent: Optional[bool] = None) -> bool:
+        """
+        Check if a request may be retried.
+
+        Args:
+            method: HTTP method
+            idempotent: Explicit idempotency override for the request
+
+        Returns:
+            bool: True if the request may be retried, False otherwise
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        return idempotent or self.retry_non_idempotent
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Get the delay before the next attempt using full jitter.
+
+        Args:
+            attempt: Number of the attempt that just failed (starting at 1)
+            retry_after: Server-provided Retry-After delay in seconds (optional)
+
+        Returns:
+            float: Delay in seconds
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+class CircuitBreaker:
+    """Circuit breaker for a single platform endpoint."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name: Endpoint name (e.g. 'tinder:matches')
+            failure_threshold: Consecutive failures before the circuit opens
+            reset_timeout: Seconds the circuit stays open before probing
+            half_open_max_calls: Concurrent probe requests allowed while half-open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self.half_open_calls = 0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """
+        Check if a request may be sent through the breaker.
+
+        Returns:
+            bool: True if the request is allowed, False if it should fail fast
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self.half_open_calls = 0
+                logger.info(f"Circuit {self.name} half-open, probing")
+
+            if self.half_open_calls < self.half_open_max_calls:
+                self.half_open_calls += 1
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        """Get the number of seconds until the breaker will allow a probe."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self.state = self.CLOSED
+            self.failure_count = 0
+            self.half_open_calls = 0
+
+    def release(self) -> None:
+        """
+        Return the probe slot of a request that ended without a success or failure.
+
+        Call this when a request allowed through the breaker is neither
+        recorded as a success nor as a failure, such as a rate-limited
+        response or an unexpected error, so a half-open breaker can probe again.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN and self.half_open_calls > 0:
+                self.half_open_calls -= 1
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        with self._lock:
+            self.failure_count += 1
+            if self.state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit {self.name} opened after {self.failure_count} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.half_open_calls = 0
+
+class RateLimiter:
+    """Token bucket rate limiter shared by the callers of a platform."""
+
+    def __init__(self, rate: float = 2.0, burst: int = 5):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Sustained requests per second
+            burst: Maximum requests allowed back to back
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for permission to send a request.
+
+        Args:
+            timeout: Maximum seconds to wait (waits indefinitely if None)
+
+        Returns:
+            bool: True if a request may be sent, False if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+# Breakers are shared by all scrapers in the process so that every caller
+# sees the same view of a platform endpoint's health
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """
+    Get the shared circuit breaker for an endpoint, creating it if needed.
+
+    Args:
+        name: Endpoint name (e.g. 'tinder:matches')
+        **kwargs: Arguments passed to CircuitBreaker on creation
+
+    Returns:
+        CircuitBreaker: Circuit breaker for the endpoint
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **kwargs)
+            _breakers[name] = breaker
+        return breaker
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(name: str, **kwargs) -> RateLimiter:
+    """
+    Get the shared rate limiter for a platform, creating it if needed.
+
+    Args:
+        name: Platform name
+        **kwargs: Arguments passed to RateLimiter on creation
+
+    Returns:
+        RateLimiter: Rate limiter for the platform
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = RateLimiter(**kwargs)
+            _limiters[name] = limiter
+        return limiter
@@ -3,11 +3,17 @@ Base profile scraper module for dating platforms.
 Provides abstract classes and common functionality for platform-specific profile scraping.
 """
 
+import time
 import logging
+import requests
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional
 
 from .auth import BaseAuthenticator
+from .retry import RetryPolicy, get_circuit_breaker
+from .single_flight import SingleFlight
+from .websocket import WebSocketConnection
+from .json_stream import iter_response_items
 
 # Configure logging
 logger = logging.getLogger('platform.scraper')
@@ -16,20 +22,250 @@ class ScrapingError(Exception):
     """Exception raised for scraping errors."""
     pass
 
+class CircuitOpenError(ScrapingError):
+    """Exception raised when a request is rejected by an open circuit breaker."""
+    
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"Circuit open for {endpoint}. Retry in {retry_after:.1f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+# Shared by all scrapers in the process so that duplicate calls from
+# different threads and scraper instances are coalesced
+_flights = SingleFlight()
+
 class BaseProfileScraper(ABC):
     """Abstract base class for platform profile scrapers."""
     
-    def __init__(self, authenticator: BaseAuthenticator):
+    # Platform name used to key per-endpoint circuit breakers
+    PLATFORM = 'base'
+    
+    # Whether the platform pushes new messages over a persistent channel
+    SUPPORTS_MESSAGE_STREAM = False
+    
+    def __init__(self, authenticator: BaseAuthenticator, retry_policy: RetryPolicy = None,
+                 coalesce_ttl: float = 0.0, http_session: requests.Session = None):
         """
         Initialize the profile scraper.
         
         Args:
             authenticator: Platform-specific authenticator
+            retry_policy: Retry policy for platform requests (optional)
+            coalesce_ttl: Seconds to reuse successful GET responses (0 only shares in-flight calls)
+            http_session: Pooled HTTP session for platform requests (optional)
         """
         self.authenticator = authenticator
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.coalesce_ttl = coalesce_ttl
+        self.http = http_session
         if not self.authenticator.is_authenticated():
             logger.warning("Authenticator is not authenticated. Scraping may fail.")
     
+    def _request(self, method: str, url: str, endpoint: str, idempotent: bool = None,
+                 session: requests.Session = None, **kwargs) -> requests.Response:
+        """
+        Send a platform request through the retry policy and circuit breaker.
+        
+        Concurrent identical GET requests share a single call and its
+        response, which is also reused for coalesce_ttl seconds when
+        successful. Streamed responses can only be read once, so they are
+        not shared here; _stream_items shares their decoded items instead.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            endpoint: Logical endpoint name used for the circuit breaker
+            idempotent: Explicit idempotency override (defaults to the method's semantics)
+            session: Pooled HTTP session to send through (defaults to the scraper's)
+            **kwargs: Arguments passed to requests
+            
+        Returns:
+            requests.Response: Final response
+            
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open
+            requests.RequestException: If the last attempt failed at the transport level
+        """
+        if method.upper() != 'GET' or kwargs.get('stream'):
+            return self._send(method, url, endpoint, idempotent, session, **kwargs)
+        
+        key = (
+            url,
+            repr(sorted((kwargs.get('params') or {}).items())),
+            repr(sorted((kwargs.get('headers') or {}).items()))
+        )
+        return _flights.do(
+            key,
+            lambda: self._send(method, url, endpoint, idempotent, session, **kwargs),
+            ttl=self.coalesce_ttl,
+            cacheable=lambda response: response.status_code == 200
+        )
+    
+    def _send(self, method: str, url: str, endpoint: str, idempotent: bool = None,
+              session: requests.Session = None, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying transient failures.
+        
+        Transient failures (connection errors, timeouts and retryable status
+        codes) are retried with jittered backoff when the request is
+        idempotent. Any other response is returned for the caller to handle.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            endpoint: Logical endpoint name used for the circuit breaker
+            idempotent: Explicit idempotency override (defaults to the method's semantics)
+            session: Pooled HTTP session to send through (defaults to the scraper's)
+            **kwargs: Arguments passed to requests
+            
+        Returns:
+            requests.Response: Final response
+            
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open
+            requests.RequestException: If the last attempt failed at the transport level
+        """
+        policy = self.retry_policy
+        breaker = get_circuit_breaker(f"{self.PLATFORM}:{endpoint}")
+        attempts = policy.max_attempts if policy.can_retry(method, idempotent) else 1
+        kwargs.setdefault('timeout', policy.timeout)
+        
+        for attempt in range(1, attempts + 1):
+            if not breaker.allow_request():
+                raise CircuitOpenError(breaker.name, breaker.retry_after())
+            
+            retry_after = None
+            recorded = False
+            try:
+                try:
+                    response = (session or self.http or requests).request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    breaker.record_failure()
+                    recorded = True
+                    if attempt == attempts:
+                        raise
+                    logger.warning(f"{method} {endpoint} failed (attempt {attempt}/{attempts}): {str(e)}")
+                else:
+                    if response.status_code not in policy.retry_statuses:
+                        breaker.record_success()
+                        recorded = True
+                        return response
+                    
+                    # Rate limiting means the platform is up, so it does not trip the breaker
+                    if response.status_code == 429:
+                        retry_after = self._parse_retry_after(response)
+                    else:
+                        breaker.record_failure()
+                        recorded = True
+                    
+                    if attempt == attempts:
+                        return response
+                    logger.warning(f"{method} {endpoint} returned {response.status_code} "
+                                   f"(attempt {attempt}/{attempts})")
+            finally:
+                # Rate-limited and unexpectedly failed attempts say nothing about the
+                # endpoint's health, but must hand back a half-open probe slot
+                if not recorded:
+                    breaker.release()
+            
+            time.sleep(policy.backoff(attempt, retry_after))
+    
+    def _stream_items(self, url: str, endpoint: str, path: List[str], description: str,
+                      send=None, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the items of an array in a GET response one at a time.
+        
+        The response body is decoded as it arrives, so the first item is
+        available before the body is fully read and only one item is held at
+        a time. Sharing a request means holding all of its items, so fetches
+        are only coalesced when coalesce_ttl is set or an identical shared
+        fetch is already in flight or cached.
+        
+        Args:
+            url: Request URL
+            endpoint: Logical endpoint name used for the circuit breaker
+            path: Object keys leading to the array in the response
+            description: What is being fetched, for log and error messages
+            send: Request function to use instead of _request (optional)
+            **kwargs: Arguments passed to requests
+            
+        Returns:
+            Iterator[Dict]: Decoded items
+            
+        Raises:
+            ScrapingError: If the request fails or the response is malformed
+        """
+        # send may add its own auth headers, so the account token is part of the key
+        key = (
+            url,
+            tuple(path),
+            repr(sorted((kwargs.get('params') or {}).items())),
+            repr(sorted((kwargs.get('headers') or {}).items())),
+            self.authenticator.token
+        )
+        send = send or self._request
+        if self.coalesce_ttl <= 0 and not _flights.pending(key):
+            yield from self._fetch_items(url, endpoint, path, description, send, **kwargs)
+            return
+        
+        yield from _flights.do(
+            key,
+            lambda: list(self._fetch_items(url, endpoint, path, description, send, **kwargs)),
+            ttl=self.coalesce_ttl
+        )
+    
+    def _fetch_items(self, url: str, endpoint: str, path: List[str], description: str,
+                     send, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch a streamed GET response and yield the items of an array in it.
+        
+        Args:
+            url: Request URL
+            endpoint: Logical endpoint name used for the circuit breaker
+            path: Object keys leading to the array in the response
+            description: What is being fetched, for log and error messages
+            send: Request function
+            **kwargs: Arguments passed to requests
+            
+        Returns:
+            Iterator[Dict]: Decoded items
+            
+        Raises:
+            ScrapingError: If the request fails or the response is malformed
+        """
+        try:
+            response = send('GET', url, endpoint, stream=True, **kwargs)
+            
+            if response.status_code != 200:
+                logger.error(f"Failed to get {description}: {response.status_code} - {response.text}")
+                response.close()
+                raise ScrapingError(f"Failed to get {description}: {response.status_code}")
+            
+            yield from iter_response_items(response, path)
+            
+        except requests.RequestException as e:
+            logger.error(f"Request error while getting {description}: {str(e)}")
+            raise ScrapingError(f"Request error: {str(e)}")
+        except ValueError as e:
+            logger.error(f"Malformed response while getting {description}: {str(e)}")
+            raise ScrapingError(f"Malformed {description} response: {str(e)}")
+    
+    @staticmethod
+    def _parse_retry_after(response: requests.Response) -> Optional[float]:
+        """
+        Parse the Retry-After header of a response.
+        
+        Args:
+            response: HTTP response
+            
+        Returns:
+            float or None: Delay in seconds if present and numeric, None otherwise
+        """
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+    
     @abstractmethod
     def get_user_profile(self) -> Dict[str, Any]:
         """
@@ -93,6 +329,86 @@ class BaseProfileScraper(ABC):
         """
         pass
     
+    def iter_matches(self, limit: int = 10) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the user's matches one at a time as they are decoded.
+        
+        The default implementation falls back to get_matches.
+        
+        Args:
+            limit: Maximum number of matches to retrieve
+            
+        Returns:
+            Iterator[Dict]: Match profiles
+        """
+        yield from self.get_matches(limit)
+    
+    def iter_conversation_messages(self, conversation_id: str, limit: int = 50) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a conversation's messages one at a time as they are decoded.
+        
+        The default implementation falls back to get_conversation_messages.
+        
+        Args:
+            conversation_id: ID of the conversation
+            limit: Maximum number of messages to retrieve
+            
+        Returns:
+            Iterator[Dict]: Messages
+        """
+        yield from self.get_conversation_messages(conversation_id, limit)
+    
+    def get_updates(self, since: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """
+        Get changes since a sync cursor.
+        
+        The default implementation has no platform update feed to read from,
+        so it falls back to a full fetch of matches and conversations.
+        
+        Args:
+            since: Cursor returned by a previous call (None for a full sync)
+            limit: Maximum number of items to retrieve per list
+            
+        Returns:
+            Dict: Changed 'matches' and 'conversations', new 'messages' keyed by
+            platform conversation ID, and the new 'cursor'
+        """
+        return {
+            'matches': self.get_matches(limit),
+            'conversations': self.get_conversations(limit),
+            'messages': {},
+            'cursor': since
+        }
+    
+    def close(self) -> None:
+        """Release resources held by the scraper (the shared HTTP session is owned by the caller)."""
+        pass
+    
+    def open_message_stream(self) -> WebSocketConnection:
+        """
+        Open the platform's persistent push channel for new messages.
+        
+        Returns:
+            WebSocketConnection: Open connection
+            
+        Raises:
+            ScrapingError: If the platform has no push channel
+        """
+        raise ScrapingError(f"{self.PLATFORM} does not support a message stream")
+    
+    def parse_stream_event(self, frame: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a frame received on the message stream.
+        
+        Args:
+            frame: Text frame
+            
+        Returns:
+            Dict or None: Event with a 'type' of 'message' (with 'conversation_id'
+            and 'message') or 'reply' (with the 'frame' to send back), None to ignore
+        """
+        return None
+    
     def normalize_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Normalize profile data to a standard format.
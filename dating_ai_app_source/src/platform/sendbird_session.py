@@ -0,0 +1,170 @@
+"""
+SendBird session module for Hinge messaging.
+Manages the SendBird token lifecycle and a pooled HTTP session to the SendBird host.
+"""
+
+import time
+import logging
+import threading
+import requests
+from typing import Callable, Optional, Tuple
+
+from .auth import BaseAuthenticator
+from .single_flight import SingleFlight
+
+logger = logging.getLogger('platform.sendbird_session')
+
+class SendBirdSession:
+    """Cached SendBird token with proactive refresh and a pooled HTTP session."""
+
+    def __init__(self, authenticator: BaseAuthenticator,
+                 fetch_token: Callable[[], Tuple[str, Optional[float]]],
+                 refresh_margin: float = 300, default_ttl: float = 3600):
+        """
+        Initialize the SendBird session.
+
+        Args:
+            authenticator: Hinge authenticator whose credentials persist the token
+            fetch_token: Callback returning a new (token, seconds until expiry or None)
+            refresh_margin: Seconds before expiry at which the token is refreshed in the background
+            default_ttl: Token lifetime assumed when the platform does not report one
+        """
+        self.authenticator = authenticator
+        self.fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self.http = requests.Session()
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._persist_lock = threading.Lock()
+        self._refreshing = False
+
+        # Restore a token persisted by a previous run
+        credentials = self.authenticator.credentials
+        self.token = credentials.get('sendbird_token')
+        expires_at = credentials.get('sendbird_token_expires_at')
+        self._expiry_deadline = 0.0
+        if self.token:
+            remaining = (expires_at - time.time()) if expires_at else self.default_ttl
+            self._expiry_deadline = time.monotonic() + remaining
+
+    def get_token(self) -> str:
+        """
+        Get a valid SendBird token.
+
+        An expired or missing token is refreshed before returning. A token
+        inside the refresh margin is returned as is while a refresh runs in
+        the background, so callers never wait on a refresh they can avoid.
+
+        Returns:
+            str: SendBird token
+
+        Raises:
+            Exception: Whatever fetch_token raised if a blocking refresh failed
+        """
+        with self._lock:
+            token = self.token
+            remaining = self._expiry_deadline - time.monotonic()
+            refresh_ahead = 0 < remaining <= self.refresh_margin and not self._refreshing
+            if refresh_ahead:
+                self._refreshing = True
+
+        if not token or remaining <= 0:
+            return self.refresh()
+
+        if refresh_ahead:
+            thread = threading.Thread(target=self._refresh_quietly, name='sendbird-refresh')
+            thread.daemon = True
+            thread.start()
+        return token
+
+    def refresh(self) -> str:
+        """
+        Fetch a new SendBird token.
+
+        Concurrent callers share a single fetch.
+
+        Returns:
+            str: New SendBird token
+        """
+        return self._flight.do('token', self._refresh)
+
+    def invalidate(self, token: str) -> None:
+        """
+        Mark a token rejected by SendBird as expired.
+
+        Only the token the caller used is invalidated, so a 401 arriving
+        after another caller already refreshed does not force a second refresh.
+
+        Args:
+            token: Token that was rejected
+        """
+        with self._lock:
+            if token == self.token:
+                self._expiry_deadline = 0.0
+                logger.warning("SendBird token rejected, refreshing")
+
+    def headers(self, token: str) -> dict:
+        """
+        Get headers for SendBird API requests.
+
+        Args:
+            token: SendBird token
+
+        Returns:
+            dict: Headers for SendBird API
+        """
+        return {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        self.http.close()
+
+    def _refresh(self) -> str:
+        """Fetch a new token and persist it in the background."""
+        token, expires_in = self.fetch_token()
+        ttl = expires_in if expires_in else self.default_ttl
+
+        with self._lock:
+            self.token = token
+            self._expiry_deadline = time.monotonic() + ttl
+        logger.info(f"Refreshed SendBird token, valid for {ttl:.0f}s")
+
+        thread = threading.Thread(target=self._persist, args=(token, time.time() + ttl),
+                                  name='sendbird-persist')
+        thread.daemon = True
+        thread.start()
+        return token
+
+    def _refresh_quietly(self) -> None:
+        """Refresh ahead of expiry, logging instead of raising on failure."""
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Error refreshing SendBird token ahead of expiry: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _persist(self, token: str, expires_at: float) -> None:
+        """
+        Save the token in the authenticator's credentials file.
+
+        Args:
+            token: SendBird token
+            expires_at: Expiry as a Unix timestamp
+        """
+        with self._persist_lock:
+            # A newer token may have been persisted while this write waited
+            if token != self.token:
+                return
+            try:
+                self.authenticator.credentials['sendbird_token'] = token
+                self.authenticator.credentials['sendbird_token_expires_at'] = expires_at
+                self.authenticator._save_credentials()
+            except Exception as e:
+                logger.error(f"Error persisting SendBird token: {str(e)}")
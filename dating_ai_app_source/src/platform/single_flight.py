@@ -0,0 +1,125 @@
+"""
+Request coalescing module for platform requests.
+Lets concurrent identical calls share one in-flight call and its result.
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger('platform.single_flight')
+
+class _Call:
+    """A call in flight, shared by its leader and any waiters."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """Duplicate call suppression with an optional short-lived result cache."""
+
+    # Number of cached results above which expired entries are pruned
+    PRUNE_THRESHOLD = 256
+
+    def __init__(self):
+        """Initialize the single-flight group."""
+        self._calls: Dict[Hashable, _Call] = {}
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any], ttl: float = 0.0,
+           cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key.
+
+        The first caller runs fn; callers arriving while it is in flight wait
+        for and share its result or exception. With a ttl, a result is also
+        served to later callers until it expires.
+
+        Args:
+            key: Identity of the call
+            fn: Function performing the call
+            ttl: Seconds to keep the result for later callers (0 disables caching)
+            cacheable: Predicate deciding whether a result may be cached (optional)
+
+        Returns:
+            Any: Result of fn
+
+        Raises:
+            Exception: Whatever fn raised
+        """
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached:
+                if time.monotonic() < cached[0]:
+                    return cached[1]
+                del self._cache[key]
+
+            call = self._calls.get(key)
+            if call:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.waiters:
+                    logger.debug(f"Coalesced {call.waiters} duplicate calls for {key}")
+                if (call.error is None and ttl > 0 and
+                        (cacheable is None or cacheable(call.result))):
+                    self._cache[key] = (time.monotonic() + ttl, call.result)
+                    self._prune()
+            call.done.set()
+
+        return call.result
+
+    def pending(self, key: Hashable) -> bool:
+        """
+        Check whether a call can be shared, in flight or cached.
+
+        Args:
+            key: Identity of the call
+
+        Returns:
+            bool: True if a caller of do would not perform the call itself
+        """
+        with self._lock:
+            cached = self._cache.get(key)
+            return key in self._calls or bool(cached and time.monotonic() < cached[0])
+
+    def forget(self, key: Hashable) -> None:
+        """
+        Drop a cached result so the next caller performs the call.
+
+        Args:
+            key: Identity of the call
+        """
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def _prune(self) -> None:
+        """Remove expired cache entries (called with the lock held)."""
+        if len(self._cache) <= self.PRUNE_THRESHOLD:
+            return
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._cache.items() if expires_at <= now]:
+            del self._cache[key]
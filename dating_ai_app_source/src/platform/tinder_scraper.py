@@ -3,11 +3,15 @@ Tinder-specific profile scraper module.
 Implements profile scraping for the Tinder platform.
 """
 
-import requests
+import time
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import requests
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterator, Optional
 
 from .scraper import BaseProfileScraper, ScrapingError
+from .retry import RetryPolicy
 from .tinder_auth import TinderAuthenticator
 
 logger = logging.getLogger('platform.tinder_scraper')
@@ -15,17 +19,30 @@ logger = logging.getLogger('platform.tinder_scraper')
 class TinderProfileScraper(BaseProfileScraper):
     """Profile scraper for the Tinder platform."""
     
+    PLATFORM = "tinder"
     BASE_URL = "https://api.gotinder.com"
     
-    def __init__(self, authenticator: TinderAuthenticator):
+    def __init__(self, authenticator: TinderAuthenticator, retry_policy: RetryPolicy = None,
+                 coalesce_ttl: float = 0.0, sync_window: float = 30.0,
+                 http_session: requests.Session = None, message_cache_size: int = 256):
         """
         Initialize the Tinder profile scraper.
         
         Args:
             authenticator: Tinder authenticator
+            retry_policy: Retry policy for platform requests (optional)
+            coalesce_ttl: Seconds to reuse successful GET responses (optional)
+            sync_window: Seconds the combined matches payload serves both matches and conversations
+            http_session: Pooled HTTP session for platform requests (optional)
+            message_cache_size: Maximum number of conversations whose messages are kept
         """
-        super().__init__(authenticator)
+        super().__init__(authenticator, retry_policy, coalesce_ttl, http_session)
         self.authenticator = authenticator  # Type hint for IDE
+        self.sync_window = sync_window
+        self._matches_payload = None
+        self.message_cache_size = message_cache_size
+        self._message_cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def get_user_profile(self) -> Dict[str, Any]:
         """
@@ -38,8 +55,10 @@ class TinderProfileScraper(BaseProfileScraper):
             raise ScrapingError("Not authenticated. Cannot get user profile.")
         
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f"{self.BASE_URL}/profile",
+                'profile',
                 headers=self.authenticator.get_auth_headers()
             )
             
@@ -65,28 +84,89 @@ class TinderProfileScraper(BaseProfileScraper):
         Returns:
             List[Dict]: List of match profiles
         """
+        return list(self.iter_matches(limit))
+    
+    def iter_matches(self, limit: int = 10) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the user's matches one at a time as they are decoded.
+        
+        Matches are served from the cached payload within the sync window,
+        and streamed from the platform (refreshing the cache) otherwise.
+        
+        Args:
+            limit: Maximum number of matches to retrieve
+            
+        Returns:
+            Iterator[Dict]: Match profiles
+        """
+        cached = self._get_cached_matches(limit)
+        if cached is not None:
+            yield from cached[:limit]
+            return
+        
         if not self.authenticator.is_authenticated():
             raise ScrapingError("Not authenticated. Cannot get matches.")
         
-        try:
-            response = requests.get(
-                f"{self.BASE_URL}/v2/matches",
-                params={"count": limit},
-                headers=self.authenticator.get_auth_headers()
-            )
+        matches = []
+        for match in self._stream_items(
+            f"{self.BASE_URL}/v2/matches",
+            'matches',
+            ['data', 'matches'],
+            'matches',
+            params={"count": limit},
+            headers=self.authenticator.get_auth_headers()
+        ):
+            matches.append(match)
+            yield match
+        
+        logger.info(f"Successfully retrieved {len(matches)} matches")
+        with self._cache_lock:
+            self._matches_payload = (time.monotonic(), limit, matches)
+    
+    def _get_matches_payload(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the combined matches payload, fetching it at most once per sync window.
+        
+        Tinder returns matches and conversations from the same endpoint, so
+        one fetch serves both views until the window expires.
+        
+        Args:
+            limit: Minimum number of matches the payload must cover
             
-            if response.status_code == 200:
-                matches_data = response.json()
-                matches = matches_data.get('data', {}).get('matches', [])
-                logger.info(f"Successfully retrieved {len(matches)} matches")
-                return matches
-            else:
-                logger.error(f"Failed to get matches: {response.status_code} - {response.text}")
-                raise ScrapingError(f"Failed to get matches: {response.status_code}")
-                
-        except requests.RequestException as e:
-            logger.error(f"Request error while getting matches: {str(e)}")
-            raise ScrapingError(f"Request error: {str(e)}")
+        Returns:
+            List[Dict]: Raw matches with their embedded last messages
+        """
+        cached = self._get_cached_matches(limit)
+        if cached is not None:
+            return cached
+        return list(self.iter_matches(limit))
+    
+    def _get_cached_matches(self, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the cached matches payload if it is fresh and covers the limit.
+        
+        Args:
+            limit: Minimum number of matches the payload must cover
+            
+        Returns:
+            List[Dict] or None: Cached raw matches, None if a fetch is needed
+        """
+        with self._cache_lock:
+            payload = self._matches_payload
+        if not payload:
+            return None
+        
+        fetched_at, fetched_limit, matches = payload
+        fresh = time.monotonic() - fetched_at < self.sync_window
+        # A smaller page than requested is the complete list
+        if fresh and (fetched_limit >= limit or len(matches) < fetched_limit):
+            return matches
+        return None
+    
+    def invalidate_matches(self) -> None:
+        """Drop the cached matches payload so the next call fetches it again."""
+        with self._cache_lock:
+            self._matches_payload = None
     
     def get_match_profile(self, match_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -102,8 +182,10 @@ class TinderProfileScraper(BaseProfileScraper):
             raise ScrapingError("Not authenticated. Cannot get match profile.")
         
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f"{self.BASE_URL}/user/{match_id}",
+                'user',
                 headers=self.authenticator.get_auth_headers()
             )
             
@@ -130,10 +212,15 @@ class TinderProfileScraper(BaseProfileScraper):
             limit: Maximum number of conversations to retrieve
             
         Returns:
-            List[Dict]: List of conversations
+            List[Dict]: List of conversations, each with its embedded 'messages'
+            and 'last_message'
         """
         # In Tinder, matches and conversations are the same endpoint
-        return self.get_matches(limit)
+        conversations = []
+        for match in self._get_matches_payload(limit)[:limit]:
+            messages = match.get('messages') or []
+            conversations.append(dict(match, last_message=messages[-1] if messages else None))
+        return conversations
     
     def get_conversation_messages(self, match_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -146,27 +233,122 @@ class TinderProfileScraper(BaseProfileScraper):
         Returns:
             List[Dict]: List of messages
         """
+        return list(self.iter_conversation_messages(match_id, limit))
+    
+    def iter_conversation_messages(self, match_id: str, limit: int = 50) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a conversation's messages one at a time as they are decoded.
+        
+        Args:
+            match_id: ID of the match/conversation
+            limit: Maximum number of messages to retrieve
+            
+        Returns:
+            Iterator[Dict]: Messages
+        """
+        # Reuse the last fetch when the match has had no activity since
+        activity = self._get_last_activity(match_id)
+        with self._cache_lock:
+            cached = self._message_cache.get(match_id)
+            if cached:
+                self._message_cache.move_to_end(match_id)
+        if activity and cached and cached[0] == activity and cached[1] >= limit:
+            logger.info(f"Messages for match {match_id} unchanged since last fetch")
+            yield from cached[2][-limit:]
+            return
+        
         if not self.authenticator.is_authenticated():
             raise ScrapingError("Not authenticated. Cannot get conversation messages.")
         
+        messages = []
+        for message in self._stream_items(
+            f"{self.BASE_URL}/v2/matches/{match_id}/messages",
+            'messages',
+            ['data', 'messages'],
+            'messages',
+            params={"count": limit},
+            headers=self.authenticator.get_auth_headers()
+        ):
+            messages.append(message)
+            yield message
+        
+        logger.info(f"Successfully retrieved {len(messages)} messages for match {match_id}")
+        if activity:
+            with self._cache_lock:
+                self._message_cache[match_id] = (activity, limit, messages)
+                self._message_cache.move_to_end(match_id)
+                while len(self._message_cache) > self.message_cache_size:
+                    self._message_cache.popitem(last=False)
+    
+    def _get_last_activity(self, match_id: str) -> Optional[str]:
+        """
+        Get a match's last activity date from the cached matches payload.
+        
+        Args:
+            match_id: ID of the match
+            
+        Returns:
+            str or None: Last activity date if the match is in a fresh payload, None otherwise
+        """
+        with self._cache_lock:
+            payload = self._matches_payload
+        if not payload or time.monotonic() - payload[0] >= self.sync_window:
+            return None
+        
+        for match in payload[2]:
+            if match.get('_id') == match_id:
+                return match.get('last_activity_date')
+        return None
+    
+    def get_updates(self, since: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """
+        Get changes since a sync cursor from Tinder's updates feed.
+        
+        Args:
+            since: last_activity_date returned by a previous call (None for a full sync)
+            limit: Unused, the updates feed is not paginated
+            
+        Returns:
+            Dict: Changed 'matches' and 'conversations', new 'messages' keyed by
+            match ID, and the new 'cursor'
+        """
+        if not self.authenticator.is_authenticated():
+            raise ScrapingError("Not authenticated. Cannot get updates.")
+        
         try:
-            response = requests.get(
-                f"{self.BASE_URL}/v2/matches/{match_id}/messages",
-                params={"count": limit},
+            # The updates feed only reads state, so it is safe to retry
+            response = self._request(
+                'POST',
+                f"{self.BASE_URL}/updates",
+                'updates',
+                idempotent=True,
+                json={"last_activity_date": since or ""},
                 headers=self.authenticator.get_auth_headers()
             )
             
             if response.status_code == 200:
-                messages_data = response.json()
-                messages = messages_data.get('data', {}).get('messages', [])
-                logger.info(f"Successfully retrieved {len(messages)} messages for match {match_id}")
-                return messages
+                updates_data = response.json()
+                matches = updates_data.get('matches', [])
+                messages = {}
+                for match in matches:
+                    if match.get('messages'):
+                        messages[match.get('_id', '')] = match['messages']
+                
+                logger.info(f"Successfully retrieved updates for {len(matches)} matches")
+                if matches:
+                    self.invalidate_matches()
+                return {
+                    'matches': matches,
+                    'conversations': matches,
+                    'messages': messages,
+                    'cursor': updates_data.get('last_activity_date') or since
+                }
             else:
-                logger.error(f"Failed to get messages: {response.status_code} - {response.text}")
-                raise ScrapingError(f"Failed to get messages: {response.status_code}")
+                logger.error(f"Failed to get updates: {response.status_code} - {response.text}")
+                raise ScrapingError(f"Failed to get updates: {response.status_code}")
                 
         except requests.RequestException as e:
-            logger.error(f"Request error while getting messages: {str(e)}")
+            logger.error(f"Request error while getting updates: {str(e)}")
             raise ScrapingError(f"Request error: {str(e)}")
     
     def normalize_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -196,7 +378,7 @@ class TinderProfileScraper(BaseProfileScraper):
                 'company': ''
             },
             'education': '',
-            'location': profile_data.get('distance_mi', 0),
+            'location': profile_data.get('distance_mi', ''),
             'last_active': '',
             'platform': 'tinder'
         }
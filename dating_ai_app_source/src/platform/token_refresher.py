@@ -0,0 +1,138 @@
+"""
+Token refresh scheduling module for dating platforms.
+Renews authentication tokens in the background before they expire.
+"""
+
+import time
+import logging
+import threading
+from typing import Dict
+
+from .auth import BaseAuthenticator
+
+logger = logging.getLogger('platform.token_refresher')
+
+class TokenRefresher:
+    """Background scheduler that refreshes tokens a margin before expiry."""
+    
+    def __init__(self, refresh_margin: float = 3600, check_interval: float = 60,
+                 retry_interval: float = 300):
+        """
+        Initialize the token refresher.
+        
+        Args:
+            refresh_margin: Seconds before expiry at which a token is refreshed
+            check_interval: Maximum seconds between expiry checks
+            retry_interval: Seconds to wait before retrying a failed refresh
+        """
+        self.refresh_margin = refresh_margin
+        self.check_interval = check_interval
+        self.retry_interval = retry_interval
+        self.authenticators: Dict[str, BaseAuthenticator] = {}
+        self._next_attempt: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def register(self, name: str, authenticator: BaseAuthenticator) -> None:
+        """
+        Register an authenticator for proactive refresh.
+        
+        Args:
+            name: Name of the authenticator (e.g. the platform name)
+            authenticator: Authenticator to keep fresh
+        """
+        with self._lock:
+            self.authenticators[name] = authenticator
+            self._next_attempt.pop(name, None)
+        logger.info(f"Registered {name} authenticator for token refresh")
+    
+    def unregister(self, name: str) -> None:
+        """
+        Stop refreshing an authenticator.
+        
+        Args:
+            name: Name of the authenticator
+        """
+        with self._lock:
+            self.authenticators.pop(name, None)
+            self._next_attempt.pop(name, None)
+    
+    def start(self) -> None:
+        """Start the background refresh thread if it is not already running."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='token-refresher')
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info("Token refresher started")
+    
+    def stop(self) -> None:
+        """Stop the background refresh thread."""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self._thread = None
+        logger.info("Token refresher stopped")
+    
+    def refresh_due(self) -> int:
+        """
+        Refresh every registered token that is within the refresh margin.
+        
+        Returns:
+            int: Number of tokens refreshed
+        """
+        with self._lock:
+            authenticators = list(self.authenticators.items())
+        
+        refreshed = 0
+        now = time.monotonic()
+        for name, authenticator in authenticators:
+            if not authenticator.token:
+                continue
+            if authenticator.seconds_until_expiry() > self.refresh_margin:
+                continue
+            if now < self._next_attempt.get(name, 0.0):
+                continue
+            
+            try:
+                success = authenticator.refresh_token()
+            except Exception as e:
+                logger.error(f"Error refreshing {name} token: {str(e)}")
+                success = False
+            
+            if success:
+                refreshed += 1
+                self._next_attempt.pop(name, None)
+                logger.info(f"Refreshed {name} token ahead of expiry")
+            else:
+                self._next_attempt[name] = now + self.retry_interval
+                logger.warning(f"Could not refresh {name} token, "
+                               f"{max(0.0, authenticator.seconds_until_expiry()):.0f}s until expiry")
+        
+        return refreshed
+    
+    def _next_wait(self) -> float:
+        """Get the number of seconds until the next token falls due."""
+        with self._lock:
+            authenticators = list(self.authenticators.items())
+        
+        wait = self.check_interval
+        now = time.monotonic()
+        for name, authenticator in authenticators:
+            if not authenticator.token:
+                continue
+            due_in = authenticator.seconds_until_expiry() - self.refresh_margin
+            if due_in <= 0:
+                # Already due, so the next chance is the pending retry
+                due_in = self._next_attempt.get(name, now) - now
+            wait = min(wait, due_in)
+        return max(1.0, wait)
+    
+    def _run(self) -> None:
+        """Refresh loop run by the background thread."""
+        while not self._stop_event.is_set():
+            self.refresh_due()
+            self._stop_event.wait(self._next_wait())
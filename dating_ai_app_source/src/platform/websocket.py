@@ -0,0 +1,273 @@
+"""
+Minimal WebSocket module for platform push channels.
+Implements the RFC 6455 handshake and framing needed for text message streams,
+for both the client side and the local mock server.
+"""
+
+import os
+import ssl
+import base64
+import socket
+import select
+import struct
+import hashlib
+import logging
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger('platform.websocket')
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+class WebSocketError(Exception):
+    """Exception raised for WebSocket protocol errors."""
+    pass
+
+class WebSocketClosed(WebSocketError):
+    """Exception raised when the peer closed the connection."""
+    pass
+
+def accept_key(key: str) -> str:
+    """
+    Compute the Sec-WebSocket-Accept value for a handshake key.
+
+    Args:
+        key: Sec-WebSocket-Key sent by the client
+
+    Returns:
+        str: Expected Sec-WebSocket-Accept value
+    """
+    digest = hashlib.sha1((key + GUID).encode('ascii')).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+class WebSocketConnection:
+    """A WebSocket connection over an already established socket."""
+
+    def __init__(self, sock: socket.socket, client: bool = True):
+        """
+        Initialize the connection.
+
+        Args:
+            sock: Connected socket (after the handshake)
+            client: Whether this is the client side (clients mask their frames)
+        """
+        self.sock = sock
+        self.client = client
+        self.closed = False
+
+    @classmethod
+    def connect(cls, url: str, headers: Dict[str, str] = None,
+                timeout: float = 10.0) -> 'WebSocketConnection':
+        """
+        Open a client connection to a ws:// or wss:// URL.
+
+        Args:
+            url: WebSocket URL
+            headers: Extra handshake headers (optional)
+            timeout: Connect and handshake timeout in seconds
+
+        Returns:
+            WebSocketConnection: Open connection
+
+        Raises:
+            WebSocketError: If the handshake is rejected
+            OSError: If the connection fails
+        """
+        parsed = urlparse(url)
+        secure = parsed.scheme == 'wss'
+        port = parsed.port or (443 if secure else 80)
+        path = parsed.path or '/'
+        if parsed.query:
+            path = f"{path}?{parsed.query}"
+
+        sock = socket.create_connection((parsed.hostname, port), timeout=timeout)
+        try:
+            if secure:
+                sock = ssl.create_default_context().wrap_socket(sock, server_hostname=parsed.hostname)
+
+            key = base64.b64encode(os.urandom(16)).decode('ascii')
+            lines = [
+                f"GET {path} HTTP/1.1",
+                f"Host: {parsed.hostname}:{port}",
+                "Upgrade: websocket",
+                "Connection: Upgrade",
+                f"Sec-WebSocket-Key: {key}",
+                "Sec-WebSocket-Version: 13"
+            ]
+            lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+            sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode('utf-8'))
+
+            status, response_headers = cls._read_handshake_response(sock)
+            if status != 101:
+                raise WebSocketError(f"Handshake rejected with status {status}")
+            if response_headers.get('sec-websocket-accept') != accept_key(key):
+                raise WebSocketError("Handshake returned an invalid accept key")
+
+            sock.settimeout(timeout)
+            return cls(sock, client=True)
+        except Exception:
+            sock.close()
+            raise
+
+    @staticmethod
+    def _read_handshake_response(sock: socket.socket) -> Tuple[int, Dict[str, str]]:
+        """Read the HTTP response to a handshake, one byte at a time so no frame data is consumed."""
+        data = b''
+        while not data.endswith(b'\r\n\r\n'):
+            chunk = sock.recv(1)
+            if not chunk:
+                raise WebSocketError("Connection closed during handshake")
+            data += chunk
+            if len(data) > 65536:
+                raise WebSocketError("Handshake response too large")
+
+        lines = data.decode('latin-1').split('\r\n')
+        try:
+            status = int(lines[0].split(' ')[1])
+        except (IndexError, ValueError):
+            raise WebSocketError(f"Invalid handshake status line: {lines[0]}")
+
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        return status, headers
+
+    def send_text(self, text: str) -> None:
+        """
+        Send a text message.
+
+        Args:
+            text: Message text
+        """
+        self._write_frame(OP_TEXT, text.encode('utf-8'))
+
+    def ping(self, payload: bytes = b'') -> None:
+        """
+        Send a ping frame.
+
+        Args:
+            payload: Ping payload (optional)
+        """
+        self._write_frame(OP_PING, payload)
+
+    def recv(self, timeout: float = None) -> Optional[str]:
+        """
+        Receive the next text message.
+
+        Control frames are handled transparently: pings are answered and a
+        close frame raises WebSocketClosed.
+
+        Args:
+            timeout: Seconds to wait for a message to start arriving (None waits indefinitely)
+
+        Returns:
+            str or None: Message text, or None if the timeout expired
+
+        Raises:
+            WebSocketClosed: If the peer closed the connection
+        """
+        message = b''
+        while True:
+            if not message and not self._wait_readable(timeout):
+                return None
+
+            fin, opcode, payload = self._read_frame()
+            if opcode == OP_PING:
+                self._write_frame(OP_PONG, payload)
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                self._close_socket(reply=True)
+                raise WebSocketClosed("Connection closed by peer")
+
+            message += payload
+            if fin:
+                return message.decode('utf-8', errors='replace')
+
+    def close(self) -> None:
+        """Close the connection, notifying the peer."""
+        self._close_socket(reply=True)
+
+    def _wait_readable(self, timeout: Optional[float]) -> bool:
+        """Wait until a frame starts arriving."""
+        if isinstance(self.sock, ssl.SSLSocket) and self.sock.pending():
+            return True
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        return bool(readable)
+
+    def _recv_exact(self, size: int) -> bytes:
+        """Read exactly size bytes from the socket."""
+        data = b''
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                self.closed = True
+                raise WebSocketClosed("Connection closed by peer")
+            data += chunk
+        return data
+
+    def _read_frame(self) -> Tuple[bool, int, bytes]:
+        """Read a single frame and return (fin, opcode, payload)."""
+        first, second = self._recv_exact(2)
+        fin = bool(first & 0x80)
+        opcode = first & 0x0F
+        masked = bool(second & 0x80)
+        length = second & 0x7F
+
+        if length == 126:
+            length = struct.unpack('!H', self._recv_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', self._recv_exact(8))[0]
+
+        mask = self._recv_exact(4) if masked else None
+        payload = self._recv_exact(length) if length else b''
+        if mask:
+            payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+        return fin, opcode, payload
+
+    def _write_frame(self, opcode: int, payload: bytes) -> None:
+        """Write a single final frame."""
+        if self.closed:
+            raise WebSocketClosed("Connection is closed")
+
+        header = bytes([0x80 | opcode])
+        mask_bit = 0x80 if self.client else 0
+        length = len(payload)
+        if length < 126:
+            header += bytes([mask_bit | length])
+        elif length < 65536:
+            header += bytes([mask_bit | 126]) + struct.pack('!H', length)
+        else:
+            header += bytes([mask_bit | 127]) + struct.pack('!Q', length)
+
+        if self.client:
+            mask = os.urandom(4)
+            header += mask
+            payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+        self.sock.sendall(header + payload)
+
+    def _close_socket(self, reply: bool) -> None:
+        """Send a close frame if possible and close the socket."""
+        if self.closed:
+            return
+        try:
+            if reply:
+                self._write_frame(OP_CLOSE, b'')
+        except OSError:
+            pass
+        finally:
+            self.closed = True
+            try:
+                self.sock.close()
+            except OSError:
+                pass
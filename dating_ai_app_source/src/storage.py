@@ -5,16 +5,32 @@ Provides functionality for storing and retrieving profile and conversation data.
 
 import os
 import json
+import uuid
+import zlib
+import hashlib
 import sqlite3
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger('storage')
 
 class DataStorage:
     """Data storage class for managing profile and conversation data."""
     
+    # Profile fields kept from the stored match when an update leaves them empty
+    PROFILE_FIELDS = ('name', 'age', 'bio', 'interests', 'photos', 'job', 'education', 'location')
+    
+    # Messages sent from here are stored under a conversation's local ID and
+    # synced ones under its platform ID; this matches both given the local ID
+    CONVERSATION_MESSAGES = "conversation_id IN (SELECT ? UNION SELECT platform_id FROM conversations WHERE id = ?)"
+    
     def __init__(self, db_path: str = None):
         """
         Initialize the data storage.
@@ -24,12 +40,33 @@ class DataStorage:
         """
         self.db_path = db_path or os.path.join(os.path.expanduser('~'), 'dating_ai_app.db')
         self.conn = None
+        # The connection is shared with background workers, so write
+        # transactions are serialized through this lock
+        self.lock = threading.RLock()
+        self.match_listeners = []
+        self.message_listeners = []
         self._initialize_database()
     
+    @staticmethod
+    def _ensure_column(cursor: sqlite3.Cursor, table: str, column: str, column_type: str) -> None:
+        """
+        Add a column to an existing table if it is missing.
+        
+        Args:
+            cursor: Database cursor
+            table: Table name
+            column: Column name
+            column_type: SQLite column type
+        """
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+            logger.info(f"Added column {column} to {table}")
+    
     def _initialize_database(self) -> None:
         """Initialize the SQLite database with required tables."""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
             cursor = self.conn.cursor()
             
             # Create users table
@@ -62,6 +99,7 @@ class DataStorage:
                 location TEXT,
                 last_updated TEXT,
                 is_active INTEGER,
+                fingerprint TEXT,
                 FOREIGN KEY (user_id) REFERENCES users (id)
             )
             ''')
@@ -101,6 +139,83 @@ class DataStorage:
             )
             ''')
             
+            # Add columns introduced after the initial schema
+            self._ensure_column(cursor, 'matches', 'fingerprint', 'TEXT')
+            
+            # Create sync cursors table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_cursors (
+                platform TEXT,
+                account_id TEXT,
+                cursor_value TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (platform, account_id)
+            )
+            ''')
+            
+            # Create raw payload archive table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS raw_payloads (
+                platform TEXT,
+                platform_id TEXT,
+                fetched_at TEXT,
+                encoding TEXT,
+                payload_hash TEXT,
+                payload BLOB,
+                kind TEXT DEFAULT 'list',
+                PRIMARY KEY (platform, platform_id, fetched_at)
+            )
+            ''')
+            self._ensure_column(cursor, 'raw_payloads', 'kind', "TEXT DEFAULT 'list'")
+            
+            # Create profile analysis cache table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS profile_analyses (
+                cache_key TEXT PRIMARY KEY,
+                match_id TEXT,
+                analysis TEXT,
+                created_at TEXT
+            )
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_profile_analyses_match ON profile_analyses (match_id)")
+            
+            # Create LLM completion cache table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS llm_completions (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT,
+                completion TEXT,
+                created_at TEXT
+            )
+            ''')
+            
+            # Create rolling conversation summary table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS conversation_summaries (
+                conversation_id TEXT PRIMARY KEY,
+                summary TEXT,
+                covered_until TEXT,
+                covered_message_id TEXT,
+                updated_at TEXT,
+                FOREIGN KEY (conversation_id) REFERENCES conversations (id)
+            )
+            ''')
+            
+            # Create speculative reply draft table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS reply_drafts (
+                conversation_id TEXT PRIMARY KEY,
+                message_id TEXT,
+                match_id TEXT,
+                content TEXT,
+                alternatives TEXT,
+                created_at TEXT,
+                FOREIGN KEY (conversation_id) REFERENCES conversations (id),
+                FOREIGN KEY (message_id) REFERENCES messages (id)
+            )
+            ''')
+            self._ensure_column(cursor, 'reply_drafts', 'alternatives', 'TEXT')
+            
             self.conn.commit()
             logger.info(f"Database initialized at {self.db_path}")
             
@@ -114,6 +229,31 @@ class DataStorage:
             self.conn.close()
             logger.info("Database connection closed")
     
+    def add_match_listener(self, listener) -> None:
+        """
+        Register a callback for match changes.
+        
+        The callback is called as listener(event, match_id, match_data) after
+        the change is committed, where event is 'inserted' or 'updated'.
+        Saves that leave a match unchanged do not fire events.
+        
+        Args:
+            listener: Callback function
+        """
+        self.match_listeners.append(listener)
+    
+    def add_message_listener(self, listener) -> None:
+        """
+        Register a callback for message changes.
+        
+        The callback is called as listener(event, message_id, message_data)
+        after the change is committed, where event is 'inserted' or 'updated'.
+        
+        Args:
+            listener: Callback function
+        """
+        self.message_listeners.append(listener)
+    
     def save_match(self, match_data: Dict[str, Any]) -> bool:
         """
         Save a match to the database.
@@ -124,80 +264,221 @@ class DataStorage:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            cursor = self.conn.cursor()
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                event = self._upsert_match(cursor, match_data)
+                self.conn.commit()
+                self._fire_events(self.match_listeners, [event])
+                return True
             
-            # Check if match already exists
-            cursor.execute("SELECT id FROM matches WHERE platform = ? AND platform_id = ?", 
-                          (match_data.get('platform'), match_data.get('platform_id')))
-            existing = cursor.fetchone()
+            except sqlite3.Error as e:
+                logger.error(f"Error saving match: {str(e)}")
+                return False
+    
+    def save_matches(self, matches: List[Dict[str, Any]], partial: Union[bool, List[bool]] = False) -> int:
+        """
+        Save several matches to the database in a single transaction.
+        
+        Args:
+            matches: List of normalized match data
+            partial: Whether the matches are thin list-level records, whose empty
+                profile fields keep the stored values (a list gives the flag of each match)
             
-            # Convert complex fields to JSON
-            interests_json = json.dumps(match_data.get('interests', []))
-            photos_json = json.dumps(match_data.get('photos', []))
-            job_json = json.dumps(match_data.get('job', {}))
+        Returns:
+            int: Number of matches inserted or changed
+        """
+        if not matches:
+            return 0
+        
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                flags = partial if isinstance(partial, list) else [partial] * len(matches)
+                events = [self._upsert_match(cursor, match_data, flag) for match_data, flag in zip(matches, flags)]
+                self.conn.commit()
             
-            if existing:
-                # Update existing match
-                cursor.execute('''
-                UPDATE matches SET
-                    name = ?,
-                    age = ?,
-                    bio = ?,
-                    interests = ?,
-                    photos = ?,
-                    job = ?,
-                    education = ?,
-                    location = ?,
-                    last_updated = ?,
-                    is_active = ?
-                WHERE id = ?
-                ''', (
-                    match_data.get('name', ''),
-                    match_data.get('age', 0),
-                    match_data.get('bio', ''),
-                    interests_json,
-                    photos_json,
-                    job_json,
-                    match_data.get('education', ''),
-                    match_data.get('location', ''),
-                    datetime.now().isoformat(),
-                    1 if match_data.get('is_active', True) else 0,
-                    existing[0]
-                ))
-                logger.info(f"Updated match {existing[0]}")
-            else:
-                # Insert new match
-                match_id = match_data.get('id') or f"{match_data.get('platform')}_{match_data.get('platform_id')}"
-                cursor.execute('''
-                INSERT INTO matches (
-                    id, platform, platform_id, user_id, name, age, bio, interests,
-                    photos, job, education, location, last_updated, is_active
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    match_id,
-                    match_data.get('platform', ''),
-                    match_data.get('platform_id', ''),
-                    match_data.get('user_id', ''),
-                    match_data.get('name', ''),
-                    match_data.get('age', 0),
-                    match_data.get('bio', ''),
-                    interests_json,
-                    photos_json,
-                    job_json,
-                    match_data.get('education', ''),
-                    match_data.get('location', ''),
-                    datetime.now().isoformat(),
-                    1 if match_data.get('is_active', True) else 0
-                ))
-                logger.info(f"Inserted new match {match_id}")
+                changed = [event for event in events if event]
+                logger.info(f"Saved {len(matches)} matches ({len(changed)} changed)")
+                self._fire_events(self.match_listeners, changed)
+                return len(changed)
             
-            self.conn.commit()
-            return True
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                logger.error(f"Error saving matches: {str(e)}")
+                return 0
+    
+    @staticmethod
+    def match_fingerprint(match_data: Dict[str, Any]) -> str:
+        """
+        Get a stable fingerprint of a normalized match's stored fields.
+        
+        Args:
+            match_data: Normalized match data
             
-        except sqlite3.Error as e:
-            logger.error(f"Error saving match: {str(e)}")
-            return False
+        Returns:
+            str: Hex digest identifying the match content
+        """
+        content = {
+            'user_id': match_data.get('user_id', ''),
+            'name': match_data.get('name', ''),
+            'age': match_data.get('age', 0),
+            'bio': match_data.get('bio', ''),
+            'interests': match_data.get('interests', []),
+            'photos': match_data.get('photos', []),
+            'job': match_data.get('job', {}),
+            'education': match_data.get('education', ''),
+            # Stored as TEXT, so distances read back from the database fingerprint the same
+            'location': str(match_data.get('location', '')),
+            'is_active': bool(match_data.get('is_active', True))
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _fire_events(self, listeners: List[Any], events: List[Optional[Tuple[str, str, Dict[str, Any]]]]) -> None:
+        """
+        Notify listeners of committed changes.
+        
+        Args:
+            listeners: Listeners to notify
+            events: List of (event, id, data) tuples (None entries are skipped)
+        """
+        for event in events:
+            if not event:
+                continue
+            for listener in listeners:
+                try:
+                    listener(*event)
+                except Exception as e:
+                    logger.error(f"Error in storage listener: {str(e)}")
+    
+    def _upsert_match(self, cursor: sqlite3.Cursor, match_data: Dict[str, Any],
+                      partial: bool = False) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Insert or update a match without committing.
+        
+        Profile fields a partial record leaves empty keep their stored values,
+        so thin list-level records never blank a prefetched full profile,
+        while a full profile overwrites them so cleared fields stay cleared.
+        The update is skipped entirely when the stored fingerprint matches, so
+        unchanged profiles cost one indexed read and no writes.
+        
+        Args:
+            cursor: Database cursor
+            match_data: Normalized match data
+            partial: Whether the data is a thin list-level record
+            
+        Returns:
+            Tuple or None: (event, match_id, match_data) if the match changed, None otherwise
+        """
+        # Check if match already exists
+        cursor.execute("SELECT * FROM matches WHERE platform = ? AND platform_id = ?", 
+                      (match_data.get('platform'), match_data.get('platform_id')))
+        row = cursor.fetchone()
+        existing = None
+        if row:
+            stored = self._parse_match_row(dict(zip([col[0] for col in cursor.description], row)))
+            if partial:
+                match_data = self._merge_match(stored, match_data)
+            existing = (stored['id'], stored['fingerprint'])
+        
+        fingerprint = self.match_fingerprint(match_data)
+        if existing and existing[1] == fingerprint:
+            return None
+        
+        # Convert complex fields to JSON
+        interests_json = json.dumps(match_data.get('interests', []))
+        photos_json = json.dumps(match_data.get('photos', []))
+        job_json = json.dumps(match_data.get('job', {}))
+        
+        if existing:
+            # Update existing match
+            cursor.execute('''
+            UPDATE matches SET
+                name = ?,
+                age = ?,
+                bio = ?,
+                interests = ?,
+                photos = ?,
+                job = ?,
+                education = ?,
+                location = ?,
+                last_updated = ?,
+                is_active = ?,
+                fingerprint = ?
+            WHERE id = ?
+            ''', (
+                match_data.get('name', ''),
+                match_data.get('age', 0),
+                match_data.get('bio', ''),
+                interests_json,
+                photos_json,
+                job_json,
+                match_data.get('education', ''),
+                match_data.get('location', ''),
+                datetime.now().isoformat(),
+                1 if match_data.get('is_active', True) else 0,
+                fingerprint,
+                existing[0]
+            ))
+            # Analyses of the previous profile content can never be hit again
+            cursor.execute("DELETE FROM profile_analyses WHERE match_id = ?", (existing[0],))
+            logger.info(f"Updated match {existing[0]}")
+            return ('updated', existing[0], match_data)
+        else:
+            # Insert new match
+            match_id = match_data.get('id') or f"{match_data.get('platform')}_{match_data.get('platform_id')}"
+            cursor.execute('''
+            INSERT INTO matches (
+                id, platform, platform_id, user_id, name, age, bio, interests,
+                photos, job, education, location, last_updated, is_active, fingerprint
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                match_id,
+                match_data.get('platform', ''),
+                match_data.get('platform_id', ''),
+                match_data.get('user_id', ''),
+                match_data.get('name', ''),
+                match_data.get('age', 0),
+                match_data.get('bio', ''),
+                interests_json,
+                photos_json,
+                job_json,
+                match_data.get('education', ''),
+                match_data.get('location', ''),
+                datetime.now().isoformat(),
+                1 if match_data.get('is_active', True) else 0,
+                fingerprint
+            ))
+            logger.info(f"Inserted new match {match_id}")
+            return ('inserted', match_id, match_data)
+    
+    @classmethod
+    def _merge_match(cls, stored: Dict[str, Any], match_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fill the profile fields a match update leaves empty from the stored match.
+        
+        Only missing values count as empty, so a legitimate 0 or '0' is kept.
+        An age of 0 is the normalizers' value for an unknown age.
+        
+        Args:
+            stored: Stored match data
+            match_data: Normalized match data of the update
+            
+        Returns:
+            Dict: Merged match data
+        """
+        def is_empty(field, value):
+            if field == 'age':
+                return not value
+            if isinstance(value, dict):
+                return all(is_empty(key, item) for key, item in value.items())
+            return value is None or value == '' or value == []
+        
+        merged = dict(match_data)
+        for field in cls.PROFILE_FIELDS:
+            if is_empty(field, merged.get(field)) and not is_empty(field, stored.get(field)):
+                merged[field] = stored[field]
+        return merged
     
     def save_message(self, message_data: Dict[str, Any]) -> bool:
         """
@@ -209,66 +490,125 @@ class DataStorage:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            cursor = self.conn.cursor()
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                event = self._upsert_message(cursor, message_data)
+                self.conn.commit()
+                self._fire_events(self.message_listeners, [event])
+                return True
+            
+            except sqlite3.Error as e:
+                logger.error(f"Error saving message: {str(e)}")
+                return False
+    
+    def save_messages(self, messages: List[Dict[str, Any]]) -> int:
+        """
+        Save several messages to the database in a single transaction.
+        
+        Args:
+            messages: List of message data
+            
+        Returns:
+            int: Number of messages inserted or changed
+        """
+        if not messages:
+            return 0
+        
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                events = [self._upsert_message(cursor, message_data) for message_data in messages]
+                self.conn.commit()
+            
+                changed = [event for event in events if event]
+                logger.info(f"Saved {len(messages)} messages ({len(changed)} changed)")
+                self._fire_events(self.message_listeners, changed)
+                return len(changed)
+            
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                logger.error(f"Error saving messages: {str(e)}")
+                return 0
+    
+    def _upsert_message(self, cursor: sqlite3.Cursor,
+                        message_data: Dict[str, Any]) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Insert or update a message without committing.
+        
+        Args:
+            cursor: Database cursor
+            message_data: Message data
             
-            # Check if message already exists
-            cursor.execute("SELECT id FROM messages WHERE platform_id = ?", 
+        Returns:
+            Tuple or None: (event, message_id, message_data) if the message changed, None otherwise
+        """
+        # Check if message already exists; messages sent from here have no platform ID yet
+        existing = None
+        if message_data.get('platform_id'):
+            cursor.execute("SELECT id, delivered_at, read_at FROM messages WHERE platform_id = ?", 
                           (message_data.get('platform_id'),))
             existing = cursor.fetchone()
+        
+        # Re-synced messages whose receipts have not moved need no write
+        if existing and existing[1:] == (message_data.get('delivered_at', ''), message_data.get('read_at', '')):
+            return None
+        
+        if existing:
+            # Update existing message
+            cursor.execute('''
+            UPDATE messages SET
+                delivered_at = ?,
+                read_at = ?
+            WHERE id = ?
+            ''', (
+                message_data.get('delivered_at', ''),
+                message_data.get('read_at', ''),
+                existing[0]
+            ))
+            logger.info(f"Updated message {existing[0]}")
+            return ('updated', existing[0], message_data)
+        else:
+            # Insert new message
+            message_id = message_data.get('id') or f"msg_{uuid.uuid4().hex}"
+            cursor.execute('''
+            INSERT INTO messages (
+                id, conversation_id, sender_type, content, sent_at,
+                delivered_at, read_at, ai_generated, ai_approved, platform_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                message_id,
+                message_data.get('conversation_id', ''),
+                message_data.get('sender_type', ''),
+                message_data.get('content', ''),
+                message_data.get('sent_at', datetime.now().isoformat()),
+                message_data.get('delivered_at', ''),
+                message_data.get('read_at', ''),
+                1 if message_data.get('ai_generated', False) else 0,
+                1 if message_data.get('ai_approved', False) else 0,
+                message_data.get('platform_id', '')
+            ))
+            logger.info(f"Inserted new message {message_id}")
             
-            if existing:
-                # Update existing message
-                cursor.execute('''
-                UPDATE messages SET
-                    delivered_at = ?,
-                    read_at = ?
-                WHERE id = ?
-                ''', (
-                    message_data.get('delivered_at', ''),
-                    message_data.get('read_at', ''),
-                    existing[0]
-                ))
-                logger.info(f"Updated message {existing[0]}")
-            else:
-                # Insert new message
-                message_id = message_data.get('id') or f"msg_{datetime.now().timestamp()}"
-                cursor.execute('''
-                INSERT INTO messages (
-                    id, conversation_id, sender_type, content, sent_at,
-                    delivered_at, read_at, ai_generated, ai_approved, platform_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    message_id,
-                    message_data.get('conversation_id', ''),
-                    message_data.get('sender_type', ''),
-                    message_data.get('content', ''),
-                    message_data.get('sent_at', datetime.now().isoformat()),
-                    message_data.get('delivered_at', ''),
-                    message_data.get('read_at', ''),
-                    1 if message_data.get('ai_generated', False) else 0,
-                    1 if message_data.get('ai_approved', False) else 0,
-                    message_data.get('platform_id', '')
-                ))
-                logger.info(f"Inserted new message {message_id}")
-                
-                # Update conversation last_message_at and message_count
-                cursor.execute('''
-                UPDATE conversations SET
-                    last_message_at = ?,
-                    message_count = message_count + 1
-                WHERE id = ?
-                ''', (
-                    message_data.get('sent_at', datetime.now().isoformat()),
-                    message_data.get('conversation_id', '')
-                ))
-            
-            self.conn.commit()
-            return True
+            # Update conversation last_message_at and message_count
+            cursor.execute('''
+            UPDATE conversations SET
+                last_message_at = ?,
+                message_count = message_count + 1
+            WHERE id = ?
+            ''', (
+                message_data.get('sent_at', datetime.now().isoformat()),
+                message_data.get('conversation_id', '')
+            ))
             
-        except sqlite3.Error as e:
-            logger.error(f"Error saving message: {str(e)}")
-            return False
+            # A draft replying to an earlier message is out of date
+            cursor.execute('''
+            DELETE FROM reply_drafts WHERE conversation_id IN (
+                SELECT ? UNION SELECT id FROM conversations WHERE platform_id = ?
+            )
+            ''', (message_data.get('conversation_id', ''), message_data.get('conversation_id', '')))
+            return ('inserted', message_id, message_data)
+
     
     def save_conversation(self, conversation_data: Dict[str, Any]) -> bool:
         """
@@ -280,57 +620,96 @@ class DataStorage:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            cursor = self.conn.cursor()
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                self._upsert_conversation(cursor, conversation_data)
+                self.conn.commit()
+                return True
             
-            # Check if conversation already exists
-            cursor.execute("SELECT id FROM conversations WHERE platform = ? AND platform_id = ?", 
-                          (conversation_data.get('platform'), conversation_data.get('platform_id')))
-            existing = cursor.fetchone()
-            
-            if existing:
-                # Update existing conversation
-                cursor.execute('''
-                UPDATE conversations SET
-                    last_message_at = ?,
-                    status = ?,
-                    ai_enabled = ?
-                WHERE id = ?
-                ''', (
-                    conversation_data.get('last_message_at', ''),
-                    conversation_data.get('status', 'active'),
-                    1 if conversation_data.get('ai_enabled', False) else 0,
-                    existing[0]
-                ))
-                logger.info(f"Updated conversation {existing[0]}")
-            else:
-                # Insert new conversation
-                conversation_id = conversation_data.get('id') or f"conv_{datetime.now().timestamp()}"
-                cursor.execute('''
-                INSERT INTO conversations (
-                    id, match_id, user_id, platform, platform_id,
-                    started_at, last_message_at, status, ai_enabled, message_count
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    conversation_id,
-                    conversation_data.get('match_id', ''),
-                    conversation_data.get('user_id', ''),
-                    conversation_data.get('platform', ''),
-                    conversation_data.get('platform_id', ''),
-                    conversation_data.get('started_at', datetime.now().isoformat()),
-                    conversation_data.get('last_message_at', datetime.now().isoformat()),
-                    conversation_data.get('status', 'active'),
-                    1 if conversation_data.get('ai_enabled', False) else 0,
-                    conversation_data.get('message_count', 0)
-                ))
-                logger.info(f"Inserted new conversation {conversation_id}")
+            except sqlite3.Error as e:
+                logger.error(f"Error saving conversation: {str(e)}")
+                return False
+    
+    def save_conversations(self, conversations: List[Dict[str, Any]]) -> int:
+        """
+        Save several conversations to the database in a single transaction.
+        
+        Args:
+            conversations: List of conversation data
             
-            self.conn.commit()
-            return True
+        Returns:
+            int: Number of conversations saved
+        """
+        if not conversations:
+            return 0
+        
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                for conversation_data in conversations:
+                    self._upsert_conversation(cursor, conversation_data)
+                self.conn.commit()
+                logger.info(f"Saved {len(conversations)} conversations")
+                return len(conversations)
             
-        except sqlite3.Error as e:
-            logger.error(f"Error saving conversation: {str(e)}")
-            return False
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                logger.error(f"Error saving conversations: {str(e)}")
+                return 0
+    
+    def _upsert_conversation(self, cursor: sqlite3.Cursor, conversation_data: Dict[str, Any]) -> None:
+        """
+        Insert or update a conversation without committing.
+        
+        Args:
+            cursor: Database cursor
+            conversation_data: Conversation data
+        """
+        # Check if conversation already exists
+        cursor.execute("SELECT id FROM conversations WHERE platform = ? AND platform_id = ?", 
+                      (conversation_data.get('platform'), conversation_data.get('platform_id')))
+        existing = cursor.fetchone()
+        
+        if existing:
+            # Update existing conversation
+            cursor.execute('''
+            UPDATE conversations SET
+                match_id = COALESCE(NULLIF(?, ''), match_id),
+                last_message_at = ?,
+                status = ?,
+                ai_enabled = ?
+            WHERE id = ?
+            ''', (
+                conversation_data.get('match_id', ''),
+                conversation_data.get('last_message_at', ''),
+                conversation_data.get('status', 'active'),
+                1 if conversation_data.get('ai_enabled', False) else 0,
+                existing[0]
+            ))
+            logger.info(f"Updated conversation {existing[0]}")
+        else:
+            # Insert new conversation
+            conversation_id = conversation_data.get('id') or f"conv_{uuid.uuid4().hex}"
+            cursor.execute('''
+            INSERT INTO conversations (
+                id, match_id, user_id, platform, platform_id,
+                started_at, last_message_at, status, ai_enabled, message_count
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                conversation_id,
+                conversation_data.get('match_id', ''),
+                conversation_data.get('user_id', ''),
+                conversation_data.get('platform', ''),
+                conversation_data.get('platform_id', ''),
+                conversation_data.get('started_at', datetime.now().isoformat()),
+                conversation_data.get('last_message_at', datetime.now().isoformat()),
+                conversation_data.get('status', 'active'),
+                1 if conversation_data.get('ai_enabled', False) else 0,
+                conversation_data.get('message_count', 0)
+            ))
+            logger.info(f"Inserted new conversation {conversation_id}")
+
     
     def get_match(self, match_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -352,20 +731,65 @@ class DataStorage:
                 
             # Convert row to dictionary
             columns = [col[0] for col in cursor.description]
-            match_data = dict(zip(columns, row))
-            
-            # Parse JSON fields
-            match_data['interests'] = json.loads(match_data.get('interests', '[]'))
-            match_data['photos'] = json.loads(match_data.get('photos', '[]'))
-            match_data['job'] = json.loads(match_data.get('job', '{}'))
-            match_data['is_active'] = bool(match_data.get('is_active', 0))
-            
-            return match_data
+            return self._parse_match_row(dict(zip(columns, row)))
             
         except sqlite3.Error as e:
             logger.error(f"Error getting match: {str(e)}")
             return None
     
+    def get_matches_without_conversation(self, platform: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get active matches that have not exchanged any messages yet.
+        
+        Args:
+            platform: Platform name (optional)
+            limit: Maximum number of matches to retrieve
+            
+        Returns:
+            List[Dict]: List of matches, most recently updated first
+        """
+        try:
+            cursor = self.conn.cursor()
+            query = '''
+            SELECT m.* FROM matches m
+            WHERE m.is_active = 1
+            AND NOT EXISTS (
+                SELECT 1 FROM conversations c
+                WHERE c.match_id = m.id AND COALESCE(c.message_count, 0) > 0
+            )
+            '''
+            params = []
+            if platform:
+                query += " AND m.platform = ?"
+                params.append(platform)
+            query += " ORDER BY m.last_updated DESC LIMIT ?"
+            params.append(limit)
+            cursor.execute(query, params)
+            
+            columns = [col[0] for col in cursor.description]
+            return [self._parse_match_row(dict(zip(columns, row))) for row in cursor.fetchall()]
+            
+        except sqlite3.Error as e:
+            logger.error(f"Error getting matches without conversation: {str(e)}")
+            return []
+    
+    @staticmethod
+    def _parse_match_row(match_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Parse the JSON fields of a stored match row.
+        
+        Args:
+            match_data: Match row as a dictionary
+            
+        Returns:
+            Dict: Match data
+        """
+        match_data['interests'] = json.loads(match_data.get('interests') or '[]')
+        match_data['photos'] = json.loads(match_data.get('photos') or '[]')
+        match_data['job'] = json.loads(match_data.get('job') or '{}')
+        match_data['is_active'] = bool(match_data.get('is_active', 0))
+        return match_data
+    
     def get_conversation_messages(self, conversation_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Get messages for a conversation.
@@ -380,8 +804,8 @@ class DataStorage:
         try:
             cursor = self.conn.cursor()
             cursor.execute(
-                "SELECT * FROM messages WHERE conversation_id = ? ORDER BY sent_at DESC LIMIT ?", 
-                (conversation_id, limit)
+                f"SELECT * FROM messages WHERE {self.CONVERSATION_MESSAGES} ORDER BY sent_at DESC LIMIT ?",
+                (conversation_id, conversation_id, limit)
             )
             rows = cursor.fetchall()
             
@@ -401,6 +825,53 @@ class DataStorage:
             logger.error(f"Error getting conversation messages: {str(e)}")
             return []
     
+    def get_messages_since(self, conversation_id: str, after_sent_at: str = None, after_id: str = None,
+                           limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get the messages of a conversation that follow a position, oldest first.
+        
+        Messages are ordered by (sent_at, id), so messages sent at the same
+        time keep a stable order.
+        
+        Args:
+            conversation_id: Conversation ID
+            after_sent_at: Send time of the last message already seen (from the start if omitted)
+            after_id: ID of the last message already seen
+            limit: Maximum number of messages to retrieve
+            
+        Returns:
+            List[Dict]: List of messages
+        """
+        try:
+            cursor = self.conn.cursor()
+            if after_sent_at is None:
+                cursor.execute(
+                    f"SELECT * FROM messages WHERE {self.CONVERSATION_MESSAGES} ORDER BY sent_at, id LIMIT ?",
+                    (conversation_id, conversation_id, limit)
+                )
+            else:
+                cursor.execute(f'''
+                SELECT * FROM messages
+                WHERE {self.CONVERSATION_MESSAGES} AND (sent_at > ? OR (sent_at = ? AND id > ?))
+                ORDER BY sent_at, id LIMIT ?
+                ''', (conversation_id, conversation_id, after_sent_at, after_sent_at, after_id or '', limit))
+            rows = cursor.fetchall()
+            
+            columns = [col[0] for col in cursor.description]
+            messages = []
+            
+            for row in rows:
+                message_data = dict(zip(columns, row))
+                message_data['ai_generated'] = bool(message_data.get('ai_generated', 0))
+                message_data['ai_approved'] = bool(message_data.get('ai_approved', 0))
+                messages.append(message_data)
+            
+            return messages
+            
+        except sqlite3.Error as e:
+            logger.error(f"Error getting conversation messages: {str(e)}")
+            return []
+    
     def get_active_conversations(self, user_id: str = None, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Get active conversations.
@@ -442,3 +913,541 @@ class DataStorage:
         except sqlite3.Error as e:
             logger.error(f"Error getting active conversations: {str(e)}")
             return []
+    
+    def get_sync_cursor(self, platform: str, account_id: str) -> Optional[str]:
+        """
+        Get the delta sync cursor for a platform account.
+        
+        Args:
+            platform: Platform name
+            account_id: Platform user ID of the account
+            
+        Returns:
+            str or None: Cursor value if the account has been synced, None otherwise
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT cursor_value FROM sync_cursors WHERE platform = ? AND account_id = ?",
+                (platform, account_id)
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+            
+        except sqlite3.Error as e:
+            logger.error(f"Error getting sync cursor: {str(e)}")
+            return None
+    
+    def set_sync_cursor(self, platform: str, account_id: str, cursor_value: str) -> bool:
+        """
+        Persist the delta sync cursor for a platform account.
+        
+        Args:
+            platform: Platform name
+            account_id: Platform user ID of the account
+            cursor_value: New cursor value
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                INSERT OR REPLACE INTO sync_cursors (platform, account_id, cursor_value, updated_at)
+                VALUES (?, ?, ?, ?)
+                ''', (platform, account_id, cursor_value, datetime.now().isoformat()))
+                self.conn.commit()
+                logger.info(f"Updated sync cursor for {platform} account {account_id}")
+                return True
+            
+            except sqlite3.Error as e:
+                logger.error(f"Error setting sync cursor: {str(e)}")
+                return False
+    
+    def get_profile_analysis(self, cache_key: str, max_age: float = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached profile analysis.
+        
+        Args:
+            cache_key: Hash of the analyzed profile content and analysis version
+            max_age: Maximum age of the analysis in seconds (optional)
+            
+        Returns:
+            Dict or None: Analysis if cached and fresh, None otherwise
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT analysis, created_at FROM profile_analyses WHERE cache_key = ?",
+                (cache_key,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            if max_age is not None:
+                age = (datetime.now() - datetime.fromisoformat(row[1])).total_seconds()
+                if age > max_age:
+                    return None
+            
+            return json.loads(row[0])
+            
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Error getting profile analysis: {str(e)}")
+            return None
+    
+    def save_profile_analysis(self, cache_key: str, match_id: str, analysis: Dict[str, Any]) -> bool:
+        """
+        Cache a profile analysis.
+        
+        Args:
+            cache_key: Hash of the analyzed profile content and analysis version
+            match_id: Match ID the analysis belongs to
+            analysis: Analysis results
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                INSERT OR REPLACE INTO profile_analyses (cache_key, match_id, analysis, created_at)
+                VALUES (?, ?, ?, ?)
+                ''', (cache_key, match_id, json.dumps(analysis), datetime.now().isoformat()))
+                self.conn.commit()
+                return True
+            
+            except sqlite3.Error as e:
+                logger.error(f"Error saving profile analysis: {str(e)}")
+                return False
+    
+    def delete_profile_analyses(self, match_id: str = None) -> int:
+        """
+        Invalidate cached profile analyses.
+        
+        Args:
+            match_id: Only invalidate this match's analyses (all if omitted)
+            
+        Returns:
+            int: Number of analyses deleted
+        """
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                if match_id:
+                    cursor.execute("DELETE FROM profile_analyses WHERE match_id = ?", (match_id,))
+                else:
+                    cursor.execute("DELETE FROM profile_analyses")
+                self.conn.commit()
+                logger.info(f"Deleted {cursor.rowcount} cached profile analyses")
+                return cursor.rowcount
+            
+            except sqlite3.Error as e:
+                logger.error(f"Error deleting profile analyses: {str(e)}")
+                return 0
+    
+    def get_cached_completion(self, cache_key: str, max_age: float = None) -> Optional[str]:
+        """
+        Get a cached LLM completion.
+        
+        Args:
+            cache_key: Hash of the completion request
+            max_age: Maximum age of the completion in seconds (optional)
+            
+        Returns:
+            str or None: Completion if cached and fresh, None otherwise
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT completion, created_at FROM llm_completions WHERE cache_key = ?",
+                (cache_key,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            if max_age is not None:
+                age = (datetime.now() - datetime.fromisoformat(row[1])).total_seconds()
+                if age > max_age:
+                    return None
+            
+            return row[0]
+            
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Error getting cached completion: {str(e)}")
+            return None
+    
+    def save_cached_completion(self, cache_key: str, model: str, completion: str) -> bool:
+        """
+        Cache an LLM completion.
+        
+        Args:
+            cache_key: Hash of the completion request
+            model: Model that produced the completion
+            completion: Completion text
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                INSERT OR REPLACE INTO llm_completions (cache_key, model, completion, created_at)
+                VALUES (?, ?, ?, ?)
+                ''', (cache_key, model, completion, datetime.now().isoformat()))
+                self.conn.commit()
+                return True
+            
+            except sqlite3.Error as e:
+                logger.error(f"Error saving cached completion: {str(e)}")
+                return False
+    
+    def delete_cached_completions(self, max_age: float = None) -> int:
+        """
+        Delete cached LLM completions.
+        
+        Args:
+            max_age: Only delete completions older than this many seconds (all if omitted)
+            
+        Returns:
+            int: Number of completions deleted
+        """
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                if max_age is not None:
+                    cutoff = datetime.fromtimestamp(datetime.now().timestamp() - max_age).isoformat()
+                    cursor.execute("DELETE FROM llm_completions WHERE created_at < ?", (cutoff,))
+                else:
+                    cursor.execute("DELETE FROM llm_completions")
+                self.conn.commit()
+                return cursor.rowcount
+            
+            except sqlite3.Error as e:
+                logger.error(f"Error deleting cached completions: {str(e)}")
+                return 0
+    
+    def get_conversation_summary(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the rolling summary of a conversation's older messages.
+        
+        Args:
+            conversation_id: Conversation ID
+            
+        Returns:
+            Dict or None: Summary with the position of the last message it covers
+            (covered_until, covered_message_id) if saved, None otherwise
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT * FROM conversation_summaries WHERE conversation_id = ?",
+                (conversation_id,)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            columns = [col[0] for col in cursor.description]
+            return dict(zip(columns, row))
+            
+        except sqlite3.Error as e:
+            logger.error(f"Error getting conversation summary: {str(e)}")
+            return None
+    
+    def save_conversation_summary(self, conversation_id: str, summary: str,
+                                  covered_until: str, covered_message_id: str) -> bool:
+        """
+        Save the rolling summary of a conversation's older messages.
+        
+        Args:
+            conversation_id: Conversation ID
+            summary: Summary text
+            covered_until: Send time of the last message the summary covers
+            covered_message_id: ID of the last message the summary covers
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                INSERT OR REPLACE INTO conversation_summaries
+                (conversation_id, summary, covered_until, covered_message_id, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ''', (conversation_id, summary, covered_until, covered_message_id, datetime.now().isoformat()))
+                self.conn.commit()
+                return True
+            
+            except sqlite3.Error as e:
+                logger.error(f"Error saving conversation summary: {str(e)}")
+                return False
+    
+    def resolve_conversation_id(self, conversation_id: str) -> Optional[str]:
+        """
+        Get the local ID of a conversation from its local or platform ID.
+        
+        Args:
+            conversation_id: Local or platform conversation ID
+        
+        Returns:
+            str or None: Local conversation ID if the conversation is stored, None otherwise
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT id FROM conversations WHERE id = ? OR platform_id = ? LIMIT 1",
+                (conversation_id, conversation_id)
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+        
+        except sqlite3.Error as e:
+            logger.error(f"Error resolving conversation: {str(e)}")
+            return None
+    
+    def get_latest_message_id(self, conversation_id: str) -> Optional[str]:
+        """
+        Get the ID of the newest message of a conversation.
+        
+        Args:
+            conversation_id: Conversation ID
+            
+        Returns:
+            str or None: Message ID if the conversation has messages, None otherwise
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                f"SELECT id FROM messages WHERE {self.CONVERSATION_MESSAGES} ORDER BY sent_at DESC, id DESC LIMIT 1",
+                (conversation_id, conversation_id)
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+            
+        except sqlite3.Error as e:
+            logger.error(f"Error getting latest message: {str(e)}")
+            return None
+    
+    def get_latest_synced_message_time(self, conversation_id: str) -> Optional[str]:
+        """
+        Get the send time of the newest message of a conversation synced from its platform.
+        
+        Args:
+            conversation_id: Local or platform conversation ID
+            
+        Returns:
+            str or None: Send time if messages were synced, None otherwise
+        """
+        conversation_id = self.resolve_conversation_id(conversation_id) or conversation_id
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                f"SELECT MAX(sent_at) FROM messages WHERE {self.CONVERSATION_MESSAGES} AND platform_id != ''",
+                (conversation_id, conversation_id)
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+            
+        except sqlite3.Error as e:
+            logger.error(f"Error getting latest synced message: {str(e)}")
+            return None
+    
+    def get_reply_draft(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the reply drafted for the newest message of a conversation.
+        
+        Args:
+            conversation_id: Conversation ID
+            
+        Returns:
+            Dict or None: Draft with the ID of the message it replies to and its
+            alternative texts if it is still current, None otherwise
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(f'''
+            SELECT * FROM reply_drafts
+            WHERE conversation_id = ? AND message_id = (
+                SELECT id FROM messages WHERE {self.CONVERSATION_MESSAGES} ORDER BY sent_at DESC, id DESC LIMIT 1
+            )
+            ''', (conversation_id, conversation_id, conversation_id))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            columns = [col[0] for col in cursor.description]
+            draft = dict(zip(columns, row))
+            draft['alternatives'] = json.loads(draft['alternatives']) if draft.get('alternatives') else []
+            return draft
+            
+        except sqlite3.Error as e:
+            logger.error(f"Error getting reply draft: {str(e)}")
+            return None
+    
+    def save_reply_draft(self, conversation_id: str, message_id: str, match_id: str, content: str,
+                         alternatives: List[str] = None) -> bool:
+        """
+        Save a reply drafted for a message, unless newer messages have arrived since.
+        
+        Args:
+            conversation_id: Conversation ID
+            message_id: ID of the message the draft replies to
+            match_id: Match ID
+            content: Draft text
+            alternatives: Other candidate texts, best first (optional)
+            
+        Returns:
+            bool: True if saved, False if the message is no longer the newest or saving failed
+        """
+        with self.lock:
+            try:
+                if self.get_latest_message_id(conversation_id) != message_id:
+                    return False
+                
+                cursor = self.conn.cursor()
+                cursor.execute('''
+                INSERT OR REPLACE INTO reply_drafts
+                (conversation_id, message_id, match_id, content, alternatives, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''', (conversation_id, message_id, match_id, content, json.dumps(alternatives or []),
+                      datetime.now().isoformat()))
+                self.conn.commit()
+                return True
+            
+            except sqlite3.Error as e:
+                logger.error(f"Error saving reply draft: {str(e)}")
+                return False
+    
+    def save_raw_payloads(self, platform: str, payloads: List[Tuple[str, Dict[str, Any]]],
+                          fetched_at: str = None, kind: str = 'list') -> int:
+        """
+        Archive raw platform payloads, compressed, in a single transaction.
+        
+        A payload identical to the latest archived one of the same kind for
+        the same profile is skipped so repeated syncs do not grow the archive.
+        
+        Args:
+            platform: Platform name
+            payloads: List of (platform_id, raw payload) pairs
+            fetched_at: Fetch timestamp in ISO format (defaults to now)
+            kind: 'list' for match list records, 'profile' for full profiles
+            
+        Returns:
+            int: Number of payloads archived
+        """
+        if not payloads:
+            return 0
+        
+        fetched_at = fetched_at or datetime.now().isoformat()
+        
+        with self.lock:
+            try:
+                cursor = self.conn.cursor()
+                archived = 0
+                for platform_id, payload in payloads:
+                    raw = json.dumps(payload, sort_keys=True).encode('utf-8')
+                    payload_hash = hashlib.sha256(raw).hexdigest()
+                
+                    cursor.execute('''
+                    SELECT payload_hash FROM raw_payloads
+                    WHERE platform = ? AND platform_id = ? AND kind = ?
+                    ORDER BY fetched_at DESC LIMIT 1
+                    ''', (platform, platform_id, kind))
+                    latest = cursor.fetchone()
+                    if latest and latest[0] == payload_hash:
+                        continue
+                
+                    encoding, blob = self._compress_payload(raw)
+                    cursor.execute('''
+                    INSERT OR REPLACE INTO raw_payloads (
+                        platform, platform_id, fetched_at, encoding, payload_hash, payload, kind
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', (platform, platform_id, fetched_at, encoding, payload_hash, blob, kind))
+                    archived += 1
+            
+                self.conn.commit()
+                logger.info(f"Archived {archived} raw {platform} {kind} payloads")
+                return archived
+            
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                logger.error(f"Error archiving raw payloads: {str(e)}")
+                return 0
+    
+    def iter_raw_payloads(self, platform: str = None,
+                          batch_size: int = 500) -> Iterator[Tuple[str, str, str, Dict[str, Any], str]]:
+        """
+        Stream the latest archived raw payload of each kind of every profile.
+        
+        A profile's list payload comes before its full profile payload, so
+        renormalizing them in order lets the full profile take precedence.
+        
+        Args:
+            platform: Platform name to filter by (optional)
+            batch_size: Number of rows fetched from the database at a time
+            
+        Yields:
+            Tuple: (platform, platform_id, fetched_at, raw payload, kind)
+        """
+        query = '''
+        SELECT platform, platform_id, MAX(fetched_at), encoding, payload, kind
+        FROM raw_payloads
+        '''
+        params = ()
+        if platform:
+            query += " WHERE platform = ?"
+            params = (platform,)
+        query += " GROUP BY platform, platform_id, kind ORDER BY platform, platform_id, kind"
+        
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row_platform, platform_id, fetched_at, encoding, blob, kind in rows:
+                    payload = json.loads(self._decompress_payload(encoding, blob))
+                    yield row_platform, platform_id, fetched_at, payload, kind
+                    
+        except sqlite3.Error as e:
+            logger.error(f"Error reading raw payloads: {str(e)}")
+    
+    @staticmethod
+    def _compress_payload(raw: bytes) -> Tuple[str, bytes]:
+        """
+        Compress a serialized payload with zstd if available, zlib otherwise.
+        
+        Args:
+            raw: Serialized payload
+            
+        Returns:
+            Tuple: Encoding name and compressed bytes
+        """
+        if zstandard is not None:
+            return 'zstd', zstandard.ZstdCompressor(level=9).compress(raw)
+        return 'zlib', zlib.compress(raw, 9)
+    
+    @staticmethod
+    def _decompress_payload(encoding: str, blob: bytes) -> bytes:
+        """
+        Decompress an archived payload.
+        
+        Args:
+            encoding: Encoding name stored with the payload
+            blob: Compressed bytes
+            
+        Returns:
+            bytes: Serialized payload
+        """
+        if encoding == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed payloads")
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return zlib.decompress(blob)
@@ -21,6 +21,9 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // Message editing
     setupMessageEditing();
+
+    // Cycling through alternative suggestions
+    setupSuggestionCycling();
 });
 
 // Setup conversation monitoring
@@ -210,6 +213,120 @@ function setupMessageEditing() {
     });
 }
 
+// Stream generated text into the page over server-sent events
+function streamGeneratedText(streamUrl, fallbackUrl) {
+    const content = document.querySelector('#generated-content');
+    const editor = document.querySelector('#editedContent');
+    const dataField = document.querySelector('#generated-data');
+    const source = new EventSource(streamUrl);
+    let text = '';
+    let finished = false;
+    
+    function showText(value) {
+        content.textContent = value;
+        editor.value = value;
+    }
+    
+    // Append each piece of text as it arrives
+    source.addEventListener('delta', event => {
+        text += JSON.parse(event.data).text;
+        showText(text);
+    });
+    
+    // Generation failed part way; the fallback message follows
+    source.addEventListener('reset', () => {
+        text = '';
+        showText(text);
+    });
+    
+    // Store the final message for the form and enable sending
+    source.addEventListener('done', event => {
+        const message = JSON.parse(event.data).message;
+        finished = true;
+        source.close();
+        showText(message.content);
+        dataField.value = JSON.stringify(message);
+        document.querySelectorAll('.generated-action').forEach(button => button.disabled = false);
+        if (message.alternatives && message.alternatives.length) {
+            document.querySelector('#next-suggestion').classList.remove('d-none');
+        }
+    });
+    
+    // Load the page without streaming if the stream cannot be used
+    source.onerror = () => {
+        source.close();
+        if (!finished) {
+            window.location.href = fallbackUrl;
+        }
+    };
+}
+
+// Stream drafted openers into their match cards as each one completes
+function streamDraftOpeners(streamUrl, fallbackUrl) {
+    const source = new EventSource(streamUrl);
+    let finished = false;
+    
+    function showError(card, error) {
+        card.querySelector('.draft-pending').classList.add('d-none');
+        card.querySelector('.draft-error-detail').textContent = error ? ': ' + error : '';
+        card.querySelector('.draft-error').classList.remove('d-none');
+    }
+    
+    // Fill in the form of a completed draft
+    source.addEventListener('draft', event => {
+        const data = JSON.parse(event.data);
+        const card = document.getElementById('draft-' + data.match_id);
+        if (!card) return;
+        card.querySelector('.draft-pending').classList.add('d-none');
+        card.querySelector('.draft-data').value = JSON.stringify(data.message);
+        card.querySelector('.draft-content').value = data.message.content;
+        card.querySelector('.draft-form').classList.remove('d-none');
+    });
+    
+    // Show a failed draft as an error, not as a message
+    source.addEventListener('failed', event => {
+        const data = JSON.parse(event.data);
+        const card = document.getElementById('draft-' + data.match_id);
+        if (card) showError(card, data.error);
+    });
+    
+    // Cards still waiting when the batch ends got no draft
+    source.addEventListener('done', () => {
+        finished = true;
+        source.close();
+        document.querySelectorAll('.draft-pending:not(.d-none)').forEach(pending => {
+            showError(pending.closest('.card-body'), null);
+        });
+    });
+    
+    // Load the page without streaming if the stream cannot be used
+    source.onerror = () => {
+        source.close();
+        if (!finished) {
+            window.location.href = fallbackUrl;
+        }
+    };
+}
+
+// Setup cycling through the alternative suggestions of a generated message
+function setupSuggestionCycling() {
+    const nextButton = document.querySelector('#next-suggestion');
+    if (!nextButton) return;
+    
+    nextButton.addEventListener('click', function() {
+        const dataField = document.querySelector('#generated-data');
+        const message = JSON.parse(dataField.value);
+        if (!message.alternatives || !message.alternatives.length) return;
+        
+        // Show the next candidate and queue the current one behind the others
+        message.alternatives.push(message.content);
+        message.content = message.alternatives.shift();
+        dataField.value = JSON.stringify(message);
+        document.querySelector('#generated-content').textContent = message.content;
+        document.querySelector('#editedContent').value = message.content;
+    });
+}
+
 // Show alert message
 function showAlert(message, type = 'info') {
     const alertContainer = document.querySelector('#alert-container');
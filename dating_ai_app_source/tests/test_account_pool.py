@@ -0,0 +1,82 @@
+"""
+Tests for pooled account sessions and their idle eviction.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from src.platform.account_pool import AccountPool
+from src.platform.token_refresher import TokenRefresher
+
+class TestAccountPool(unittest.TestCase):
+    """Tests for AccountPool sessions and eviction."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.refresher = TokenRefresher()
+        self.pool = AccountPool(idle_timeout=60, sweep_interval=60, token_refresher=self.refresher,
+                                credentials_dir=self.temp_dir)
+
+    def tearDown(self):
+        self.pool.close()
+        self.refresher.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def make_idle(self, session):
+        """Mark a session as last used longer ago than the idle timeout."""
+        session.last_used = time.monotonic() - self.pool.idle_timeout
+
+    def test_sessions_are_shared_per_account(self):
+        session = self.pool.get('test', 'Tinder')
+        self.assertIs(self.pool.get('test', 'tinder'), session)
+        self.assertIsNot(self.pool.get('test', 'tinder', 'second'), session)
+        self.assertIsNone(self.pool.get('test', 'hinge', create=False))
+        self.assertEqual(sorted(self.pool.accounts('test')),
+                         [('test', 'tinder', 'default'), ('test', 'tinder', 'second')])
+        self.assertIs(session.get_scraper(), session.get_scraper())
+
+    def test_credentials_are_kept_per_account(self):
+        self.assertIsNone(self.pool.credentials_file('default', 'tinder', 'default'))
+        self.assertEqual(self.pool.credentials_file('test', 'tinder', 'me/work'),
+                         os.path.join(self.temp_dir, 'test', 'tinder_me_work_credentials.json'))
+
+    def test_idle_sessions_are_evicted(self):
+        idle = self.pool.get('test', 'tinder')
+        active = self.pool.get('test', 'hinge')
+        self.make_idle(idle)
+
+        self.assertEqual(self.pool.evict_idle(), 1)
+        self.assertEqual(self.pool.accounts(), [('test', 'hinge', 'default')])
+        self.assertNotIn(idle.name, self.refresher.authenticators)
+        self.assertIn(active.name, self.refresher.authenticators)
+
+        # An evicted account is recreated on next use
+        self.assertIsNot(self.pool.get('test', 'tinder'), idle)
+
+    def test_pinned_sessions_are_not_evicted(self):
+        session = self.pool.get('test', 'tinder')
+        session.pin()
+        self.make_idle(session)
+        self.assertEqual(self.pool.evict_idle(), 0)
+
+        # Unpinning counts as use, so the session is only evicted after another idle timeout
+        session.unpin()
+        self.assertEqual(self.pool.evict_idle(), 0)
+        self.make_idle(session)
+        self.assertEqual(self.pool.evict_idle(), 1)
+
+    def test_background_sweep_evicts_idle_sessions(self):
+        self.pool.idle_timeout = 0.05
+        self.pool.sweep_interval = 0.02
+        self.pool.get('test', 'tinder')
+
+        deadline = time.monotonic() + 5
+        while self.pool.accounts():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+if __name__ == '__main__':
+    unittest.main()
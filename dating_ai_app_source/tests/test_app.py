@@ -0,0 +1,101 @@
+"""
+Tests for notifications and background reply drafts of the application against the mock platform server.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.app import DatingAppAIAssistant
+from src.notification_system import NotificationSystem
+from src.platform import retry
+from src.platform.mock_server import MockPlatformConfig, MockPlatformServer, point_platforms_at
+
+class TestNewMessageHandling(unittest.TestCase):
+    """Tests for handling match messages committed to storage."""
+
+    def setUp(self):
+        retry._breakers.clear()
+        self.server = MockPlatformServer(MockPlatformConfig(matches=5, messages_per_conversation=2))
+        point_platforms_at(self.server.start())
+        self.temp_dir = tempfile.mkdtemp()
+
+        # Keep credentials and configuration out of the real home directory
+        environ = {'HOME': self.temp_dir, 'DATING_AI_LLM_PROVIDER': 'fake'}
+        self.env_patch = mock.patch.dict(os.environ, environ)
+        self.env_patch.start()
+        config_path = os.path.join(self.temp_dir, 'notification_config.json')
+        with mock.patch('src.app.NotificationSystem', lambda: NotificationSystem(config_path)):
+            self.app = DatingAppAIAssistant(storage_path=os.path.join(self.temp_dir, 'test.db'))
+        self.assertTrue(self.app.authenticate('tinder', token='test-token'))
+        self.storage = self.app.assistant.storage
+
+    def tearDown(self):
+        self.app.close()
+        self.env_patch.stop()
+        self.server.stop()
+        shutil.rmtree(self.temp_dir)
+        retry._breakers.clear()
+
+    def wait_for_draft(self, conversation_id, timeout=5.0):
+        """Wait for the background reply draft of a conversation."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            draft = self.app.conversation_manager.get_reply_draft(conversation_id)
+            if draft:
+                return draft
+            time.sleep(0.05)
+        return None
+
+    def test_first_sync_is_not_notified(self):
+        summary = self.app.sync_delta('tinder')
+        self.assertGreater(summary['messages'], 0)
+        notifications = self.app.notification_system.get_notification_history()
+        self.assertEqual([n for n in notifications if n['type'] == 'new_message'], [])
+
+    def test_new_message_is_notified_and_drafted(self):
+        self.app.sync_delta('tinder')
+        self.server.state.add_incoming_message('tinder', 1, "What's your favorite hike around here?")
+        self.app.sync_delta('tinder')
+
+        conversation_id = self.storage.resolve_conversation_id('tm000001')
+        self.assertTrue(conversation_id.startswith('conv_'))
+        notifications = [n for n in self.app.notification_system.get_notification_history()
+                         if n['type'] == 'new_message']
+        self.assertEqual([n['conversation_id'] for n in notifications], [conversation_id])
+
+        draft = self.wait_for_draft(conversation_id)
+        self.assertIsNotNone(draft)
+        self.assertEqual(draft['reply_to'], self.storage.get_latest_message_id(conversation_id))
+
+    def new_message_notifications(self):
+        """Get the new message notifications sent so far."""
+        return [n for n in self.app.notification_system.get_notification_history() if n['type'] == 'new_message']
+
+    def test_fetched_history_is_not_drafted(self):
+        dating_app = self.app.assistant.dating_app
+        with mock.patch.object(self.app.conversation_manager, 'draft_reply') as draft_reply:
+            dating_app.get_conversations('tinder', limit=5)
+            self.assertGreater(len(dating_app.get_conversation_messages('tinder', 'tm000002')), 0)
+            dating_app.get_conversation_messages('tinder', 'tm000003')
+        draft_reply.assert_not_called()
+        self.assertEqual(self.new_message_notifications(), [])
+
+    def test_newer_fetched_message_is_drafted(self):
+        dating_app = self.app.assistant.dating_app
+        dating_app.get_conversations('tinder', limit=5)
+        dating_app.get_conversation_messages('tinder', 'tm000002')
+        self.server.state.add_incoming_message('tinder', 2, "Any plans for the weekend?")
+        # Drop the matches payload so the scraper does not reuse its earlier message fetch
+        dating_app._scraper('tinder')._matches_payload = None
+
+        with mock.patch.object(self.app.conversation_manager, 'draft_reply') as draft_reply:
+            dating_app.get_conversation_messages('tinder', 'tm000002')
+        self.assertEqual(draft_reply.call_count, 1)
+        self.assertEqual(len(self.new_message_notifications()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+Tests for local ranking of alternative generated messages.
+"""
+
+import unittest
+
+from src.candidate_ranker import CandidateRanker
+
+PROFILE = {'name': 'Alex', 'interests': ['Climbing', 'Pottery']}
+
+class TestCandidateRanker(unittest.TestCase):
+    """Tests for CandidateRanker.rank."""
+
+    def setUp(self):
+        self.ranker = CandidateRanker()
+
+    def test_empty_and_duplicate_candidates_are_dropped(self):
+        ranked = self.ranker.rank(['How was the climbing gym?', '', None, '  how was the Climbing gym  ?  '],
+                                  PROFILE)
+        self.assertEqual(ranked, ['How was the climbing gym?'])
+
+    def test_personal_question_beats_generic_opener(self):
+        generic = "Hey, how are you?"
+        personal = "Alex, I saw you're into pottery. What was the first thing you made?"
+        self.assertEqual(self.ranker.rank([generic, personal], PROFILE), [personal, generic])
+
+    def test_reply_to_last_message_is_preferred(self):
+        last_message = "I just got back from a climbing trip in Yosemite!"
+        unrelated = "That's cool. What kind of music do you listen to?"
+        related = "Yosemite sounds amazing! Which route was your favorite?"
+        self.assertEqual(self.ranker.rank([unrelated, related], PROFILE, last_message)[0], related)
+
+    def test_formatting_leftovers_are_penalized(self):
+        clean = "What got you into pottery, Alex? I have always wanted to try it."
+        leftover = f"Message: {clean}"
+        self.assertGreater(self.ranker.score(clean, PROFILE), self.ranker.score(leftover, PROFILE))
+
+    def test_equal_scores_keep_model_order(self):
+        candidates = ["What got you into pottery?", "What got you into climbing?"]
+        self.assertEqual(self.ranker.rank(candidates, PROFILE), candidates)
+
+if __name__ == '__main__':
+    unittest.main()
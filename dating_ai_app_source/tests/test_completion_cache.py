@@ -0,0 +1,79 @@
+"""
+Tests for the two-tier LLM completion cache.
+"""
+
+import shutil
+import tempfile
+import time
+import unittest
+
+from src.completion_cache import CompletionCache
+from src.llm_provider import FakeLLMProvider
+from src.llm_scheduler import LLMScheduler
+from src.message_generator import MessageGenerator
+from src.storage import DataStorage
+
+MESSAGES = [{'role': 'system', 'content': 'You write dating app openers.'},
+            {'role': 'user', 'content': 'Profile:\n    Name: Alex\n    Bio: Coffee enthusiast'}]
+
+class TestCompletionCache(unittest.TestCase):
+    """Tests for CompletionCache keys, tiers and eviction."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = DataStorage(f"{self.temp_dir}/test.db")
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_key_ignores_prompt_indentation(self):
+        indented = [dict(message, content=f"  {message['content']}\n") for message in MESSAGES]
+        indented[1]['content'] = 'Profile:\nName: Alex\n        Bio: Coffee enthusiast'
+        key = CompletionCache.make_key('gpt-4', MESSAGES, temperature=0.7)
+
+        self.assertEqual(CompletionCache.make_key('gpt-4', indented, temperature=0.7), key)
+        self.assertNotEqual(CompletionCache.make_key('gpt-4', MESSAGES, temperature=0.9), key)
+        self.assertNotEqual(CompletionCache.make_key('gpt-4o-mini', MESSAGES, temperature=0.7), key)
+
+    def test_memory_tier_evicts_least_recently_used(self):
+        cache = CompletionCache(max_entries=2)
+        cache.put('a', 'gpt-4', 'first')
+        cache.put('b', 'gpt-4', 'second')
+        self.assertEqual(cache.get('a'), 'first')
+
+        cache.put('c', 'gpt-4', 'third')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), ('first', 'third'))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_expired_completion_is_not_reused(self):
+        cache = CompletionCache(ttl=0.05)
+        cache.put('a', 'gpt-4', 'first')
+        self.assertEqual(cache.get('a'), 'first')
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_disk_tier_survives_restart(self):
+        CompletionCache(self.storage).put('a', 'gpt-4', 'first')
+
+        cache = CompletionCache(self.storage)
+        self.assertEqual(cache.get('a'), 'first')
+        cache.clear()
+        self.assertIsNone(CompletionCache(self.storage).get('a'))
+
+    def test_generator_reuses_identical_request(self):
+        llm = FakeLLMProvider(seed=1)
+        scheduler = LLMScheduler(requests_per_second=1000, request_burst=1000, tokens_per_minute=0)
+        generator = MessageGenerator(storage=self.storage, llm=llm, scheduler=scheduler)
+
+        completion = generator._complete(MESSAGES)
+        self.assertEqual(generator._complete(MESSAGES), completion)
+        self.assertEqual(llm.requests, 1)
+
+        # Bypassing the cache sends the request again
+        generator._complete(MESSAGES, use_cache=False)
+        self.assertEqual(llm.requests, 2)
+
+if __name__ == '__main__':
+    unittest.main()
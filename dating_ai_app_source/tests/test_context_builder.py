@@ -0,0 +1,82 @@
+"""
+Tests for token-budgeted conversation context and rolling summaries.
+"""
+
+import shutil
+import tempfile
+import unittest
+
+from src.context_builder import ContextBuilder
+from src.storage import DataStorage
+
+class TestContextBuilder(unittest.TestCase):
+    """Tests for ContextBuilder.build."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = DataStorage(f"{self.temp_dir}/test.db")
+        self.storage.save_conversation({'id': 'conv_1', 'platform': 'tinder', 'platform_id': 'tm1'})
+        self.batches = []
+        self.builder = ContextBuilder(self.storage, token_budget=100, summary_tokens=40, summary_batch=3,
+                                      summarize=self.summarize)
+        # Fix the token count so four messages fit the history budget
+        self.builder.count_tokens = lambda text: 11
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+
+    def summarize(self, summary, messages, **kwargs):
+        """Summarize by appending message contents, recording each batch."""
+        self.batches.append([msg['content'] for msg in messages])
+        return ' '.join([summary] + [msg['content'] for msg in messages]).strip()
+
+    def add_messages(self, start, count):
+        """Store alternating synced match messages and locally sent replies."""
+        for i in range(start, start + count):
+            if i % 2:
+                self.storage.save_message({'conversation_id': 'conv_1', 'sender_type': 'user',
+                                           'content': f"m{i}", 'sent_at': f"2024-01-01T00:00:{i:02d}"})
+            else:
+                self.storage.save_message({'conversation_id': 'tm1', 'sender_type': 'match', 'content': f"m{i}",
+                                           'sent_at': f"2024-01-01T00:00:{i:02d}", 'platform_id': f"tm1_m{i}"})
+
+    def history(self):
+        """Get the stored history of the conversation, newest first."""
+        return self.storage.get_conversation_messages('conv_1')
+
+    def test_older_messages_are_summarized(self):
+        self.add_messages(0, 10)
+        context = self.builder.build(self.history(), 'conv_1')
+
+        self.assertEqual([msg['content'] for msg in context['messages']], ['m6', 'm7', 'm8', 'm9'])
+        self.assertEqual(context['summary'], 'm0 m1 m2 m3 m4 m5')
+        self.assertEqual(self.batches, [['m0', 'm1', 'm2'], ['m3', 'm4', 'm5']])
+
+    def test_summary_is_extended_with_new_messages_only(self):
+        self.add_messages(0, 10)
+        self.builder.build(self.history(), 'conv_1')
+        self.batches.clear()
+
+        self.add_messages(10, 2)
+        context = self.builder.build(self.history(), 'conv_1')
+        self.assertEqual(self.batches, [['m6', 'm7']])
+        self.assertEqual(context['summary'], 'm0 m1 m2 m3 m4 m5 m6 m7')
+        self.assertEqual([msg['content'] for msg in context['messages']], ['m8', 'm9', 'm10', 'm11'])
+
+    def test_summary_is_keyed_by_local_conversation_id(self):
+        self.add_messages(0, 10)
+        # The oldest message in the window carries the platform conversation ID
+        self.builder.build(self.history()[:8], 'conv_1')
+
+        self.assertEqual(self.storage.get_conversation_summary('conv_1')['summary'], 'm0 m1 m2 m3 m4 m5')
+        self.assertIsNone(self.storage.get_conversation_summary('tm1'))
+
+    def test_summary_is_not_used_without_conversation_id(self):
+        self.add_messages(0, 10)
+        context = self.builder.build(self.history())
+        self.assertEqual(context['summary'], '')
+        self.assertEqual(self.batches, [])
+
+if __name__ == '__main__':
+    unittest.main()
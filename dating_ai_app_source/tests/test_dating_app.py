@@ -0,0 +1,128 @@
+"""
+Tests for match storage and the account identity cache of the dating app assistant against the mock platform server.
+"""
+
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.dating_app import DatingAppAI
+from src.platform import retry
+from src.platform.account_pool import AccountPool
+from src.platform.mock_server import MockPlatformConfig, MockPlatformServer, point_platforms_at
+from src.platform.scraper import ScrapingError
+
+class TestMatchStorage(unittest.TestCase):
+    """Tests for storing, prefetching and renormalizing matches."""
+
+    def setUp(self):
+        retry._breakers.clear()
+        self.server = MockPlatformServer(MockPlatformConfig(matches=5, messages_per_conversation=2))
+        point_platforms_at(self.server.start())
+        self.temp_dir = tempfile.mkdtemp()
+
+        self.pool = AccountPool(credentials_dir=self.temp_dir)
+        self.app = DatingAppAI(storage_path=f"{self.temp_dir}/test.db", user='test', account_pool=self.pool)
+        self.assertTrue(self.app.authenticate_platform('tinder', token='test-token'))
+
+    def tearDown(self):
+        self.app.close()
+        self.pool.close()
+        self.server.stop()
+        shutil.rmtree(self.temp_dir)
+        retry._breakers.clear()
+
+    def stored_matches(self):
+        """Get the stored matches keyed by platform ID."""
+        cursor = self.app.storage.conn.cursor()
+        cursor.execute("SELECT id FROM matches")
+        matches = [self.app.storage.get_match(row[0]) for row in cursor.fetchall()]
+        return {match['platform_id']: match for match in matches}
+
+    def prefetch_all(self):
+        """Fetch and store the full profile of every stored match, as the prefetcher does."""
+        for platform_id in self.stored_matches():
+            profile = self.app._fetch_match_profile('tinder', platform_id)
+            self.app._store_match_profile('tinder', platform_id, profile)
+
+    def test_list_sync_keeps_prefetched_profiles(self):
+        self.app.get_matches('tinder', limit=5)
+        self.prefetch_all()
+        prefetched = self.stored_matches()
+
+        self.app.get_matches('tinder', limit=5)
+        for platform_id, match in self.stored_matches().items():
+            self.assertTrue(match['name'])
+            for field in ('name', 'bio', 'interests', 'photos'):
+                self.assertEqual(match[field], prefetched[platform_id][field])
+
+    def test_profiles_archived_apart_from_list_records(self):
+        self.app.get_matches('tinder', limit=5)
+        self.prefetch_all()
+        self.app.get_matches('tinder', limit=5)
+
+        payloads = list(self.app.storage.iter_raw_payloads('tinder'))
+        self.assertEqual(len(payloads), 10)
+        # The full profile of each match follows its list record
+        for list_record, profile in zip(payloads[::2], payloads[1::2]):
+            self.assertEqual(list_record[1], profile[1])
+            self.assertIn('person', list_record[3])
+            self.assertIn('bio', profile[3])
+
+    def test_renormalize_keeps_archived_match_ids(self):
+        self.app.get_matches('tinder', limit=5)
+        self.prefetch_all()
+
+        self.assertEqual(self.app.renormalize('tinder'), 0)
+        self.assertEqual(sorted(self.stored_matches()), [f"tm{i:06d}" for i in range(5)])
+
+class TestAccountIdentity(unittest.TestCase):
+    """Tests for the cached profile and ID of the authenticated account."""
+
+    def setUp(self):
+        retry._breakers.clear()
+        self.server = MockPlatformServer(MockPlatformConfig(matches=3, messages_per_conversation=4))
+        point_platforms_at(self.server.start())
+        self.temp_dir = tempfile.mkdtemp()
+
+        self.pool = AccountPool(credentials_dir=self.temp_dir)
+        self.app = DatingAppAI(storage_path=f"{self.temp_dir}/test.db", user='test', account_pool=self.pool,
+                               identity_ttl=60)
+        self.assertTrue(self.app.authenticate_platform('tinder', token='test-token'))
+        scraper = self.app._scraper('tinder')
+        patcher = mock.patch.object(scraper, 'get_user_profile', wraps=scraper.get_user_profile)
+        self.get_user_profile = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.app.close()
+        self.pool.close()
+        self.server.stop()
+        shutil.rmtree(self.temp_dir)
+        retry._breakers.clear()
+
+    def test_identity_is_fetched_at_authentication(self):
+        self.assertEqual(self.app.get_user_id('tinder'), self.server.state.tinder_user_id)
+        self.assertEqual(self.app.get_user_profile('tinder')['_id'], self.server.state.tinder_user_id)
+
+        match_id = self.app.get_matches('tinder', limit=3)[0]['platform_id']
+        self.assertTrue(self.app.get_conversation_messages('tinder', match_id))
+        # Every synced message was classified against the cached user ID
+        stored = self.app.storage.get_conversation_messages(match_id)
+        self.assertEqual({msg['sender_type'] for msg in stored}, {'user', 'match'})
+        self.get_user_profile.assert_not_called()
+
+    def test_identity_is_refetched_after_ttl(self):
+        self.app._account('tinder').identity['fetched_at'] -= 60
+        self.app.get_user_id('tinder')
+        self.app.get_user_id('tinder')
+        self.assertEqual(self.get_user_profile.call_count, 1)
+
+    def test_stale_identity_is_kept_when_refetch_fails(self):
+        self.app._account('tinder').identity['fetched_at'] -= 60
+        self.get_user_profile.side_effect = ScrapingError("Failed to get user profile: 500")
+        self.assertEqual(self.app.get_user_id('tinder'), self.server.state.tinder_user_id)
+
+if __name__ == '__main__':
+    unittest.main()
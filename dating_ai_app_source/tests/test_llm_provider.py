@@ -0,0 +1,104 @@
+"""
+Tests for LLM provider selection and the offline fake provider.
+"""
+
+import os
+import time
+import unittest
+from unittest import mock
+
+from src.llm_provider import (BaseLLMProvider, FakeLLMProvider, LLMError, OpenAIProvider, create_provider,
+                              parse_json_object)
+
+MESSAGES = [{'role': 'user', 'content': 'Write an opener about climbing and pottery.'}]
+
+class EchoProvider(BaseLLMProvider):
+    """Provider implementing only complete, echoing the last message."""
+
+    def __init__(self):
+        super().__init__('echo')
+
+    def complete(self, messages, **params):
+        content = messages[-1]['content']
+        if content == 'fail':
+            raise LLMError("Injected failure")
+        return content
+
+class TestFakeLLMProvider(unittest.TestCase):
+    """Tests for FakeLLMProvider."""
+
+    def test_completions_are_deterministic(self):
+        first, second = FakeLLMProvider(seed=1), FakeLLMProvider(seed=2)
+        self.assertEqual(first.complete(MESSAGES), second.complete(MESSAGES))
+        self.assertNotEqual(first.complete(MESSAGES), first.complete([{'role': 'user', 'content': 'Hello'}]))
+
+        candidates = first.complete_n(MESSAGES, 3)
+        self.assertEqual(len(candidates), 3)
+        self.assertEqual(candidates[0], first.complete(MESSAGES))
+
+    def test_stream_matches_completion(self):
+        llm = FakeLLMProvider(seed=1)
+        self.assertEqual(''.join(llm.stream(MESSAGES)), llm.complete(MESSAGES))
+
+        choices = {}
+        for index, text in llm.stream_n(MESSAGES, 3):
+            choices[index] = choices.get(index, '') + text
+        self.assertEqual([choices[index] for index in range(3)], llm.complete_n(MESSAGES, 3))
+
+    def test_analysis_uses_request_words(self):
+        analysis = FakeLLMProvider(seed=1).complete_json(MESSAGES)
+        self.assertTrue({topic['name'] for topic in analysis['topics']} <= {'write', 'opener', 'about',
+                                                                            'climbing', 'pottery'})
+        self.assertEqual(len(analysis['hooks']), len(analysis['topics']))
+
+    def test_latency_and_failures_are_injected(self):
+        llm = FakeLLMProvider(latency=0.05, seed=1)
+        started = time.monotonic()
+        llm.complete(MESSAGES)
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+        with self.assertRaises(LLMError):
+            llm.complete(MESSAGES, timeout=0.01)
+        with self.assertRaises(LLMError):
+            FakeLLMProvider(failure_rate=1.0, seed=1).complete(MESSAGES)
+        self.assertEqual(llm.requests, 2)
+
+class TestBaseLLMProvider(unittest.TestCase):
+    """Tests for the defaults of BaseLLMProvider."""
+
+    def test_defaults_build_on_complete(self):
+        llm = EchoProvider()
+        self.assertEqual(llm.complete_n(MESSAGES, 3), [MESSAGES[0]['content']])
+        self.assertEqual(list(llm.stream_n(MESSAGES, 3)), [(0, MESSAGES[0]['content'])])
+        self.assertEqual(llm.with_model('other').model, 'other')
+        self.assertEqual(llm.model, 'echo')
+
+    def test_batch_keeps_order_and_marks_failures(self):
+        requests = [[{'role': 'user', 'content': text}] for text in ('one', 'fail', 'three')]
+        self.assertEqual(EchoProvider().complete_batch(requests, max_concurrency=2), ['one', None, 'three'])
+
+    def test_json_is_found_inside_text(self):
+        self.assertEqual(parse_json_object('```json\n{"tone": "friendly"}\n```'), {'tone': 'friendly'})
+        with self.assertRaises(LLMError):
+            parse_json_object('No JSON here')
+        with self.assertRaises(LLMError):
+            parse_json_object('{"tone": }')
+
+class TestCreateProvider(unittest.TestCase):
+    """Tests for create_provider."""
+
+    def test_provider_is_chosen_by_environment(self):
+        environ = {'DATING_AI_LLM_PROVIDER': 'fake', 'DATING_AI_FAKE_LLM_FAILURE_RATE': '0.5'}
+        with mock.patch.dict(os.environ, environ):
+            llm = create_provider()
+            self.assertIsInstance(llm, FakeLLMProvider)
+            self.assertEqual(llm.failure_rate, 0.5)
+            self.assertEqual(create_provider(failure_rate=0.0).failure_rate, 0.0)
+
+    def test_unavailable_provider_is_none(self):
+        with mock.patch.dict(os.environ, {'OPENAI_API_KEY': ''}):
+            self.assertIsNone(create_provider(OpenAIProvider.name))
+        self.assertIsNone(create_provider('unknown'))
+
+if __name__ == '__main__':
+    unittest.main()
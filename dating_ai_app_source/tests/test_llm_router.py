@@ -0,0 +1,78 @@
+"""
+Tests for hedging and deadlines of the LLM router with fake providers.
+"""
+
+import time
+import unittest
+
+from src.llm_provider import FakeLLMProvider, LLMError
+from src.llm_router import LLMRouter, LLMTimeout, Route
+
+MESSAGES = [{'role': 'user', 'content': 'Any hiking recommendations?'}]
+
+class TestLLMRouter(unittest.TestCase):
+    """Tests for LLMRouter request hedging and deadlines."""
+
+    def make_router(self, primary, secondary=None, deadline=None, max_workers=8):
+        """Create a router with a 'reply' route and a fast 'summary' route."""
+        self.fast = FakeLLMProvider('fast', seed=1)
+        router = LLMRouter({'reply': Route(primary, secondary, deadline), 'summary': Route(self.fast)},
+                           default_hedge_delay=0.05, max_workers=max_workers)
+        self.addCleanup(router.close)
+        return router
+
+    def test_slow_primary_is_hedged(self):
+        primary, secondary = FakeLLMProvider('main', latency=1.0, seed=1), FakeLLMProvider('mini', seed=1)
+        router = self.make_router(primary, secondary, deadline=2.0)
+
+        started = time.monotonic()
+        self.assertTrue(router.complete('reply', MESSAGES))
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual((primary.requests, secondary.requests), (1, 1))
+
+    def test_failed_primary_falls_back_to_secondary(self):
+        primary = FakeLLMProvider('main', failure_rate=1.0, seed=1)
+        secondary = FakeLLMProvider('mini', seed=1)
+        router = self.make_router(primary, secondary, deadline=2.0)
+        self.assertEqual(router.complete_n('reply', MESSAGES, 2), secondary.complete_n(MESSAGES, 2))
+
+    def test_every_model_failing_raises(self):
+        router = self.make_router(FakeLLMProvider('main', failure_rate=1.0, seed=1),
+                                  FakeLLMProvider('mini', failure_rate=1.0, seed=1))
+        with self.assertRaises(LLMError):
+            router.complete('reply', MESSAGES)
+
+    def test_missed_deadline_raises_timeout(self):
+        router = self.make_router(FakeLLMProvider('main', latency=2.0, seed=1),
+                                  FakeLLMProvider('mini', latency=2.0, seed=1), deadline=0.2)
+        started = time.monotonic()
+        with self.assertRaises(LLMTimeout):
+            router.complete('reply', MESSAGES)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_abandoned_requests_end_at_deadline(self):
+        router = self.make_router(FakeLLMProvider('main', latency=5.0, seed=1),
+                                  FakeLLMProvider('mini', latency=5.0, seed=1), deadline=0.2, max_workers=2)
+        with self.assertRaises(LLMTimeout):
+            router.complete('reply', MESSAGES)
+
+        # Both workers were taken by the abandoned requests, which time out with the deadline
+        started = time.monotonic()
+        self.assertTrue(router.complete('summary', MESSAGES))
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_deadline_counts_from_queueing(self):
+        primary = FakeLLMProvider('main', latency=0.3, seed=1)
+        router = self.make_router(primary, deadline=0.5)
+
+        self.assertTrue(router.complete('reply', MESSAGES, started_at=time.monotonic() - 0.1))
+        with self.assertRaises(LLMTimeout):
+            router.complete('reply', MESSAGES, started_at=time.monotonic() - 0.4)
+
+        # A request queued past its deadline is never sent
+        with self.assertRaises(LLMTimeout):
+            router.complete('reply', MESSAGES, started_at=time.monotonic() - 1.0)
+        self.assertEqual(primary.requests, 2)
+
+if __name__ == '__main__':
+    unittest.main()
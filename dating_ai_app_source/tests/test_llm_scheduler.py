@@ -0,0 +1,102 @@
+"""
+Tests for priority admission and budget reserves of the LLM scheduler.
+"""
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src import llm_scheduler
+from src.llm_scheduler import LLMScheduler, get_llm_scheduler, BATCH, INTERACTIVE, SPECULATIVE
+
+class TestLLMScheduler(unittest.TestCase):
+    """Tests for LLMScheduler admission."""
+
+    def start(self, scheduler, priority, func=None):
+        """Run a job in a background thread."""
+        thread = threading.Thread(target=scheduler.run, args=(priority, func or (lambda: None)), daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        return thread
+
+    def wait_for(self, condition):
+        """Wait until a condition over the scheduler holds."""
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def queued(self, scheduler, priority):
+        """Get the number of queued jobs in a priority class."""
+        return scheduler.metrics()['classes'][priority]['queued']
+
+    def test_interactive_jobs_are_admitted_first(self):
+        scheduler = LLMScheduler(max_concurrency=1, requests_per_second=1000, request_burst=1000,
+                                 tokens_per_minute=0)
+        release = threading.Event()
+        order = []
+
+        self.start(scheduler, INTERACTIVE, release.wait)
+        self.wait_for(lambda: scheduler.metrics()['running'] == 1)
+        # Queue in reverse priority order while the only slot is taken
+        for priority in (BATCH, SPECULATIVE, INTERACTIVE):
+            self.start(scheduler, priority, lambda priority=priority: order.append(priority))
+            self.wait_for(lambda priority=priority: self.queued(scheduler, priority) == 1)
+
+        release.set()
+        self.wait_for(lambda: len(order) == 3)
+        self.assertEqual(order, [INTERACTIVE, SPECULATIVE, BATCH])
+
+    def test_class_limits_cap_running_jobs(self):
+        scheduler = LLMScheduler(class_limits={BATCH: 1}, requests_per_second=1000, request_burst=1000,
+                                 tokens_per_minute=0)
+        release = threading.Event()
+
+        self.start(scheduler, BATCH, release.wait)
+        self.start(scheduler, BATCH)
+        self.wait_for(lambda: self.queued(scheduler, BATCH) == 1)
+        self.assertEqual(scheduler.metrics()['classes'][BATCH]['running'], 1)
+
+        # Other classes are not held back by the full batch class
+        self.assertEqual(scheduler.run(SPECULATIVE, lambda: 'done'), 'done')
+        release.set()
+        self.wait_for(lambda: scheduler.metrics()['classes'][BATCH]['completed'] == 2)
+
+    def test_background_jobs_leave_budget_reserve(self):
+        scheduler = LLMScheduler(requests_per_second=2, request_burst=5, tokens_per_minute=0, budget_reserve=0.4)
+        for _ in range(3):
+            scheduler.run(BATCH, lambda: None)
+
+        # The reserved two requests are left to interactive work
+        self.start(scheduler, BATCH)
+        self.wait_for(lambda: self.queued(scheduler, BATCH) == 1)
+        started = time.monotonic()
+        scheduler.run(INTERACTIVE, lambda: None)
+        scheduler.run(INTERACTIVE, lambda: None)
+        self.assertLess(time.monotonic() - started, 0.3)
+        self.assertEqual(self.queued(scheduler, BATCH), 1)
+
+class TestSharedScheduler(unittest.TestCase):
+    """Tests for get_llm_scheduler."""
+
+    NAME = 'test_llm'
+
+    def tearDown(self):
+        llm_scheduler._schedulers.pop(self.NAME, None)
+        llm_scheduler._scheduler_settings.pop(self.NAME, None)
+
+    def test_later_callers_share_first_configuration(self):
+        scheduler = get_llm_scheduler(self.NAME, requests_per_second=3.0, request_burst=4)
+
+        with mock.patch.object(llm_scheduler.logger, 'warning') as warning:
+            self.assertIs(get_llm_scheduler(self.NAME, requests_per_second=3.0), scheduler)
+            self.assertIs(get_llm_scheduler(self.NAME), scheduler)
+            warning.assert_not_called()
+
+            self.assertIs(get_llm_scheduler(self.NAME, requests_per_second=10.0), scheduler)
+            warning.assert_called_once()
+        self.assertEqual(scheduler.requests_per_second, 3.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Tests for batches of initial messages, streamed messages and cached profile analyses of the message generator.
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.llm_provider import FakeLLMProvider, LLMError
+from src.llm_scheduler import LLMScheduler, BATCH, SPECULATIVE
+from src.message_generator import MessageGenerator, ProfileAnalyzer
+from src.storage import DataStorage
+
+def make_profile(index):
+    """Build normalized profile data."""
+    return {'id': f"tinder_tm{index:06d}", 'name': f"Alex {index}", 'age': 29,
+            'bio': 'Coffee enthusiast and weekend hiker.', 'interests': ['Hiking', 'Coffee']}
+
+class TestInitialMessageBatch(unittest.TestCase):
+    """Tests for MessageGenerator.generate_initial_messages."""
+
+    def setUp(self):
+        self.scheduler = LLMScheduler(requests_per_second=1000, request_burst=1000, tokens_per_minute=0)
+        self.generator = MessageGenerator(llm=FakeLLMProvider(seed=1), scheduler=self.scheduler)
+
+    def completed(self, priority):
+        """Get the number of LLM jobs completed in a priority class."""
+        return self.scheduler.metrics()['classes'][priority]['completed']
+
+    def test_batch_runs_in_requested_class(self):
+        messages = list(self.generator.generate_initial_messages(
+            [make_profile(i) for i in range(3)], priority=SPECULATIVE
+        ))
+        self.assertEqual(sorted(m['match_id'] for m in messages), [make_profile(i)['id'] for i in range(3)])
+        self.assertGreater(self.completed(SPECULATIVE), 0)
+        self.assertEqual(self.completed(BATCH), 0)
+
+    def test_failed_profile_yields_error(self):
+        def generate(profile, use_cache, priority):
+            if profile['id'] == make_profile(1)['id']:
+                raise ValueError("analysis failed")
+            return {'match_id': profile['id'], 'content': 'Hi!'}
+
+        with mock.patch.object(self.generator, 'generate_initial_message', side_effect=generate):
+            messages = list(self.generator.generate_initial_messages([make_profile(i) for i in range(3)]))
+        failed = [m for m in messages if 'error' in m]
+        self.assertEqual(failed, [{'match_id': make_profile(1)['id'], 'error': 'analysis failed'}])
+        self.assertEqual(len(messages), 3)
+
+    def test_closing_stream_cancels_queued_profiles(self):
+        started = []
+        lock = threading.Lock()
+
+        def generate(profile, use_cache, priority):
+            with lock:
+                started.append(profile['id'])
+            time.sleep(0.05)
+            return {'match_id': profile['id'], 'content': 'Hi!'}
+
+        with mock.patch.object(self.generator, 'generate_initial_message', side_effect=generate):
+            messages = self.generator.generate_initial_messages([make_profile(i) for i in range(10)],
+                                                                max_concurrency=1)
+            next(messages)
+            messages.close()
+        self.assertLess(len(started), 10)
+
+class BrokenStreamProvider(FakeLLMProvider):
+    """Fake provider whose streams fail after their first few pieces of text."""
+
+    def stream_n(self, messages, n, **params):
+        for count, item in enumerate(super().stream_n(messages, n, **params)):
+            if count == 4:
+                raise LLMError("Connection reset")
+            yield item
+
+class TestStreamedMessages(unittest.TestCase):
+    """Tests for the streamed message events of MessageGenerator."""
+
+    def make_generator(self, llm):
+        """Create a generator with its own scheduler."""
+        scheduler = LLMScheduler(requests_per_second=1000, request_burst=1000, tokens_per_minute=0)
+        return MessageGenerator(llm=llm, scheduler=scheduler)
+
+    def test_text_streams_before_completion(self):
+        generator = self.make_generator(FakeLLMProvider(seed=1, tokens_per_second=50))
+        started = time.monotonic()
+        events = generator.stream_initial_message(make_profile(1))
+
+        first = next(events)
+        first_at = time.monotonic() - started
+        events = [first] + list(events)
+        deltas = [event['text'] for event in events if event['type'] == 'delta']
+        self.assertGreater(len(deltas), 1)
+        self.assertLess(first_at, (time.monotonic() - started) / 2)
+
+        done = events[-1]
+        self.assertEqual(done['type'], 'done')
+        self.assertEqual(''.join(deltas), done['message']['content'])
+        self.assertEqual(len(done['message']['alternatives']), 2)
+
+    def test_cached_message_is_sent_whole(self):
+        generator = self.make_generator(FakeLLMProvider(seed=1))
+        content = list(generator.stream_initial_message(make_profile(1)))[-1]['message']['content']
+
+        events = list(generator.stream_initial_message(make_profile(1)))
+        self.assertEqual([event['type'] for event in events], ['delta', 'done'])
+        self.assertEqual(events[0]['text'], content)
+
+    def test_failed_stream_resets_to_template(self):
+        generator = self.make_generator(BrokenStreamProvider(seed=1))
+        events = list(generator.stream_initial_message(make_profile(1)))
+
+        types = [event['type'] for event in events]
+        reset = types.index('reset')
+        self.assertEqual(set(types[:reset]), {'delta'})
+        self.assertEqual(types[reset + 1:], ['delta', 'done'])
+        self.assertEqual(events[-2]['text'], events[-1]['message']['content'])
+
+    def test_candidates_come_from_one_request(self):
+        llm = FakeLLMProvider(seed=1)
+        generator = self.make_generator(llm)
+        message = generator._generate_with_llm(make_profile(1), {'topics': [], 'hooks': []})
+
+        self.assertEqual(llm.requests, 1)
+        self.assertEqual(len(message['alternatives']), 2)
+        candidates = [message['content']] + message['alternatives']
+        self.assertEqual(generator.ranker.rank(candidates, make_profile(1)), candidates)
+
+        # The alternatives are cached with the message
+        self.assertEqual(generator._generate_with_llm(make_profile(1), {'topics': [], 'hooks': []}), message)
+        self.assertEqual(llm.requests, 1)
+
+    def test_response_without_history_uses_template(self):
+        generator = self.make_generator(FakeLLMProvider(seed=1))
+        events = list(generator.stream_response([], make_profile(1)))
+        self.assertEqual([event['type'] for event in events], ['delta', 'done'])
+        self.assertEqual(generator.llm.requests, 0)
+
+class TestProfileAnalysisCache(unittest.TestCase):
+    """Tests for cached analyses of ProfileAnalyzer."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = DataStorage(f"{self.temp_dir}/test.db")
+        self.llm = FakeLLMProvider(seed=1)
+        self.analyzer = ProfileAnalyzer(self.storage, llm=self.llm)
+        self.profile = dict(make_profile(1), platform='tinder', platform_id='tm000001')
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_unchanged_profile_reuses_analysis(self):
+        analysis = self.analyzer.analyze_profile(self.profile)
+        self.assertEqual(self.analyzer.analyze_profile(dict(self.profile, age=30)), analysis)
+        self.assertEqual(self.llm.requests, 1)
+
+        self.analyzer.analyze_profile(dict(self.profile, bio='Marathon runner.'))
+        self.assertEqual(self.llm.requests, 2)
+
+    def test_changed_profile_drops_stored_analyses(self):
+        self.storage.save_match(self.profile)
+        self.analyzer.analyze_profile(self.profile)
+        key = self.analyzer.cache_key(self.profile)
+        self.assertIsNotNone(self.storage.get_profile_analysis(key))
+
+        self.storage.save_match(dict(self.profile, bio='Marathon runner.'))
+        self.assertIsNone(self.storage.get_profile_analysis(key))
+
+    def test_fallback_analysis_is_not_cached(self):
+        self.llm.failure_rate = 1.0
+        self.assertTrue(self.analyzer.analyze_profile(self.profile)['topics'])
+        self.assertEqual(self.llm.requests, 1)
+
+        self.llm.failure_rate = 0.0
+        self.analyzer.analyze_profile(self.profile)
+        self.analyzer.analyze_profile(self.profile)
+        self.assertEqual(self.llm.requests, 2)
+
+if __name__ == '__main__':
+    unittest.main()
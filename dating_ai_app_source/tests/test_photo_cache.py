@@ -0,0 +1,108 @@
+"""
+Tests for the content-addressed photo cache.
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from src import photo_cache
+from src.photo_cache import PhotoCache
+
+class FakePhotoResponse:
+    """Downloaded photo response."""
+
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {'Content-Type': 'image/png; charset=binary'}
+
+class TestPhotoCache(unittest.TestCase):
+    """Tests for PhotoCache downloads, sharing and eviction."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.photos = {f"https://images.example.com/{name}.png": name.encode('utf-8') * 100
+                       for name in ('a', 'b', 'c')}
+        self.requested = []
+        self.cache = PhotoCache(self.temp_dir, max_bytes=1000)
+        self.cache.http.get = self.get
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+    def get(self, url, timeout):
+        """Answer a download from the test photos, recording its URL."""
+        self.requested.append(url)
+        if url not in self.photos:
+            return FakePhotoResponse(b'', status_code=404)
+        return FakePhotoResponse(self.photos[url])
+
+    def url(self, name):
+        """Get the URL of a test photo."""
+        return f"https://images.example.com/{name}.png"
+
+    def test_cached_photo_is_served_from_disk(self):
+        digest = self.cache.fetch(self.url('a'))
+        self.assertEqual(self.cache.fetch(self.url('a')), digest)
+        self.assertEqual(self.requested, [self.url('a')])
+
+        path, content_type = self.cache.open(digest)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), self.photos[self.url('a')])
+        self.assertEqual(content_type, 'image/png')
+        self.assertIsNotNone(self.cache.open(digest, thumbnail=True))
+
+    def test_identical_photos_share_one_file(self):
+        self.photos[self.url('copy')] = self.photos[self.url('a')]
+        digest = self.cache.fetch(self.url('a'))
+        self.assertEqual(self.cache.fetch(self.url('copy')), digest)
+        self.assertEqual(self.cache.total_size(), 2 * len(self.photos[self.url('a')]))
+
+    def test_failed_download_is_not_cached(self):
+        self.assertIsNone(self.cache.fetch(self.url('missing')))
+        self.assertIsNone(self.cache.digest_for(self.url('missing')))
+
+    def test_least_recently_used_photo_is_evicted(self):
+        # Each photo and its thumbnail take 200 bytes, so only two fit
+        self.cache.max_bytes = 400
+        first = self.cache.fetch(self.url('a'))
+        second = self.cache.fetch(self.url('b'))
+        self.cache.open(first)
+
+        self.cache.fetch(self.url('c'))
+        self.assertIsNone(self.cache.open(second))
+        self.assertIsNone(self.cache.digest_for(self.url('b')))
+        self.assertFalse(os.path.exists(self.cache._path(second)))
+        self.assertIsNotNone(self.cache.open(first))
+        self.assertLessEqual(self.cache.total_size(), 400)
+
+    def test_prefetch_skips_cached_photos(self):
+        self.cache.fetch(self.url('a'))
+        self.assertEqual(self.cache.prefetch([self.url('a'), self.url('b'), '']), 1)
+        self.cache.executor.shutdown(wait=True)
+        self.assertIsNotNone(self.cache.digest_for(self.url('b')))
+
+    @unittest.skipIf(photo_cache.Image is None, "Pillow not installed")
+    def test_thumbnail_fits_thumbnail_size(self):
+        image = photo_cache.Image.new('RGB', (1200, 800), 'white')
+        output = io.BytesIO()
+        image.save(output, format='PNG')
+        self.photos[self.url('large')] = output.getvalue()
+
+        digest = self.cache.fetch(self.url('large'))
+        path, content_type = self.cache.open(digest, thumbnail=True)
+        self.assertEqual(content_type, 'image/jpeg')
+        with photo_cache.Image.open(path) as thumbnail:
+            self.assertEqual(thumbnail.size, (320, 213))
+
+    def test_photo_urls_accepts_stored_forms(self):
+        self.assertEqual(PhotoCache.photo_urls('https://a, https://b,'), ['https://a', 'https://b'])
+        self.assertEqual(PhotoCache.photo_urls([{'url': 'https://a'}, 'https://b']), ['https://a', 'https://b'])
+        self.assertEqual(PhotoCache.photo_urls(None), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Tests for real-time message ingestion against the mock platform server.
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from src.dating_app import DatingAppAI
+from src.platform import retry
+from src.platform.account_pool import AccountPool
+from src.platform.mock_server import MockPlatformConfig, MockPlatformServer, point_platforms_at
+from src.platform.realtime import MessageStreamListener
+from src.platform.websocket import WebSocketClosed
+
+def wait_for(test, condition, timeout=5.0):
+    """Wait until a condition holds, failing the test on timeout."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        test.assertLess(time.monotonic(), deadline)
+        time.sleep(0.02)
+
+class TestRealtimeIngestion(unittest.TestCase):
+    """Tests for DatingAppAI.start_realtime."""
+
+    def setUp(self):
+        retry._breakers.clear()
+        self.server = MockPlatformServer(MockPlatformConfig(matches=4, messages_per_conversation=2))
+        point_platforms_at(self.server.start())
+        self.temp_dir = tempfile.mkdtemp()
+
+        self.pool = AccountPool(credentials_dir=self.temp_dir)
+        self.app = DatingAppAI(storage_path=f"{self.temp_dir}/test.db", user='test', account_pool=self.pool)
+        self.assertTrue(self.app.authenticate_platform('tinder', token='test-token'))
+        self.assertTrue(self.app.authenticate_platform(
+            'hinge', phone_number='+15555555555', verification_code='123456'
+        ))
+
+    def tearDown(self):
+        self.app.close()
+        self.pool.close()
+        self.server.stop()
+        shutil.rmtree(self.temp_dir)
+        retry._breakers.clear()
+
+    def stored(self, text):
+        """Count stored messages with the given content."""
+        cursor = self.app.storage.conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM messages WHERE content = ?", (text,))
+        return cursor.fetchone()[0]
+
+    def test_pushed_hinge_message_is_stored(self):
+        self.app.sync_delta('hinge')
+        self.assertTrue(self.app.start_realtime('hinge'))
+        wait_for(self, lambda: self.server.state.stream_subscribers)
+
+        self.server.state.add_incoming_message('hinge', 1, text='Pushed over the stream')
+        wait_for(self, lambda: self.stored('Pushed over the stream'))
+        self.assertEqual(self.stored('Pushed over the stream'), 1)
+
+    def test_tinder_updates_feed_is_polled(self):
+        self.app.sync_delta('tinder')
+        self.assertTrue(self.app.start_realtime('tinder', poll_interval=0.05))
+
+        self.server.state.add_incoming_message('tinder', 2, text='Found by the poller')
+        wait_for(self, lambda: self.stored('Found by the poller'))
+
+    def test_running_worker_pins_account(self):
+        self.assertTrue(self.app.start_realtime('tinder', poll_interval=60))
+        account = self.app._account('tinder')
+        account.last_used = time.monotonic() - self.pool.idle_timeout
+        self.assertEqual(self.pool.evict_idle(), 0)
+
+        self.app.stop_realtime('tinder')
+        self.assertEqual(self.app.realtime_workers, {})
+        account.last_used = time.monotonic() - self.pool.idle_timeout
+        self.assertEqual(self.pool.evict_idle(), 1)
+        self.assertNotIn(account.key, self.pool.accounts())
+
+class FakeConnection:
+    """Message stream connection delivering queued frames, then closing."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.sent = []
+        self.closed = False
+
+    def recv(self, timeout=None):
+        if not self.frames:
+            raise WebSocketClosed("closed by server")
+        return self.frames.pop(0)
+
+    def send_text(self, text):
+        self.sent.append(text)
+
+    def ping(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+class FakeStreamScraper:
+    """Scraper opening fake connections and parsing frames as 'conversation:text'."""
+
+    def __init__(self, connections):
+        self.connections = list(connections)
+        self.opened = []
+
+    def open_message_stream(self):
+        connection = self.connections.pop(0)
+        self.opened.append(connection)
+        return connection
+
+    def parse_stream_event(self, frame):
+        if frame == 'PING':
+            return {'type': 'reply', 'frame': 'PONG'}
+        conversation_id, text = frame.split(':')
+        return {'type': 'message', 'conversation_id': conversation_id, 'message': {'message': text}}
+
+class TestMessageStreamListener(unittest.TestCase):
+    """Tests for MessageStreamListener dispatch and reconnects."""
+
+    def test_reconnects_and_catches_up_after_close(self):
+        scraper = FakeStreamScraper([FakeConnection(['c1:hi', 'PING']), FakeConnection(['c2:hey'])] +
+                                    [FakeConnection([]) for _ in range(5)])
+        received = []
+        connects = []
+        done = threading.Event()
+
+        def on_message(conversation_id, message):
+            received.append((conversation_id, message['message']))
+            if len(received) == 2:
+                done.set()
+
+        listener = MessageStreamListener('test', scraper, on_message, on_connect=lambda: connects.append(1))
+        listener.start()
+        self.addCleanup(listener.stop)
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(received, [('c1', 'hi'), ('c2', 'hey')])
+        self.assertGreaterEqual(len(connects), 2)
+        self.assertEqual(scraper.opened[0].sent, ['PONG'])
+        self.assertTrue(scraper.opened[0].closed)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for the platform retry policy and circuit breakers.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+from src.platform import retry
+from src.platform.retry import CircuitBreaker, RetryPolicy, get_circuit_breaker
+from src.platform.mock_server import MockPlatformConfig, MockPlatformServer, point_platforms_at
+from src.platform.scraper import ScrapingError
+from src.platform.tinder_auth import TinderAuthenticator
+from src.platform.tinder_scraper import TinderProfileScraper
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Tests for circuit breaker state transitions."""
+
+    def setUp(self):
+        self.breaker = CircuitBreaker('test:endpoint', failure_threshold=3, reset_timeout=60.0)
+
+    def open_for_probing(self):
+        """Open the breaker with its reset timeout already elapsed."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.breaker.opened_at = time.monotonic() - self.breaker.reset_timeout
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertGreater(self.breaker.retry_after(), 0)
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_allows_limited_probes(self):
+        self.open_for_probing()
+        self.assertTrue(self.breaker.allow_request())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_half_open_probe_success_closes(self):
+        self.open_for_probing()
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_half_open_probe_failure_reopens(self):
+        self.open_for_probing()
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_release_returns_probe_slot(self):
+        self.open_for_probing()
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.release()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+
+class TestScraperCircuitBreaker(unittest.TestCase):
+    """Tests for circuit breaker bookkeeping of scraper requests against the mock server."""
+
+    def setUp(self):
+        retry._breakers.clear()
+        self.server = MockPlatformServer(MockPlatformConfig(matches=5, messages_per_conversation=2))
+        point_platforms_at(self.server.start())
+        self.temp_dir = tempfile.mkdtemp()
+
+        authenticator = TinderAuthenticator(os.path.join(self.temp_dir, 'tinder.json'))
+        self.assertTrue(authenticator.authenticate(token='test-token'))
+        self.scraper = TinderProfileScraper(authenticator, RetryPolicy(max_attempts=1))
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.temp_dir)
+        retry._breakers.clear()
+
+    def test_rate_limited_probe_releases_slot(self):
+        breaker = get_circuit_breaker('tinder:profile')
+        breaker.state = CircuitBreaker.OPEN
+        breaker.opened_at = time.monotonic() - breaker.reset_timeout
+
+        # Every request is now answered with 429
+        self.server.state.config.rate_limit = 0.001
+        with self.assertRaises(ScrapingError):
+            self.scraper.get_user_profile()
+
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertEqual(breaker.half_open_calls, 0)
+
+        # The endpoint recovers and the next probe closes the breaker
+        self.server.state.config.rate_limit = 0
+        self.assertIn('_id', self.scraper.get_user_profile())
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_server_errors_open_breaker(self):
+        self.server.state.config.error_rate = 1.0
+        breaker = get_circuit_breaker('tinder:profile')
+        for _ in range(breaker.failure_threshold):
+            with self.assertRaises(ScrapingError):
+                self.scraper.get_user_profile()
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(ScrapingError):
+            self.scraper.get_user_profile()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Tests for streamed and coalesced GET requests of the platform scrapers.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from src.platform.scraper import _flights
+from src.platform.tinder_auth import TinderAuthenticator
+from src.platform.tinder_scraper import TinderProfileScraper
+
+class FakeStreamedResponse:
+    """Streamed response that records how much of its body has been read."""
+
+    def __init__(self, items):
+        body = json.dumps({'data': {'matches': items}}).encode('utf-8')
+        self.chunks = [body[i:i + 64] for i in range(0, len(body), 64)]
+        self.status_code = 200
+        self.chunks_read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            self.chunks_read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+class TestStreamedItems(unittest.TestCase):
+    """Tests for BaseProfileScraper._stream_items."""
+
+    URL = 'https://api.example.com/v2/matches'
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.authenticator = TinderAuthenticator(os.path.join(self.temp_dir, 'tinder.json'))
+        self.authenticator.token = 'test-token'
+        self.items = [{'_id': f"tm{i:06d}", 'bio': 'x' * 200} for i in range(50)]
+        self.responses = []
+
+    def tearDown(self):
+        _flights.forget(self.key())
+        shutil.rmtree(self.temp_dir)
+
+    def key(self):
+        """Get the single-flight key of the test request."""
+        return (self.URL, ('data', 'matches'), repr([]), repr([]), 'test-token')
+
+    def send(self, method, url, endpoint, **kwargs):
+        """Answer a request with a new streamed response."""
+        response = FakeStreamedResponse(self.items)
+        self.responses.append(response)
+        return response
+
+    def stream(self, scraper):
+        """Stream the matches of the test request."""
+        return scraper._stream_items(self.URL, 'tinder:matches', ['data', 'matches'], 'matches', send=self.send)
+
+    def test_first_item_arrives_before_body_is_read(self):
+        scraper = TinderProfileScraper(self.authenticator)
+        items = self.stream(scraper)
+
+        self.assertEqual(next(items), self.items[0])
+        response = self.responses[0]
+        self.assertLess(response.chunks_read, len(response.chunks))
+
+        self.assertEqual(list(items), self.items[1:])
+        self.assertTrue(response.closed)
+
+    def test_fetches_are_coalesced_with_ttl(self):
+        scraper = TinderProfileScraper(self.authenticator, coalesce_ttl=60)
+        self.assertEqual(list(self.stream(scraper)), self.items)
+        self.assertEqual(list(self.stream(scraper)), self.items)
+        self.assertEqual(len(self.responses), 1)
+
+        # Without a ttl, the cached result of a shared fetch is still reused
+        self.assertEqual(list(self.stream(TinderProfileScraper(self.authenticator))), self.items)
+        self.assertEqual(len(self.responses), 1)
+
+class TestTinderPayloadCache(unittest.TestCase):
+    """Tests for the shared matches payload and message cache of TinderProfileScraper."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        authenticator = TinderAuthenticator(os.path.join(self.temp_dir, 'tinder.json'))
+        authenticator.token = 'test-token'
+        authenticator.token_expiry = (datetime.now() + timedelta(hours=1)).isoformat()
+        self.scraper = TinderProfileScraper(authenticator, message_cache_size=2)
+        self.matches = [{'_id': f"tm{i}", 'last_activity_date': '2024-01-01T00:00:00Z',
+                         'messages': [{'_id': f"tm{i}_1", 'message': 'Hi!'}]} for i in range(3)]
+        self.fetched = []
+        patcher = mock.patch.object(self.scraper, '_stream_items', side_effect=self.stream_items)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def stream_items(self, url, endpoint, path, label, **kwargs):
+        """Answer a streamed request from the test matches, recording its URL."""
+        self.fetched.append(url)
+        if endpoint == 'matches':
+            return iter(self.matches)
+        match_id = url.split('/')[-2]
+        return iter(next(m['messages'] for m in self.matches if m['_id'] == match_id))
+
+    def messages(self, match_id):
+        """Get a match's messages, returning the number of new fetches."""
+        fetched = len(self.fetched)
+        self.assertTrue(self.scraper.get_conversation_messages(match_id))
+        return len(self.fetched) - fetched
+
+    def test_matches_and_conversations_share_one_fetch(self):
+        self.assertEqual(len(self.scraper.get_matches(10)), 3)
+        conversations = self.scraper.get_conversations(10)
+        self.assertEqual(conversations[0]['last_message'], self.matches[0]['messages'][-1])
+        self.assertEqual(len(self.fetched), 1)
+
+        # The payload is fetched again once the sync window has passed
+        fetched_at, limit, matches = self.scraper._matches_payload
+        self.scraper._matches_payload = (fetched_at - self.scraper.sync_window, limit, matches)
+        self.scraper.get_conversations(10)
+        self.assertEqual(len(self.fetched), 2)
+
+    def test_messages_are_refetched_after_activity(self):
+        self.scraper.get_matches(10)
+        self.assertEqual(self.messages('tm0'), 1)
+        self.assertEqual(self.messages('tm0'), 0)
+
+        self.matches[0] = dict(self.matches[0], last_activity_date='2024-01-02T00:00:00Z')
+        self.scraper.invalidate_matches()
+        self.scraper.get_matches(10)
+        self.assertEqual(self.messages('tm0'), 1)
+
+    def test_message_cache_evicts_least_recently_used(self):
+        self.scraper.get_matches(10)
+        self.messages('tm0')
+        self.messages('tm1')
+        self.assertEqual(self.messages('tm0'), 0)
+
+        # Caching a third conversation evicts tm1, the least recently read
+        self.messages('tm2')
+        self.assertEqual(list(self.scraper._message_cache), ['tm0', 'tm2'])
+        self.assertEqual(self.messages('tm0'), 0)
+        self.assertEqual(self.messages('tm1'), 1)
+
+if __name__ == '__main__':
+    unittest.main()
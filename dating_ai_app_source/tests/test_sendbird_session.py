@@ -0,0 +1,102 @@
+"""
+Tests for the SendBird token lifecycle of Hinge messaging.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from src.platform.hinge_auth import HingeAuthenticator
+from src.platform.sendbird_session import SendBirdSession
+
+class TestSendBirdSession(unittest.TestCase):
+    """Tests for SendBirdSession token caching and refresh."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.credentials_file = os.path.join(self.temp_dir, 'hinge.json')
+        self.fetched = 0
+        self.expires_in = 3600
+        self.fetch_delay = 0.0
+
+    def tearDown(self):
+        # Let background token writes finish before removing their directory
+        for thread in threading.enumerate():
+            if thread.name in ('sendbird-refresh', 'sendbird-persist'):
+                thread.join(5)
+        shutil.rmtree(self.temp_dir)
+
+    def fetch_token(self):
+        """Issue a new numbered token."""
+        time.sleep(self.fetch_delay)
+        self.fetched += 1
+        return f"token-{self.fetched}", self.expires_in
+
+    def make_session(self):
+        """Create a session over the test credentials file."""
+        session = SendBirdSession(HingeAuthenticator(self.credentials_file), self.fetch_token, refresh_margin=300)
+        self.addCleanup(session.close)
+        return session
+
+    def wait_for(self, condition):
+        """Wait until a condition holds."""
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_token_is_fetched_once(self):
+        session = self.make_session()
+        self.assertEqual(session.get_token(), 'token-1')
+        self.assertEqual(session.get_token(), 'token-1')
+        self.assertEqual(self.fetched, 1)
+
+    def test_concurrent_callers_share_a_fetch(self):
+        session = self.make_session()
+        self.fetch_delay = 0.1
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(session.get_token())) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(tokens, ['token-1'] * 5)
+        self.assertEqual(self.fetched, 1)
+
+    def test_token_near_expiry_is_refreshed_in_background(self):
+        session = self.make_session()
+        self.expires_in = 60
+        self.assertEqual(session.get_token(), 'token-1')
+
+        # Inside the refresh margin the current token is still served
+        self.expires_in = 3600
+        self.assertEqual(session.get_token(), 'token-1')
+        self.wait_for(lambda: session.token == 'token-2')
+        self.assertEqual(session.get_token(), 'token-2')
+        self.assertEqual(self.fetched, 2)
+
+    def test_only_the_rejected_token_is_invalidated(self):
+        session = self.make_session()
+        session.get_token()
+        session.invalidate('token-1')
+        self.assertEqual(session.get_token(), 'token-2')
+
+        # A late rejection of the replaced token keeps the new one
+        session.invalidate('token-1')
+        self.assertEqual(session.get_token(), 'token-2')
+        self.assertEqual(self.fetched, 2)
+
+    def test_token_is_restored_after_restart(self):
+        session = self.make_session()
+        session.get_token()
+        self.wait_for(lambda: HingeAuthenticator(self.credentials_file).credentials.get('sendbird_token'))
+
+        restored = self.make_session()
+        self.assertEqual(restored.get_token(), 'token-1')
+        self.assertEqual(self.fetched, 1)
+
+if __name__ == '__main__':
+    unittest.main()
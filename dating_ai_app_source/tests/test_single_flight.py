@@ -0,0 +1,89 @@
+"""
+Tests for coalescing concurrent identical calls.
+"""
+
+import threading
+import time
+import unittest
+
+from src.platform.single_flight import SingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+    """Tests for SingleFlight.do."""
+
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.calls = 0
+        self.release = threading.Event()
+
+    def call(self, result='result', error=None):
+        """Build a call that counts itself and blocks until released."""
+        def fn():
+            self.calls += 1
+            self.release.wait(5)
+            if error:
+                raise error
+            return result
+        return fn
+
+    def run_concurrently(self, fn, callers=5):
+        """Run callers of the same key at once, returning their results or errors."""
+        outcomes = []
+
+        def caller():
+            try:
+                outcomes.append(self.flight.do('key', fn))
+            except Exception as e:
+                outcomes.append(e)
+
+        threads = [threading.Thread(target=caller) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+
+        # Release the leader once every other caller waits on it
+        deadline = time.monotonic() + 5
+        while not (self.flight._calls.get('key') and self.flight._calls['key'].waiters == callers - 1):
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        return outcomes
+
+    def test_concurrent_callers_share_one_call(self):
+        self.assertEqual(self.run_concurrently(self.call()), ['result'] * 5)
+        self.assertEqual(self.calls, 1)
+
+        # Without a ttl the next caller performs the call again
+        self.assertFalse(self.flight.pending('key'))
+        self.assertEqual(self.flight.do('key', self.call()), 'result')
+        self.assertEqual(self.calls, 2)
+
+    def test_error_is_shared_and_not_cached(self):
+        error = ValueError("request failed")
+        self.assertEqual(self.run_concurrently(self.call(error=error)), [error] * 5)
+        self.assertEqual(self.flight.do('key', self.call(), ttl=60), 'result')
+        self.assertEqual(self.calls, 2)
+
+    def test_result_is_cached_for_ttl(self):
+        self.release.set()
+        self.assertEqual(self.flight.do('key', self.call('first'), ttl=0.05), 'first')
+        self.assertTrue(self.flight.pending('key'))
+        self.assertEqual(self.flight.do('key', self.call('second'), ttl=0.05), 'first')
+
+        time.sleep(0.1)
+        self.assertFalse(self.flight.pending('key'))
+        self.assertEqual(self.flight.do('key', self.call('second'), ttl=60), 'second')
+
+        self.flight.forget('key')
+        self.assertEqual(self.flight.do('key', self.call('third')), 'third')
+        self.assertEqual(self.calls, 3)
+
+    def test_uncacheable_result_is_not_cached(self):
+        self.release.set()
+        self.flight.do('key', self.call(None), ttl=60, cacheable=lambda result: result is not None)
+        self.assertEqual(self.flight.do('key', self.call('result'), ttl=60), 'result')
+        self.assertEqual(self.calls, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Tests for the SQLite data storage.
+"""
+
+import shutil
+import tempfile
+import unittest
+
+from src.storage import DataStorage
+
+def make_match(platform_id, **fields):
+    """Build normalized match data."""
+    match = {
+        'platform': 'tinder',
+        'platform_id': platform_id,
+        'user_id': platform_id,
+        'name': 'Alex',
+        'age': 29,
+        'bio': 'Coffee enthusiast.',
+        'interests': ['Hiking', 'Coffee'],
+        'photos': ['https://images.example.com/1.jpg'],
+        'job': {'title': 'Designer', 'company': 'Studio Nine'},
+        'education': 'State University',
+        'location': '',
+        'is_active': True
+    }
+    match.update(fields)
+    return match
+
+class TestMatchFingerprint(unittest.TestCase):
+    """Tests for skipping unchanged match upserts by fingerprint."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = DataStorage(f"{self.temp_dir}/test.db")
+        self.events = []
+        self.storage.add_match_listener(lambda event, match_id, data: self.events.append((event, match_id)))
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_fingerprint_ignores_key_order_and_platform_fields(self):
+        match = make_match('tm1')
+        reordered = dict(reversed(list(match.items())))
+        self.assertEqual(DataStorage.match_fingerprint(match), DataStorage.match_fingerprint(reordered))
+        self.assertEqual(DataStorage.match_fingerprint(match),
+                         DataStorage.match_fingerprint(make_match('tm1', platform='hinge')))
+        self.assertNotEqual(DataStorage.match_fingerprint(match),
+                            DataStorage.match_fingerprint(make_match('tm1', bio='Dog person.')))
+
+    def test_unchanged_matches_are_skipped(self):
+        matches = [make_match('tm1'), make_match('tm2')]
+        self.assertEqual(self.storage.save_matches(matches), 2)
+        self.assertEqual(self.events, [('inserted', 'tinder_tm1'), ('inserted', 'tinder_tm2')])
+
+        self.events.clear()
+        self.assertEqual(self.storage.save_matches([make_match('tm1'), make_match('tm2')]), 0)
+        self.assertEqual(self.events, [])
+
+    def test_changed_match_is_updated(self):
+        self.storage.save_matches([make_match('tm1'), make_match('tm2')])
+        self.storage.save_profile_analysis('analysis_tm1', 'tinder_tm1', {'summary': 'old'})
+        self.events.clear()
+
+        self.assertEqual(self.storage.save_matches([make_match('tm1', bio='Dog person.'), make_match('tm2')]), 1)
+        self.assertEqual(self.events, [('updated', 'tinder_tm1')])
+        self.assertEqual(self.storage.get_match('tinder_tm1')['bio'], 'Dog person.')
+        # Analyses of the previous profile content are dropped with the update
+        self.assertIsNone(self.storage.get_profile_analysis('analysis_tm1'))
+
+class TestMatchMerge(unittest.TestCase):
+    """Tests for merging list-level records into stored full profiles."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = DataStorage(f"{self.temp_dir}/test.db")
+        self.storage.save_matches([make_match('tm1')])
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_list_record_keeps_stored_fields(self):
+        thin = make_match('tm1', age=0, bio='', interests=[], job={'title': '', 'company': ''}, education=None)
+        self.assertEqual(self.storage.save_matches([thin], partial=True), 0)
+
+        match = self.storage.get_match('tinder_tm1')
+        self.assertEqual(match['age'], 29)
+        self.assertEqual(match['bio'], 'Coffee enthusiast.')
+        self.assertEqual(match['interests'], ['Hiking', 'Coffee'])
+        self.assertEqual(match['job'], {'title': 'Designer', 'company': 'Studio Nine'})
+        self.assertEqual(match['education'], 'State University')
+
+    def test_list_record_zero_is_not_empty(self):
+        self.assertEqual(self.storage.save_matches([make_match('tm1', education='0')], partial=True), 1)
+        self.assertEqual(self.storage.get_match('tinder_tm1')['education'], '0')
+
+    def test_full_profile_clears_fields(self):
+        self.assertTrue(self.storage.save_match(make_match('tm1', bio='', interests=[])))
+
+        match = self.storage.get_match('tinder_tm1')
+        self.assertEqual(match['bio'], '')
+        self.assertEqual(match['interests'], [])
+
+class TestMessageUpserts(unittest.TestCase):
+    """Tests for counting and notifying message upserts."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = DataStorage(f"{self.temp_dir}/test.db")
+        self.events = []
+        self.storage.add_message_listener(lambda event, message_id, data: self.events.append(event))
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.temp_dir)
+
+    def make_messages(self, count):
+        """Build synced message data."""
+        return [
+            {'conversation_id': 'tm1', 'sender_type': 'match', 'content': f"Message {i}",
+             'sent_at': f"2024-01-01T00:00:0{i}", 'platform_id': f"tm1_m{i}"}
+            for i in range(count)
+        ]
+
+    def test_resynced_messages_are_not_counted(self):
+        self.assertEqual(self.storage.save_messages(self.make_messages(3)), 3)
+        self.assertEqual(self.storage.save_messages(self.make_messages(4)), 1)
+        self.assertEqual(self.events, ['inserted'] * 4)
+
+    def test_read_receipt_counts_as_change(self):
+        self.storage.save_messages(self.make_messages(2))
+        messages = self.make_messages(2)
+        messages[0]['read_at'] = '2024-01-01T00:01:00'
+        self.assertEqual(self.storage.save_messages(messages), 1)
+        self.assertEqual(self.events[-1], 'updated')
+
+    def test_sent_messages_without_platform_id_are_all_stored(self):
+        for text in ("First", "Second"):
+            self.storage.save_message({'conversation_id': 'conv_1', 'sender_type': 'user', 'content': text})
+        self.assertEqual([m['content'] for m in self.storage.get_conversation_messages('conv_1')],
+                         ["Second", "First"])
+
+if __name__ == '__main__':
+    unittest.main()
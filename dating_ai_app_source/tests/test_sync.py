@@ -0,0 +1,92 @@
+"""
+Tests for delta sync cursors against the mock platform server.
+"""
+
+import shutil
+import tempfile
+import unittest
+
+from src.dating_app import DatingAppAI
+from src.platform import retry
+from src.platform.account_pool import AccountPool
+from src.platform.mock_server import MockPlatformConfig, MockPlatformServer, point_platforms_at
+
+class TestDeltaSync(unittest.TestCase):
+    """Tests for per-account sync cursors of DatingAppAI.sync_delta."""
+
+    def setUp(self):
+        retry._breakers.clear()
+        self.server = MockPlatformServer(MockPlatformConfig(matches=12, messages_per_conversation=2))
+        point_platforms_at(self.server.start())
+        self.temp_dir = tempfile.mkdtemp()
+
+        self.pool = AccountPool(credentials_dir=self.temp_dir)
+        self.app = DatingAppAI(storage_path=f"{self.temp_dir}/test.db", user='test', account_pool=self.pool)
+        self.assertTrue(self.app.authenticate_platform('tinder', token='test-token'))
+        self.assertTrue(self.app.authenticate_platform(
+            'hinge', phone_number='+15555555555', verification_code='123456'
+        ))
+
+    def tearDown(self):
+        self.app.close()
+        self.pool.close()
+        self.server.stop()
+        shutil.rmtree(self.temp_dir)
+        retry._breakers.clear()
+
+    def test_hinge_cursor_covers_changes_beyond_limit(self):
+        self.app.sync_delta('hinge', limit=5)
+
+        for index in range(8):
+            self.server.state.add_incoming_message('hinge', index)
+        # More new messages in one channel than fit in a page
+        for _ in range(6):
+            self.server.state.add_incoming_message('hinge', 0)
+
+        summary = self.app.sync_delta('hinge', limit=5)
+        self.assertEqual(summary['conversations'], 8)
+        self.assertEqual(summary['messages'], 14)
+
+        summary = self.app.sync_delta('hinge', limit=5)
+        self.assertEqual(summary['conversations'], 0)
+        self.assertEqual(summary['messages'], 0)
+
+    def test_hinge_messages_sharing_a_timestamp_are_all_synced(self):
+        self.app.sync_delta('hinge', limit=5)
+
+        state = self.server.state
+        with state.lock:
+            channel = state.sendbird_channels[0]
+            created_at = max(c["last_message"]["created_at"] for c in state.sendbird_channels) + 1
+            for _ in range(7):
+                message = dict(channel["last_message"], message_id=next(state.message_ids), created_at=created_at)
+                state.sendbird_messages[channel["channel_url"]].append(message)
+                channel["last_message"] = message
+                channel["message_count"] += 1
+
+        summary = self.app.sync_delta('hinge', limit=5)
+        self.assertEqual(summary['messages'], 7)
+
+    def test_hinge_cursor_advances_to_latest_message(self):
+        first = self.app.sync_delta('hinge', limit=5)
+        self.assertEqual(first['conversations'], 12)
+
+        message = self.server.state.add_incoming_message('hinge', 3)
+        summary = self.app.sync_delta('hinge', limit=5)
+        self.assertEqual(summary['messages'], 1)
+        self.assertEqual(summary['cursor'], str(message['created_at']))
+        self.assertEqual(
+            self.app.storage.get_sync_cursor('hinge', self.app.get_user_id('hinge')), summary['cursor']
+        )
+
+    def test_tinder_cursor_only_returns_new_activity(self):
+        first = self.app.sync_delta('tinder')
+        self.assertEqual(first['matches'], 12)
+
+        self.server.state.add_incoming_message('tinder', 2)
+        summary = self.app.sync_delta('tinder')
+        self.assertEqual(summary['conversations'], 1)
+        self.assertEqual(summary['messages'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Tests for cached token expiry and proactive token refresh.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from src.platform.auth import BaseAuthenticator
+from src.platform.token_refresher import TokenRefresher
+
+def expiry_in(seconds):
+    """Get an ISO token expiry the given number of seconds from now."""
+    return (datetime.now() + timedelta(seconds=seconds)).isoformat()
+
+class FakeAuthenticator(BaseAuthenticator):
+    """Authenticator whose refreshes extend the token by an hour or fail on request."""
+
+    def __init__(self, credentials_file, expires_in):
+        super().__init__(credentials_file)
+        self.token = 'test-token'
+        self.token_expiry = expiry_in(expires_in)
+        self.fail = False
+        self.refreshes = 0
+
+    def authenticate(self, **kwargs):
+        return True
+
+    def refresh_token(self):
+        self.refreshes += 1
+        if self.fail:
+            return False
+        self.token_expiry = expiry_in(3600)
+        return True
+
+    def _build_auth_headers(self):
+        return {'X-Auth-Token': self.token}
+
+class TestTokenRefresher(unittest.TestCase):
+    """Tests for TokenRefresher scheduling."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.refresher = TokenRefresher(refresh_margin=600, check_interval=60, retry_interval=300)
+
+    def tearDown(self):
+        self.refresher.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def register(self, name, expires_in):
+        """Register a fake authenticator whose token expires in the given seconds."""
+        authenticator = FakeAuthenticator(os.path.join(self.temp_dir, f"{name}.json"), expires_in)
+        self.refresher.register(name, authenticator)
+        return authenticator
+
+    def test_expiry_is_checked_without_parsing(self):
+        authenticator = self.register('tinder', 3600)
+        self.assertTrue(authenticator.is_authenticated())
+        self.assertAlmostEqual(authenticator.seconds_until_expiry(), 3600, delta=5)
+
+        authenticator.token_expiry = expiry_in(-1)
+        self.assertFalse(authenticator.is_authenticated())
+        authenticator.token_expiry = 'not a date'
+        self.assertFalse(authenticator.is_authenticated())
+
+    def test_only_tokens_within_margin_are_refreshed(self):
+        due = self.register('tinder', 300)
+        fresh = self.register('hinge', 3600)
+
+        self.assertEqual(self.refresher.refresh_due(), 1)
+        self.assertEqual((due.refreshes, fresh.refreshes), (1, 0))
+        self.assertGreater(due.seconds_until_expiry(), 3000)
+
+    def test_failed_refresh_waits_for_retry_interval(self):
+        authenticator = self.register('tinder', 300)
+        authenticator.fail = True
+
+        self.assertEqual(self.refresher.refresh_due(), 0)
+        self.assertEqual(self.refresher.refresh_due(), 0)
+        self.assertEqual(authenticator.refreshes, 1)
+        self.refresher.check_interval = 3600
+        self.assertAlmostEqual(self.refresher._next_wait(), 300, delta=5)
+
+        # Once the retry interval has passed the refresh is attempted again
+        self.refresher._next_attempt['tinder'] = time.monotonic() - 1
+        authenticator.fail = False
+        self.assertEqual(self.refresher.refresh_due(), 1)
+        self.assertEqual(authenticator.refreshes, 2)
+
+    def test_wait_until_next_token_falls_due(self):
+        self.assertEqual(self.refresher._next_wait(), 60)
+
+        self.register('tinder', 630)
+        self.assertAlmostEqual(self.refresher._next_wait(), 30, delta=5)
+
+        # Tokens already due are checked again soon, not in a busy loop
+        self.register('hinge', 0)
+        self.assertEqual(self.refresher._next_wait(), 1.0)
+
+    def test_background_thread_refreshes_due_token(self):
+        authenticator = self.register('tinder', 300)
+        self.refresher.start()
+
+        deadline = time.monotonic() + 5
+        while not authenticator.refreshes:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.refresher.stop()
+        self.assertEqual(authenticator.refreshes, 1)
+
+if __name__ == '__main__':
+    unittest.main()
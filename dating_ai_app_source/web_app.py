@@ -1,5 +1,7 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import (Flask, render_template, request, redirect, url_for, flash, jsonify, session, send_file, abort,
+                   Response, stream_with_context)
 import os
+import re
 import json
 import uuid
 import datetime
@@ -11,13 +13,24 @@ load_dotenv()
 # Import application components
 from src.app import DatingAppAIAssistant
 from src.storage import DataStorage
+from src.photo_cache import PhotoCache
 
 # Initialize Flask app
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', str(uuid.uuid4()))
 
 # Initialize Dating App AI Assistant
-dating_app = DatingAppAIAssistant()
+# The web app is long-lived, so full profiles can be fetched in the background
+dating_app = DatingAppAIAssistant(prefetch_profiles=True)
+
+# Cache match photos locally so pages stop hotlinking full-size images
+photo_cache = PhotoCache(os.getenv('PHOTO_CACHE_DIR'))
+dating_app.assistant.storage.add_match_listener(
+    lambda event, match_id, match_data: photo_cache.prefetch(PhotoCache.photo_urls(match_data.get('photos')))
+)
+
+# Cached photos are addressed by content, so they never change
+PHOTO_MAX_AGE = 365 * 24 * 3600
 
 @app.route('/')
 def index():
@@ -186,8 +199,23 @@ def generate_message(match_id):
             else:
                 flash('Failed to send edited message', 'danger')
     
-    # Generate a message
-    message = dating_app.generate_initial_message(match_id)
+    # Render the page right away and stream the message into it, unless
+    # "stream=0" asks for the page to wait for the whole message
+    if request.args.get('stream') != '0':
+        match = dating_app.get_match(match_id)
+        if not match:
+            flash('Match not found', 'danger')
+            return redirect(url_for('matches'))
+        
+        return render_template('generate_message.html', 
+                              message=None, 
+                              match=match, 
+                              message_data='',
+                              stream_url=url_for('api_stream_message', match_id=match_id,
+                                                 fresh=request.args.get('fresh')))
+    
+    # Generate a message; "fresh" asks for a new one instead of the cached completion
+    message = dating_app.generate_initial_message(match_id, use_cache=not request.args.get('fresh'))
     
     if not message:
         flash('Failed to generate message', 'danger')
@@ -201,6 +229,39 @@ def generate_message(match_id):
                           match=match, 
                           message_data=json.dumps(message))
 
+@app.route('/draft_openers')
+def draft_openers():
+    """Draft initial messages for all matches without messages."""
+    if 'authenticated' not in session or not session['authenticated']:
+        flash('Please authenticate first', 'warning')
+        return redirect(url_for('auth'))
+    
+    platform = request.args.get('platform', session.get('platform', 'tinder'))
+    limit = request.args.get('limit', 50, type=int)
+    fresh = request.args.get('fresh')
+    
+    # Render the matches right away and stream each draft into its card as it
+    # completes, unless "stream=0" asks for the page to wait for every draft
+    if request.args.get('stream') != '0':
+        matches = dating_app.assistant.storage.get_matches_without_conversation(platform, limit)
+        drafts = [{'match': match, 'message': None, 'message_data': '', 'error': None} for match in matches]
+        return render_template('draft_openers.html', drafts=drafts, platform=platform,
+                               stream_url=url_for('api_stream_draft_openers', platform=platform, limit=limit,
+                                                  fresh=fresh))
+    
+    # Drafts are generated concurrently; pair each with its match for display
+    drafts = []
+    for message in dating_app.draft_openers(platform, limit=limit, use_cache=not fresh):
+        match = dating_app.get_match(message.get('match_id', ''))
+        if not match:
+            continue
+        if message.get('error'):
+            drafts.append({'match': match, 'message': None, 'message_data': '', 'error': message['error']})
+        else:
+            drafts.append({'match': match, 'message': message, 'message_data': json.dumps(message), 'error': None})
+    
+    return render_template('draft_openers.html', drafts=drafts, platform=platform)
+
 @app.route('/conversations')
 def conversations():
     """Display all conversations."""
@@ -293,8 +354,37 @@ def generate_response(conversation_id):
             else:
                 flash('Failed to send edited response', 'danger')
     
-    # Generate a response
-    response = dating_app.generate_response(conversation_id)
+    # A reply drafted in the background when the last message arrived is shown as is
+    draft = dating_app.get_reply_draft(conversation_id) if not request.args.get('fresh') else None
+    if draft:
+        conversation_data = dating_app.get_conversation(conversation_id)
+        match = dating_app.get_match(conversation_data['match_id']) if conversation_data else None
+        
+        return render_template('generate_response.html', 
+                              response=draft, 
+                              conversation=conversation_data, 
+                              match=match, 
+                              response_data=json.dumps(draft))
+    
+    # Render the page right away and stream the response into it, unless
+    # "stream=0" asks for the page to wait for the whole response
+    if request.args.get('stream') != '0':
+        conversation_data = dating_app.get_conversation(conversation_id)
+        if not conversation_data:
+            flash('Conversation not found', 'danger')
+            return redirect(url_for('conversations'))
+        match = dating_app.get_match(conversation_data['match_id'])
+        
+        return render_template('generate_response.html', 
+                              response=None, 
+                              conversation=conversation_data, 
+                              match=match, 
+                              response_data='',
+                              stream_url=url_for('api_stream_response', conversation_id=conversation_id,
+                                                 fresh=request.args.get('fresh')))
+    
+    # Generate a response; "fresh" asks for a new one instead of the cached completion
+    response = dating_app.generate_response(conversation_id, use_cache=not request.args.get('fresh'))
     
     if not response:
         flash('Failed to generate response', 'danger')
@@ -411,6 +501,66 @@ def api_check_messages(conversation_id):
         'count': len(messages)
     })
 
+@app.route('/api/stream/message/<match_id>')
+def api_stream_message(match_id):
+    """API endpoint streaming a generated message as server-sent events."""
+    if 'authenticated' not in session or not session['authenticated']:
+        return jsonify({'success': False, 'message': 'Not authenticated'})
+    
+    events = dating_app.stream_initial_message(match_id, use_cache=not request.args.get('fresh'))
+    if events is None:
+        return jsonify({'success': False, 'message': 'Match not found'})
+    
+    return event_stream(events)
+
+@app.route('/api/stream/response/<conversation_id>')
+def api_stream_response(conversation_id):
+    """API endpoint streaming a generated response as server-sent events."""
+    if 'authenticated' not in session or not session['authenticated']:
+        return jsonify({'success': False, 'message': 'Not authenticated'})
+    
+    events = dating_app.stream_response(conversation_id, use_cache=not request.args.get('fresh'))
+    if events is None:
+        return jsonify({'success': False, 'message': 'Conversation not found'})
+    
+    return event_stream(events)
+
+@app.route('/api/stream/draft_openers')
+def api_stream_draft_openers():
+    """API endpoint streaming drafted openers as server-sent events as each one completes."""
+    if 'authenticated' not in session or not session['authenticated']:
+        return jsonify({'success': False, 'message': 'Not authenticated'})
+    
+    platform = request.args.get('platform', session.get('platform', 'tinder'))
+    limit = request.args.get('limit', 50, type=int)
+    drafts = dating_app.draft_openers(platform, limit=limit, use_cache=not request.args.get('fresh'))
+    
+    def events():
+        for message in drafts:
+            if message.get('error'):
+                yield {'type': 'failed', 'match_id': message['match_id'], 'error': message['error']}
+            else:
+                yield {'type': 'draft', 'match_id': message['match_id'], 'message': message}
+        yield {'type': 'done'}
+    
+    return event_stream(events())
+
+def event_stream(events):
+    """
+    Send generation events as a server-sent event stream.
+    
+    Each event is named after its type ("delta", "reset" or "done" for a
+    message, "draft", "failed" or "done" for a batch) and carries the event
+    as JSON. Buffering is disabled so text reaches the browser as it is
+    generated.
+    """
+    def generate():
+        for event in events:
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/notifications')
 def api_notifications():
     """API endpoint to get notifications."""
@@ -426,6 +576,51 @@ def api_notifications():
         'count': len(notifications)
     })
 
+@app.route('/api/llm_queue')
+def api_llm_queue():
+    """API endpoint to get LLM queue metrics."""
+    if 'authenticated' not in session or not session['authenticated']:
+        return jsonify({'success': False, 'message': 'Not authenticated'})
+    
+    return jsonify({
+        'success': True,
+        'metrics': dating_app.get_llm_metrics()
+    })
+
+@app.route('/photos/<digest>')
+@app.route('/photos/<digest>/<variant>')
+def cached_photo(digest, variant='full'):
+    """Serve a cached match photo or its thumbnail."""
+    if not re.fullmatch(r'[0-9a-f]{64}', digest) or variant not in ('full', 'thumb'):
+        abort(404)
+    
+    cached = photo_cache.open(digest, thumbnail=(variant == 'thumb'))
+    if not cached:
+        abort(404)
+    
+    path, content_type = cached
+    response = send_file(path, mimetype=content_type, max_age=PHOTO_MAX_AGE, etag=f"{digest}-{variant}")
+    response.headers['Cache-Control'] = f'public, max-age={PHOTO_MAX_AGE}, immutable'
+    return response
+
+@app.template_filter('photo_urls')
+def photo_urls(photos):
+    """Get the URLs of a match's photos."""
+    return PhotoCache.photo_urls(photos)
+
+@app.template_filter('photo_url')
+def photo_url(url, variant='full'):
+    """Get the local URL of a photo, queueing it for caching if it is not cached yet."""
+    if not url:
+        return ''
+    
+    digest = photo_cache.digest_for(url)
+    if not digest:
+        photo_cache.prefetch([url])
+        return url
+    
+    return url_for('cached_photo', digest=digest, variant=variant)
+
 @app.template_filter('format_datetime')
 def format_datetime(value, format='%Y-%m-%d %H:%M:%S'):
     """Format a datetime string."""